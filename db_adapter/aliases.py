@@ -0,0 +1,336 @@
+"""
+Asyncio front end migrating several databases (like shards and regions):
+each alias is migrated in a worker thread, on its own connection, with up to
+`concurrency` aliases at a time. Migrations are loaded from disk once, on the
+calling thread, and the signals of the migrations are sent one alias at a
+time (their receivers are not expected to be thread-safe).
+
+    migration = AliasMigration(['shard_1', 'shard_2', 'eu'], concurrency=4)
+    report = run_coroutine(migration.run())
+    print(report.as_table())
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+
+from django.apps import apps
+from django.core.management.sql import (
+    emit_post_migrate_signal,
+    emit_pre_migrate_signal,
+)
+from django.db import connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.migrations.state import ModelState
+from django.utils.module_loading import module_has_submodule
+
+logger = logging.getLogger('django.db.backends.schema')
+
+
+def run_coroutine(coroutine):
+    """
+    Run a coroutine on a new event loop, like `asyncio.run` (Python 3.7)
+    """
+    if hasattr(asyncio, 'run'):
+        return asyncio.run(coroutine)
+
+    loop = asyncio.new_event_loop()
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(coroutine)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+class AliasResult:
+    """
+    Outcome of the migration of an alias
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.status = 'pending'
+        self.statements = 0
+        self.error = None
+        self.duration = None
+
+    def __repr__(self):
+        return '<AliasResult %s: %s>' % (self.alias, self.status)
+
+    def as_dict(self):
+        return dict(
+            alias=self.alias,
+            status=self.status,
+            statements=self.statements,
+            duration=self.duration,
+            error=str(self.error) if self.error is not None else None,
+        )
+
+
+class MigrationReport:
+    """
+    Consolidated results of the migration of several aliases
+    """
+
+    def __init__(self, results, duration):
+        self.results = results
+        self.duration = duration
+
+    def __len__(self):
+        return len(self.results)
+
+    @property
+    def failed(self):
+        return [result for result in self.results if result.status == 'failed']
+
+    @property
+    def skipped(self):
+        return [result for result in self.results if result.status == 'skipped']
+
+    def as_json(self):
+        return json.dumps(
+            dict(
+                duration=self.duration,
+                failed=len(self.failed),
+                skipped=len(self.skipped),
+                aliases=[result.as_dict() for result in self.results],
+            ),
+            indent=2,
+        )
+
+    def as_table(self):
+        lines = [
+            '%d aliases in %.3fs, %d failed, %d skipped:'
+            % (
+                len(self.results),
+                self.duration,
+                len(self.failed),
+                len(self.skipped),
+            ),
+            '%-20s  %-8s  %10s  %10s  %s'
+            % ('Alias', 'Status', 'Duration', 'Statements', 'Error'),
+        ]
+        for result in self.results:
+            error = ' '.join(str(result.error or '-').split())
+            lines.append(
+                '%-20s  %-8s  %10s  %10d  %s'
+                % (
+                    result.alias,
+                    result.status,
+                    '-'
+                    if result.duration is None
+                    else '%.3fs' % result.duration,
+                    result.statements,
+                    error if len(error) <= 60 else error[:57] + '...',
+                )
+            )
+
+        return '\n'.join(lines)
+
+
+class AliasMigrationLoader(MigrationLoader):
+    """
+    Migration loader of an alias, taking the migrations loaded from disk by
+    another loader instead of importing (and reloading) their modules
+    """
+
+    def __init__(self, connection, disk_loader, **kwargs):
+        self.disk_loader = disk_loader
+        super().__init__(connection, **kwargs)
+
+    def load_disk(self):
+        # Instances of their own, as receivers of signals may change them
+        self.disk_migrations = {
+            key: type(migration)(migration.name, migration.app_label)
+            for key, migration in self.disk_loader.disk_migrations.items()
+        }
+        self.migrated_apps = set(self.disk_loader.migrated_apps)
+        self.unmigrated_apps = set(self.disk_loader.unmigrated_apps)
+
+
+class AliasMigrationExecutor(MigrationExecutor):
+    """
+    Migration executor of an alias, on the migrations of a disk loader
+    """
+
+    def __init__(self, connection, disk_loader, progress_callback=None):
+        self.connection = connection
+        self.loader = AliasMigrationLoader(connection, disk_loader)
+        self.recorder = MigrationRecorder(connection)
+        self.progress_callback = progress_callback
+
+
+class AliasMigration:
+    """
+    Migrate aliases concurrently. An alias failing doesn't stop the others,
+    unless `fail_fast` is set: then the aliases not started yet are skipped
+    (the ones being migrated still finish, as threads cannot be interrupted).
+
+    Like the `migrate` command, all apps are migrated to their latest
+    migrations (only the ones of `app_label` when set), and `fake` marks
+    migrations as applied without running them.
+    """
+
+    # Receivers of the migration signals run one alias at a time
+    signal_lock = threading.Lock()
+
+    def __init__(
+        self,
+        aliases,
+        concurrency=4,
+        fail_fast=False,
+        progress=None,
+        app_label=None,
+        fake=False,
+    ):
+        self.concurrency = concurrency
+        self.fail_fast = fail_fast
+        self.progress = progress
+        self.app_label = app_label
+        self.fake = fake
+        self.results = [AliasResult(alias) for alias in aliases]
+        self.disk_loader = None
+
+    def load_migrations(self):
+        """
+        Load the migrations from disk (and the receivers of the migration
+        signals), before the workers share them. Raise `ValueError` when they
+        conflict, and `LookupError` when `app_label` has no migrations.
+        """
+        for app_config in apps.get_app_configs():
+            if module_has_submodule(app_config.module, 'management'):
+                import_module('.management', app_config.name)
+
+        # Model of the recorders, defined on first use
+        MigrationRecorder.Migration
+
+        self.disk_loader = MigrationLoader(None)
+        conflicts = self.disk_loader.detect_conflicts()
+        if conflicts:
+            raise ValueError(
+                'Conflicting migrations detected: %s'
+                % '; '.join(
+                    '%s in %s' % (', '.join(names), app)
+                    for app, names in sorted(conflicts.items())
+                )
+            )
+        if (
+            self.app_label is not None
+            and self.app_label not in self.disk_loader.migrated_apps
+        ):
+            raise LookupError(
+                "App '%s' does not have migrations." % self.app_label
+            )
+
+    def migrate_alias(self, alias):
+        """
+        Migrate an alias on the connection of the current worker, returning
+        the number of statements executed by its schema editors
+        """
+        from .statement_report import statement_report
+
+        connection = connections[alias]
+        connection.prepare_database()
+        executor = AliasMigrationExecutor(connection, self.disk_loader)
+        loader = executor.loader
+        loader.check_consistent_history(connection)
+
+        targets = [
+            key
+            for key in loader.graph.leaf_nodes()
+            if self.app_label is None or key[0] == self.app_label
+        ]
+        plan = executor.migration_plan(targets)
+
+        state = executor._create_project_state(with_applied_migrations=True)
+        with self.signal_lock:
+            emit_pre_migrate_signal(0, False, alias, apps=state.apps, plan=plan)
+
+        with statement_report(alias) as report:
+            state = executor.migrate(
+                targets,
+                plan=plan,
+                state=state.clone(),
+                fake=self.fake,
+            )
+
+        # Models of real apps rendered with their relationships, like the
+        # `migrate` command does for the receivers of post_migrate
+        state.clear_delayed_apps_cache()
+        post_migrate_apps = state.apps
+        with post_migrate_apps.bulk_update():
+            model_keys = []
+            for model_state in post_migrate_apps.real_models:
+                model_key = model_state.app_label, model_state.name_lower
+                model_keys.append(model_key)
+                post_migrate_apps.unregister_model(*model_key)
+        post_migrate_apps.render_multiple(
+            [ModelState.from_model(apps.get_model(*key)) for key in model_keys]
+        )
+
+        with self.signal_lock:
+            emit_post_migrate_signal(
+                0, False, alias, apps=post_migrate_apps, plan=plan
+            )
+
+        return len(report)
+
+    def close_connection(self, alias):
+        connections[alias].close()
+
+    def apply(self, result):
+        result.status = 'running'
+        start = time.perf_counter()
+        try:
+            result.statements = self.migrate_alias(result.alias)
+            result.status = 'done'
+        except Exception as err:
+            result.status = 'failed'
+            result.error = err
+            logger.error('Migration of %s failed: %s', result.alias, err)
+        finally:
+            result.duration = time.perf_counter() - start
+            self.close_connection(result.alias)
+
+    async def migrate(self, result, executor, semaphore, stop):
+        async with semaphore:
+            if stop.is_set():
+                result.status = 'skipped'
+            else:
+                # The running loop (`get_running_loop` needs Python 3.7)
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(executor, self.apply, result)
+                if result.status == 'failed' and self.fail_fast:
+                    stop.set()
+
+        if self.progress is not None:
+            self.progress(result)
+
+    async def run(self):
+        """
+        Migrate all aliases, returning the report of their results
+        """
+        start = time.perf_counter()
+        self.load_migrations()
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        stop = asyncio.Event()
+
+        workers = max(1, min(self.concurrency, len(self.results)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Tasks are started in the order of the aliases (coroutines passed
+            # to `gather` are not, on Python 3.6)
+            tasks = [
+                asyncio.ensure_future(
+                    self.migrate(result, executor, semaphore, stop)
+                )
+                for result in self.results
+            ]
+            await asyncio.gather(*tasks)
+
+        return MigrationReport(self.results, time.perf_counter() - start)
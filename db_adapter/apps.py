@@ -1,5 +1,29 @@
+import sys
+
 from django.apps import AppConfig
+from django.db.models import options
+
+# Allow `materialized_view` on model Meta options (and keep it on the models
+# rendered from migration states, which bind the names when imported)
+options.DEFAULT_NAMES = (*options.DEFAULT_NAMES, 'materialized_view')
+state = sys.modules.get('django.db.migrations.state')
+if state is not None:
+    state.DEFAULT_NAMES = options.DEFAULT_NAMES
 
 
 class DatabaseAdapterConfig(AppConfig):
     name = 'db_adapter'
+
+    def ready(self):
+        from django.apps import apps
+        from django.db.models.signals import class_prepared
+
+        from . import checks  # noqa: F401 (registers the system checks)
+        from .models import transform_db_table
+
+        # Transform the tables of the models loaded so far (instead of on each
+        # instantiation), and of the models created later, like the ones
+        # rendered from migration states
+        for model in apps.get_models(include_auto_created=True):
+            transform_db_table(model)
+        class_prepared.connect(transform_db_table)
@@ -0,0 +1,200 @@
+"""
+End-to-end benchmark of the schema editor on a synthetic project: thousands of
+models with foreign keys, `unique_together`, indexes and column comments,
+created by a migration collecting its SQL (like `sqlmigrate`).
+
+    with synthetic_project(models=2000) as models:
+        results = run_benchmark(connection, models)
+"""
+import platform
+import random
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import django
+from django.apps import AppConfig, apps
+from django.db.migrations.operations import CreateModel
+from django.db.migrations.state import ModelState, ProjectState
+from django.db.models import (
+    CASCADE,
+    BooleanField,
+    CharField,
+    ForeignKey,
+    IntegerField,
+    Model,
+    PositiveIntegerField,
+    TextField,
+)
+
+from .instrumentation import PhaseTimings, current_timings
+
+RESULTS_VERSION = 1
+
+# Classes of the synthetic fields, in turn
+FIELD_CLASSES = [IntegerField, PositiveIntegerField, BooleanField, TextField]
+
+# Results compared between runs
+COMPARED_RESULTS = ['wall_time', 'peak_memory', 'statements']
+
+
+class BenchmarkConfig(AppConfig):
+    name = 'db_adapter.benchmark'
+    label = 'db_adapter_benchmark'
+
+
+def synthetic_models(count, fields=5, seed=0):
+    """
+    Create `count` models on the benchmark app with `fields` more fields, each
+    one with a foreign key to a previous model (picked at random, following the
+    seed)
+    """
+    rng = random.Random(seed)
+    created = []
+
+    for i in range(count):
+        attrs = dict(
+            __module__=__name__,
+            Meta=type(
+                'Meta',
+                (),
+                dict(
+                    app_label=BenchmarkConfig.label,
+                    db_table='bench_model_%d' % i,
+                    unique_together=[('code', 'name')],
+                ),
+            ),
+            code=CharField(max_length=30, help_text="Code of the model's rows"),
+            name=CharField(max_length=100, db_index=True),
+        )
+        for j in range(fields):
+            field_class = FIELD_CLASSES[j % len(FIELD_CLASSES)]
+            attrs['field_%d' % j] = field_class(
+                null=bool(j % 2) and field_class is not BooleanField,
+                help_text='Synthetic field %d' % j,
+            )
+        if created:
+            attrs['parent'] = ForeignKey(
+                rng.choice(created), on_delete=CASCADE, null=True
+            )
+
+        created.append(type('Model%d' % i, (Model,), attrs))
+
+    return created
+
+
+@contextmanager
+def synthetic_project(models=1000, fields=5, seed=0):
+    """
+    Install the benchmark app with synthetic models for the duration of the
+    block (models are looked up by table name by the schema editor)
+    """
+    installed = [app_config.name for app_config in apps.get_app_configs()]
+    apps.set_installed_apps(
+        [*installed, '%s.%s' % (__name__, BenchmarkConfig.__name__)]
+    )
+    try:
+        yield synthetic_models(models, fields, seed)
+    finally:
+        apps.all_models.pop(BenchmarkConfig.label, None)
+        apps.unset_installed_apps()
+        apps.clear_cache()
+
+
+def migration_sql(connection, models, timings=None):
+    """
+    Return the statements of the operations of a migration creating the
+    models, collected by the schema editor of the connection.
+
+    The operations are run against the final state of the project, rendered
+    once: applying the migration would reload the state of every related model
+    after each operation, which takes most of the time on large projects and
+    does not involve the schema editor.
+    """
+    states = [ModelState.from_model(model) for model in models]
+    operations = [
+        CreateModel(
+            state.name,
+            fields=state.fields,
+            options=state.options,
+            bases=state.bases,
+        )
+        for state in states
+    ]
+
+    project_state = ProjectState()
+    for state in states:
+        project_state.models[state.app_label, state.name_lower] = state
+    project_state.apps
+
+    token = current_timings.set(timings)
+    try:
+        with connection.schema_editor(collect_sql=True, atomic=False) as editor:
+            for operation in operations:
+                operation.database_forwards(
+                    BenchmarkConfig.label, editor, project_state, project_state
+                )
+    finally:
+        current_timings.reset(token)
+
+    return editor.collected_sql
+
+
+def run_benchmark(connection, models, parameters=None, memory=True):
+    """
+    Return the wall time, statement count and durations of the phases of the
+    schema editor for the migration creating the models, along with its peak
+    memory usage (measured on a second run, as tracing slows it down).
+    Results of runs with the same `parameters` are comparable.
+    """
+    timings = PhaseTimings()
+
+    start = time.perf_counter()
+    statements = migration_sql(connection, models, timings)
+    wall_time = time.perf_counter() - start
+
+    peak_memory = None
+    if memory:
+        tracemalloc.start()
+        try:
+            migration_sql(connection, models)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return dict(
+        version=RESULTS_VERSION,
+        environment=dict(
+            python=platform.python_version(),
+            django=django.get_version(),
+            vendor=connection.vendor,
+        ),
+        parameters=dict(parameters or {}, models=len(models)),
+        results=dict(
+            wall_time=wall_time,
+            peak_memory=peak_memory,
+            statements=len(statements),
+            phases=timings.as_dict(),
+        ),
+    )
+
+
+def compare_results(baseline, results):
+    """
+    Return `(name, baseline, current, change)` tuples for the results of both
+    runs (changes are relative, `None` when not comparable)
+    """
+    if baseline.get('parameters') != results.get('parameters'):
+        raise ValueError(
+            'Results of different parameters cannot be compared: %s != %s'
+            % (baseline.get('parameters'), results.get('parameters'))
+        )
+
+    comparison = []
+    for name in COMPARED_RESULTS:
+        before = baseline['results'].get(name)
+        after = results['results'].get(name)
+        change = (after - before) / before if before and after else None
+        comparison.append((name, before, after, change))
+
+    return comparison
@@ -0,0 +1,153 @@
+from typing import List
+
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.operations import RunPython, RunSQL
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models import Model
+
+from .utils import created_models, is_created_model
+
+
+def migrated_models(loader: MigrationLoader) -> List[Model]:
+    """
+    Return the models of the apps with migrations, in their final state
+    """
+    return [
+        model
+        for model in created_models()
+        if model._meta.app_label in loader.migrated_apps
+    ]
+
+
+def unmigrated_models(loader: MigrationLoader) -> List[Model]:
+    """
+    Return the models of the apps without migrations (created by `migrate`
+    from their current state, like by `syncdb`)
+    """
+    return [
+        model
+        for model in created_models()
+        if model._meta.app_label in loader.unmigrated_apps
+    ]
+
+
+def migration_plan(loader: MigrationLoader, app_labels=()):
+    """
+    Return the keys of all migrations (or the ones the apps need, including
+    their dependencies on other apps), in the order they are applied
+    """
+    plan = []
+    for leaf in loader.graph.leaf_nodes():
+        if app_labels and leaf[0] not in app_labels:
+            continue
+        for key in loader.graph.forwards_plan(leaf):
+            if key not in plan:
+                plan.append(key)
+
+    return plan
+
+
+def data_migrations(loader: MigrationLoader):
+    """
+    Return the keys of the migrations with data operations (not run when the
+    schema is created from the final state of the models)
+    """
+    return [
+        key
+        for key in migration_plan(loader)
+        if any(
+            isinstance(operation, (RunPython, RunSQL))
+            for operation in loader.graph.nodes[key].operations
+        )
+    ]
+
+
+def replay_differences(connection, loader: MigrationLoader, models):
+    """
+    Compare the columns and statements creating the models with the ones
+    creating their state after replaying all migrations (the order of columns
+    is ignored, as replayed migrations add columns at the end of tables).
+    Return a list of `(label, missing, unexpected)` tuples for models whose
+    columns or statements differ.
+    """
+    state_apps = loader.project_state().apps
+    replayed_models = {
+        model._meta.label_lower: model
+        for model in state_apps.get_models(include_auto_created=True)
+        if model._meta.app_label in loader.migrated_apps
+        and is_created_model(model)
+    }
+
+    differences = []
+    with connection.schema_editor(collect_sql=True, atomic=False) as editor:
+
+        def model_sql(model):
+            if model is None:
+                return []
+
+            # Column definitions (the deferred statements of a throwaway
+            # editor are discarded)
+            column_editor = connection.schema_editor(collect_sql=True)
+            columns = []
+            for field in model._meta.local_fields:
+                definition, _ = column_editor.column_sql(model, field)
+                if definition is not None:
+                    columns.append('%s %s' % (field.column, definition))
+
+            editor.materialized_view_logs.clear()
+            statements = editor.model_statements(model)
+            statements.pop('TABLE')
+
+            return sorted(
+                [
+                    *columns,
+                    *(sql for step in statements.values() for sql in step),
+                ]
+            )
+
+        labels = {model._meta.label_lower: model for model in models}
+        for label in sorted({*labels, *replayed_models}):
+            expected = model_sql(labels.get(label))
+            replayed = model_sql(replayed_models.get(label))
+            if expected != replayed:
+                differences.append(
+                    (
+                        label,
+                        [sql for sql in expected if sql not in replayed],
+                        [sql for sql in replayed if sql not in expected],
+                    )
+                )
+
+    return differences
+
+
+def create_schema(connection, models):
+    """
+    Create the tables of the models (and their objects) at once
+    """
+    with connection.schema_editor() as editor:
+        for model in models:
+            editor.create_model(model)
+
+
+def mark_applied(connection, loader: MigrationLoader):
+    """
+    Record all migrations (and the ones replaced by squashed migrations) as
+    applied, in a single query
+    """
+    recorder = MigrationRecorder(connection)
+    recorder.ensure_schema()
+
+    applied = set(recorder.applied_migrations())
+    keys = []
+    for key in migration_plan(loader):
+        replaces = loader.graph.nodes[key].replaces or []
+        for replaced_key in [*replaces, key]:
+            if replaced_key not in applied and replaced_key not in keys:
+                keys.append(replaced_key)
+
+    recorder.migration_qs.bulk_create(
+        recorder.Migration(app=app_label, name=name) for app_label, name in keys
+    )
+
+    return keys
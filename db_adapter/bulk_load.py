@@ -0,0 +1,106 @@
+import logging
+from contextlib import ExitStack, contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger('django.db.backends.schema')
+
+
+class BulkLoad:
+    """
+    Statements of the `BULK_LOAD_STEPS` steps (constraints and indexes) held
+    back by the schema editors of a connection during a data load.
+    """
+
+    def __init__(self, connection, steps=None, options=None):
+        from .settings import db_settings
+
+        self.connection = connection
+        self.steps = db_settings.BULK_LOAD_STEPS if steps is None else steps
+        self.options = {**db_settings.BULK_LOAD_OPTIONS, **(options or {})}
+        self.statements = {step: [] for step in self.steps}
+
+    def __len__(self):
+        return sum(map(len, self.statements.values()))
+
+    @property
+    def direct_path(self):
+        # Direct-path inserts need execute wrappers (Django 2.2)
+        return bool(self.options.get('direct_path')) and hasattr(
+            self.connection, 'execute_wrapper'
+        )
+
+    def commit_direct_path(self, execute, sql, params, many, context):
+        """
+        Commit direct-path inserts as soon as they are executed: Oracle
+        doesn't allow any other statement on their table until then
+        (ORA-12838), including the next batches of bulk_create
+        """
+        result = execute(sql, params, many, context)
+
+        hint = getattr(self.connection.ops, 'sql_direct_path_hint', None)
+        if hint and hint in sql:
+            # Committed by the driver, as atomic blocks forbid commits
+            context['connection'].connection.commit()
+        return result
+
+    def hold(self, step, statements):
+        self.statements.setdefault(step, []).extend(statements)
+
+    def apply(self):
+        """
+        Execute the held statements, following the `SQL_STATEMENTS_ORDER`
+        setting and the `parallel` and `novalidate` options
+        """
+        if not len(self):
+            return
+
+        # Run as deferred statements of the editor (in parallel when the
+        # `DEFERRED_SQL_WORKERS` setting is set)
+        with self.connection.schema_editor(atomic=False) as editor:
+            for step in editor.deferred_steps:
+                for sql in self.statements.get(step, []):
+                    editor.deferred_sql.extend(
+                        editor.bulk_load_sql(step, sql, **self.options)
+                    )
+
+                self.statements.get(step, []).clear()
+
+
+@contextmanager
+def bulk_load(using=DEFAULT_DB_ALIAS, steps=None, **options):
+    """
+    Hold back the constraints and indexes of the tables created within the
+    block until the data is loaded (nested blocks share the outermost one).
+
+        with bulk_load():
+            call_command('migrate')
+            call_command('loaddata', 'catalog')
+    """
+    connection = connections[using]
+
+    current = getattr(connection, 'bulk_load', None)
+    if current is not None:
+        yield current
+        return
+
+    load = connection.bulk_load = BulkLoad(connection, steps, options)
+    try:
+        with ExitStack() as stack:
+            if load.direct_path:
+                stack.enter_context(
+                    connection.execute_wrapper(load.commit_direct_path)
+                )
+            yield load
+    except Exception:
+        if len(load):
+            logger.warning(
+                '%d constraint and index statements were not applied, as the '
+                'data load failed.',
+                len(load),
+            )
+        raise
+    finally:
+        connection.bulk_load = None
+
+    load.apply()
@@ -0,0 +1,109 @@
+from itertools import chain
+
+from django.apps import apps
+from django.core import checks
+from django.db.models import Model, QuerySet
+
+from .indexes import UpperIndex
+
+# Lookups compiled by the Oracle backend as `UPPER(column) ...` that can be
+# resolved through an `UPPER(column)` function-based index
+CASE_INSENSITIVE_LOOKUPS = ['iexact', 'istartswith']
+
+
+def has_upper_index(model: Model, field_name: str) -> bool:
+    return any(
+        isinstance(index, UpperIndex)
+        and index.fields_orders[0][0] == field_name
+        for index in model._meta.indexes
+    )
+
+
+def _iter_lookups(node):
+    for child in getattr(node, 'children', []):
+        if hasattr(child, 'children'):
+            yield from _iter_lookups(child)
+        else:
+            yield child
+
+
+def check_case_insensitive_lookups(queryset: QuerySet):
+    """
+    Flag case-insensitive lookups from the queryset filters made on columns
+    without an `UpperIndex` declared on `Meta.indexes` of its model.
+    """
+    errors = []
+
+    for lookup in _iter_lookups(queryset.query.where):
+        if getattr(lookup, 'lookup_name', None) not in CASE_INSENSITIVE_LOOKUPS:
+            continue
+
+        field = getattr(lookup.lhs, 'target', None)
+        if field is None or has_upper_index(field.model, field.name):
+            continue
+
+        opts = field.model._meta
+        errors.append(
+            checks.Warning(
+                "Lookup '%s' on column '%s' of table '%s' cannot use an index."
+                % (lookup.lookup_name, field.column, opts.db_table),
+                hint=(
+                    "Add UpperIndex(fields=['%s']) to %s.Meta.indexes."
+                    % (field.name, field.model.__name__)
+                ),
+                obj=field.model,
+                id='db_adapter.W001',
+            )
+        )
+
+    return errors
+
+
+def _declared_querysets(model: Model):
+    # Querysets of the managers (like ones filtering their rows)
+    for manager in model._meta.managers:
+        yield manager.get_queryset()
+
+    # Choices of the relations (callables are left out, as they may query
+    # the database)
+    for field in model._meta.get_fields():
+        if field.auto_created or not field.is_relation:
+            continue
+
+        limit_choices_to = getattr(field.remote_field, 'limit_choices_to', None)
+        related_model = field.related_model
+        if (
+            limit_choices_to
+            and not callable(limit_choices_to)
+            and isinstance(related_model, type)
+        ):
+            yield related_model._default_manager.complex_filter(
+                limit_choices_to
+            )
+
+
+def check_model_lookups(model: Model):
+    """
+    Flag case-insensitive lookups declared by a model (filters of its managers
+    and `limit_choices_to` of its relations) on columns without an
+    `UpperIndex`.
+    """
+    errors = []
+    for queryset in _declared_querysets(model):
+        for error in check_case_insensitive_lookups(queryset):
+            if error not in errors:
+                errors.append(error)
+
+    return errors
+
+
+@checks.register(checks.Tags.models)
+def check_case_insensitive_indexes(app_configs=None, **kwargs):
+    if app_configs is None:
+        models = apps.get_models()
+    else:
+        models = chain.from_iterable(
+            app_config.get_models() for app_config in app_configs
+        )
+
+    return list(chain.from_iterable(check_model_lookups(m) for m in models))
@@ -0,0 +1,274 @@
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.db.backends.utils import split_identifier
+
+from db_adapter.settings import setting
+from db_adapter.utils import compile_pattern, split_table_identifiers
+
+
+def split_list(value):
+    # LISTAGG returns NULL when no rows are aggregated (like constraints with
+    # no column, or expressions)
+    return value.split(',') if value else []
+
+
+class DatabaseIntrospection:
+    """
+    Introspection loading the constraints and indexes of a whole schema in a
+    few set-based queries (cached within `cache_constraints()` blocks, like
+    the life of a schema editor), aware of the table and object name patterns.
+    """
+
+    # Overrideable SQL queries, filtered by the schema owner (all rows start
+    # with the table name)
+    sql_get_constraints = None
+    sql_get_foreign_keys = None
+    sql_get_indexes = None
+    sql_get_schema_objects = None
+
+    # Setting variables
+    name_builder_class = setting('NAME_BUILDER_CLASS')
+    default_db_table_pattern = setting('DEFAULT_DB_TABLE_PATTERN')
+    enable_transform_db_table = setting('ENABLE_TRANSFORM_DB_TABLE')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self._schema_constraints = None
+        self._reversed_table_names = None
+
+    @contextmanager
+    def cache_constraints(self):
+        """
+        Cache the constraints of each schema within the block (nested blocks
+        share the cache of the outermost one)
+        """
+        if self._schema_constraints is not None:
+            yield
+            return
+
+        self._schema_constraints = {}
+        try:
+            yield
+        finally:
+            self._schema_constraints = None
+
+    def clear_cache(self):
+        if self._schema_constraints is not None:
+            self._schema_constraints.clear()
+
+    def identifier_converter(self, name):
+        # Named `table_name_converter` before Django 2.2
+        parent = super()
+        if hasattr(parent, 'identifier_converter'):
+            return parent.identifier_converter(name)
+        return parent.table_name_converter(name)
+
+    def get_constraints(self, cursor, table_name):
+        table_name = self._real_table_name(table_name)
+
+        if not self.sql_get_constraints:
+            return super().get_constraints(cursor, table_name)
+
+        owner, table = split_identifier(table_name)
+        owner = owner or None
+        cache = self._schema_constraints
+        if cache is None:
+            constraints = self.get_schema_constraints(cursor, owner)
+        else:
+            if owner not in cache:
+                cache[owner] = self.get_schema_constraints(cursor, owner)
+            constraints = cache[owner]
+
+        return dict(constraints.get(self.identifier_converter(table), {}))
+
+    def get_schema_constraints(self, cursor, owner=None):
+        """
+        Retrieve the constraints of all tables from the schema, as a mapping
+        of table names to the `get_constraints()` result for each table.
+        """
+        schema = {}
+
+        def add(table, name, info):
+            table = self.identifier_converter(table)
+            name = self.identifier_converter(name)
+            schema.setdefault(table, {})[name] = info
+
+        # Primary keys, uniques and checks
+        cursor.execute(self.sql_get_constraints, [owner])
+        for table, name, columns, pk, unique, check in cursor.fetchall():
+            add(
+                table,
+                name,
+                {
+                    'columns': split_list(columns),
+                    'primary_key': pk,
+                    'unique': unique,
+                    'foreign_key': None,
+                    'check': check,
+                    'index': unique,  # All uniques come with an index
+                },
+            )
+
+        # Foreign key constraints
+        cursor.execute(self.sql_get_foreign_keys, [owner])
+        for (
+            table,
+            name,
+            columns,
+            other_table,
+            other_column,
+        ) in cursor.fetchall():
+            add(
+                table,
+                name,
+                {
+                    'columns': split_list(columns),
+                    'primary_key': False,
+                    'unique': False,
+                    'foreign_key': (other_table, other_column),
+                    'check': False,
+                    'index': False,
+                },
+            )
+
+        # Indexes (not bound to constraints)
+        cursor.execute(self.sql_get_indexes, [owner])
+        for table, name, type_, columns, orders in cursor.fetchall():
+            add(
+                table,
+                name,
+                {
+                    'columns': split_list(columns),
+                    'primary_key': False,
+                    'unique': False,
+                    'foreign_key': None,
+                    'check': False,
+                    'index': True,
+                    'type': 'idx' if type_ == 'normal' else type_,
+                    'orders': split_list(orders),
+                },
+            )
+
+        return schema
+
+    def get_schema_snapshot(self, cursor, owner=None):
+        """
+        Retrieve the tables, columns, constraints, indexes, sequences, triggers
+        and grants of the schema (see `db_adapter.schema_diff.schema_diff`)
+        """
+        from db_adapter.schema_diff import SchemaSnapshot
+
+        if not self.sql_get_schema_objects:
+            raise NotImplementedError(
+                'subclasses of DatabaseIntrospection may require a '
+                'sql_get_schema_objects query'
+            )
+
+        cursor.execute(self.sql_get_schema_objects, dict(owner=owner))
+        return SchemaSnapshot(cursor.fetchall())
+
+    def get_table_list(self, cursor):
+        table_list = super().get_table_list(cursor)
+        if self._reversed_table_names is None:
+            return table_list
+
+        result = []
+        for info in table_list:
+            name = self.get_model_table_name(info.name)
+            if self._reversed_table_names.setdefault(name, info.name) != (
+                info.name
+            ):
+                name = info.name
+            result.append(info._replace(name=name))
+
+        return result
+
+    def get_table_description(self, cursor, table_name):
+        table_name = self._real_table_name(table_name)
+        return super().get_table_description(cursor, table_name)
+
+    def get_relations(self, cursor, table_name):
+        relations = super().get_relations(
+            cursor, self._real_table_name(table_name)
+        )
+        if self._reversed_table_names is None:
+            return relations
+
+        return {
+            column: (other_column, self.get_model_table_name(other_table))
+            for column, (other_column, other_table) in relations.items()
+        }
+
+    def get_model_table_name(self, table_name):
+        """
+        Return the table name without the parts added by the
+        `DEFAULT_DB_TABLE_PATTERN` setting
+        """
+        parts = split_table_identifiers(
+            table_name, format=self.default_db_table_pattern
+        )
+        return parts.table_name
+
+    def get_model(self, table_name):
+        """
+        Return the installed model bound to a table name from the database
+        """
+        _, name = split_identifier(table_name)
+        name = self.identifier_converter(name)
+
+        return next(
+            (
+                model
+                for model in apps.get_models()
+                if self.identifier_converter(
+                    split_identifier(model._meta.db_table)[1]
+                )
+                == name
+            ),
+            None,
+        )
+
+    def parse_object_name(self, name, type, table=None, columns=None):
+        """
+        Return the parts (`table`, `columns`, `qualifier`...) of an object
+        name built from the object name pattern of its type, if it matches.
+
+        As the parts of a name are joined by underscores, the known `table`
+        and `columns` of the object are used to resolve the remaining ones.
+        """
+        pattern = self.name_builder_class().object_name_pattern(type)
+        known = dict(table=table, columns='_'.join(columns or []))
+        for key, value in known.items():
+            if value:
+                value = self.identifier_converter(value)
+                pattern = pattern.replace('{%s}' % key, value)
+
+        _, name = split_identifier(name)
+        result = compile_pattern(pattern).parse(self.identifier_converter(name))
+        return result.named if result else None
+
+    @contextmanager
+    def reverse_table_patterns(self):
+        """
+        Expose the tables without the parts added by `DEFAULT_DB_TABLE_PATTERN`
+        (used by `adapterinspectdb`), as the pattern is applied again on models
+        """
+        should_reverse = (
+            self.enable_transform_db_table and self.default_db_table_pattern
+        )
+        if not should_reverse:
+            yield
+            return
+
+        self._reversed_table_names = {}
+        try:
+            yield
+        finally:
+            self._reversed_table_names = None
+
+    def _real_table_name(self, table_name):
+        if not self._reversed_table_names:
+            return table_name
+        return self._reversed_table_names.get(table_name, table_name)
@@ -1,25 +1,29 @@
+import re
 from functools import lru_cache
 
-import sqlparse
-
 from django.db.utils import ProgrammingError
-from django.utils.functional import cached_property
 
-from db_adapter.settings import db_settings
+from db_adapter.instrumentation import timed
+from db_adapter.settings import db_settings, setting
 from db_adapter.utils import enforce_model, enforce_model_fields
 
+# Literals kept as is when unquoting identifiers, like the PARAMETERS of Oracle
+# Text indexes (`SYNC (EVERY "SYSDATE+1/24")`)
+UNQUOTE_PATTERN = re.compile(r"(PARAMETERS\s*\(.*?'\s*\))|\"", re.DOTALL)
+
 
 class DatabaseOperations:
     # Overrideable SQL statements
     sql_create_sequence = None
     sql_create_trigger = None
     sql_grant = 'GRANT %(privileges)s ON %(name)s TO %(role)s'
+    sql_direct_path_hint = '/*+ APPEND */'
 
     # Setting variables
-    role_name = db_settings.DEFAULT_ROLE_NAME
-    name_builder_class = db_settings.NAME_BUILDER_CLASS
-    default_object_privileges = db_settings.DEFAULT_OBJECT_PRIVILEGES
-    sql_format_options = db_settings.SQL_FORMAT_OPTIONS
+    role_name = setting('DEFAULT_ROLE_NAME')
+    name_builder_class = setting('NAME_BUILDER_CLASS')
+    default_object_privileges = setting('DEFAULT_OBJECT_PRIVILEGES')
+    sql_format_options = setting('SQL_FORMAT_OPTIONS')
 
     def autoinc_sql(self, table, column):
         if not self.sql_create_sequence and not self.sql_create_trigger:
@@ -67,19 +71,41 @@ class DatabaseOperations:
             role=self.quote_name(self.role_name),
         )
 
+    def insert_statement(self, *args, **kwargs):
+        sql = super().insert_statement(*args, **kwargs)
+
+        # Direct-path inserts (for `INSERT ... SELECT`, like bulk_create) while
+        # loading data, committed as soon as they are executed, see
+        # `db_adapter.bulk_load`
+        bulk_load = getattr(self.connection, 'bulk_load', None)
+        if bulk_load is None or not bulk_load.direct_path:
+            return sql
+
+        return sql.replace('INSERT', 'INSERT %s' % self.sql_direct_path_hint, 1)
+
+    @timed('format_sql')
     def format_sql(self, sql, **kwargs):
+        import sqlparse
+
         opts = {**self.sql_format_options, **kwargs}
 
         formatted = str(sql)
 
         if opts.pop('unquote', False):
-            formatted = formatted.replace('"', '')
+            formatted = UNQUOTE_PATTERN.sub(
+                lambda match: match.group(1) or '', formatted
+            )
 
         return sqlparse.format(formatted, **opts)
 
-    @cached_property
+    @property
     def name_builder(self):
-        return self.name_builder_class()
+        # Built once per version of the settings
+        version, builder = self.__dict__.get('_name_builder', (None, None))
+        if version != db_settings.version:
+            builder = self.name_builder_class()
+            self._name_builder = (db_settings.version, builder)
+        return builder
 
     @lru_cache(maxsize=None)
     def _enforce_model_field_instances(self, table, column=''):
@@ -88,6 +114,10 @@ class DatabaseOperations:
 
         return model, field
 
+    db_settings.register_invalidation(
+        _enforce_model_field_instances.cache_clear
+    )
+
     def _get_sequence_name(self, table, column):
         model, field = self._enforce_model_field_instances(table, column)
         name = self.name_builder.process_name(model, [field], type='sequence')
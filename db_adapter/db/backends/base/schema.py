@@ -1,9 +1,33 @@
+import copy
 import logging
+import random
+import re
+import sys
+import time
 from typing import Tuple
 
+from django.apps.registry import Apps
+from django.db.backends.base.schema import _related_non_m2m_objects
+from django.db.backends.utils import split_identifier
 from django.db.models import Field, Model
+from django.db.utils import DatabaseError
 
-from db_adapter.settings import db_settings
+from db_adapter.ddl_references import (
+    Columns,
+    DeferredStatement,
+    Statement,
+    Table,
+)
+from db_adapter.executor import ParallelExecutor
+from db_adapter.indexes import ContextIndex, UpperIndex
+from db_adapter.instrumentation import (
+    PhaseTimings,
+    current_timings,
+    phase_timings_collected,
+    timed,
+)
+from db_adapter.schema_diff import statement_object
+from db_adapter.settings import setting
 from db_adapter.utils import enforce_model, enforce_model_fields
 
 logger = logging.getLogger('django.db.backends.schema')
@@ -20,11 +44,119 @@ class DatabaseSchemaEditor:
     sql_comment_on_column = (
         "COMMENT ON COLUMN %(table)s.%(column)s IS '%(comment)s'"
     )
+    sql_create_function_index = (
+        'CREATE INDEX %(name)s ON %(table)s (%(expressions)s)'
+    )
+    sql_create_context_index = (
+        'CREATE INDEX %(name)s ON %(table)s (%(columns)s) '
+        "INDEXTYPE IS CTXSYS.CONTEXT PARAMETERS ('SYNC (%(sync)s)')"
+    )
+    sql_create_materialized_view = (
+        'CREATE MATERIALIZED VIEW %(table)s BUILD IMMEDIATE '
+        'REFRESH %(refresh)s AS %(query)s'
+    )
+    sql_create_materialized_view_log = (
+        'CREATE MATERIALIZED VIEW LOG ON %(table)s '
+        'WITH %(options)s INCLUDING NEW VALUES'
+    )
+    sql_delete_materialized_view = 'DROP MATERIALIZED VIEW %(table)s'
+    sql_gather_table_stats = (
+        'BEGIN DBMS_STATS.GATHER_TABLE_STATS('
+        "ownname => %(owner)s, tabname => '%(table)s', "
+        'estimate_percent => %(estimate_percent)s, '
+        'degree => %(degree)s, cascade => %(cascade)s);END;'
+    )
+    sql_alter_index_visible = 'ALTER INDEX %(name)s VISIBLE'
+    sql_index_invisible = ' INVISIBLE'
+    sql_index_parallel = ' PARALLEL %(degree)s'
+    sql_alter_index_noparallel = 'ALTER INDEX %(name)s NOPARALLEL'
+    sql_constraint_novalidate = ' ENABLE NOVALIDATE'
+    sql_validate_constraint = (
+        'ALTER TABLE %(table)s MODIFY CONSTRAINT %(name)s VALIDATE'
+    )
+    sql_column_not_null = ' CONSTRAINT %(name)s NOT NULL'
+    sql_batch_block = (
+        'DECLARE i PLS_INTEGER := 0; BEGIN %(statements)s'
+        'EXCEPTION WHEN OTHERS THEN RAISE_APPLICATION_ERROR('
+        "-20001, 'Statement ' || i || ': ' || SQLERRM);END;"
+    )
+    sql_batch_statement = "i := %(index)s; EXECUTE IMMEDIATE '%(sql)s'; "
+    sql_set_ddl_lock_timeout = (
+        'ALTER SESSION SET DDL_LOCK_TIMEOUT = %(timeout)s'
+    )
+    sql_can_redef_table = (
+        'BEGIN DBMS_REDEFINITION.CAN_REDEF_TABLE('
+        "uname => %(owner)s, tname => '%(table)s', "
+        'options_flag => %(options)s);END;'
+    )
+    sql_start_redef_table = (
+        'BEGIN DBMS_REDEFINITION.START_REDEF_TABLE('
+        "uname => %(owner)s, orig_table => '%(table)s', "
+        "int_table => '%(interim)s', options_flag => %(options)s);END;"
+    )
+    sql_copy_table_dependents = (
+        'DECLARE num_errors PLS_INTEGER; '
+        'BEGIN DBMS_REDEFINITION.COPY_TABLE_DEPENDENTS('
+        "uname => %(owner)s, orig_table => '%(table)s', "
+        "int_table => '%(interim)s', "
+        'copy_indexes => DBMS_REDEFINITION.CONS_ORIG_PARAMS, '
+        'copy_triggers => TRUE, copy_constraints => TRUE, '
+        'copy_privileges => TRUE, ignore_errors => FALSE, '
+        'num_errors => num_errors);END;'
+    )
+    sql_sync_interim_table = (
+        'BEGIN DBMS_REDEFINITION.SYNC_INTERIM_TABLE('
+        "uname => %(owner)s, orig_table => '%(table)s', "
+        "int_table => '%(interim)s');END;"
+    )
+    sql_finish_redef_table = (
+        'BEGIN DBMS_REDEFINITION.FINISH_REDEF_TABLE('
+        "uname => %(owner)s, orig_table => '%(table)s', "
+        "int_table => '%(interim)s');END;"
+    )
+    sql_abort_redef_table = (
+        'BEGIN DBMS_REDEFINITION.ABORT_REDEF_TABLE('
+        "uname => %(owner)s, orig_table => '%(table)s', "
+        "int_table => '%(interim)s');END;"
+    )
 
     # Executable SQL definitions
     sql_ending = ';'
     sql_column_separator = ', '
 
+    # Statements run by PL/SQL block (others, like PL/SQL blocks themselves,
+    # run alone), see `db_adapter.schema_diff.statement_object`
+    batch_statement_types = [
+        'COLUMN',
+        'CONSTRAINT',
+        'INDEX',
+        'VISIBLE_INDEX',
+        'COMMENT',
+        'GRANT',
+        'SEQUENCE',
+    ]
+
+    # Errors of statements waiting for locks held by other sessions (resource
+    # busy, library cache lock timeout and deadlock), retried on
+    # `DDL_RETRY_OPTIONS`
+    retryable_errors = ['ORA-00054', 'ORA-04021', 'ORA-00060']
+
+    # Steps of deferred statements (the ones missing from the
+    # `SQL_STATEMENTS_ORDER` setting run after the others)
+    deferred_sql_steps = [
+        'MATERIALIZED_VIEW_LOG',
+        'MATERIALIZED_VIEW',
+        'PRIMARY_KEY',
+        'UNIQUE',
+        'FOREIGN_KEY',
+        'CHECK',
+        'INDEX',
+        'COMMENT',
+        'CONTROL',
+        'AUTOINCREMENT',
+        'STATISTICS',
+    ]
+
     # Mapping of index name suffix to their database object types
     suffix_object_types = {
         '_check': 'CHECK',
@@ -35,22 +167,262 @@ class DatabaseSchemaEditor:
     }
 
     # Setting variables
-    name_builder_class = db_settings.NAME_BUILDER_CLASS
-    deferred_sql_order = db_settings.SQL_STATEMENTS_ORDER
+    name_builder_class = setting('NAME_BUILDER_CLASS')
+    deferred_sql_order = setting('SQL_STATEMENTS_ORDER')
+    gather_statistics = setting('GATHER_STATISTICS')
+    statistics_options = setting('STATISTICS_OPTIONS')
+    invisible_indexes = setting('INVISIBLE_INDEXES')
+    validate_constraint_names = setting('VALIDATE_CONSTRAINT_NAMES')
+    deferred_sql_workers = setting('DEFERRED_SQL_WORKERS')
+    sql_batch_size = setting('SQL_BATCH_SIZE')
+    ddl_lock_timeout = setting('DDL_LOCK_TIMEOUT')
+    ddl_lock_timeout_restore = setting('DDL_LOCK_TIMEOUT_RESTORE')
+    ddl_retry_options = setting('DDL_RETRY_OPTIONS')
+    online_redefinition = setting('ONLINE_REDEFINITION')
+    collect_phase_timings = setting('PHASE_TIMINGS')
+    slow_statement_threshold = setting('SLOW_STATEMENT_THRESHOLD')
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         # Init deferred column SQL dict
-        order = self.deferred_sql_order
-        self.deferred_column_sql = {item: [] for item in order}
-        self.deferred_table_sql = {item: [] for item in order}
+        order = list(self.deferred_sql_order)
+        self.deferred_steps = order + [
+            item for item in self.deferred_sql_steps if item not in order
+        ]
+        self.deferred_column_sql = {item: [] for item in self.deferred_steps}
+        self.deferred_table_sql = {item: [] for item in self.deferred_steps}
+
+        # Tables with materialized view logs created by this editor
+        self.materialized_view_logs = set()
+
+        # Indexes created INVISIBLE, made visible on the `STATISTICS` step
+        self.invisible_index_names = []
+
+        # Steps of `SQL_STATEMENTS_ORDER` of the deferred statements
+        self.deferred_sql_categories = {}
+
+        # Statements and durations of parallel deferred statements
+        self.deferred_sql_timings = []
+
+        # Statements, attempts and time spent waiting for locks of retried
+        # statements
+        self.lock_waits = []
+
+        # Durations and number of calls of each phase (when collected)
+        self.phase_timings = None
+        self._phase_timings_token = None
+        self._constraints_cache = None
+
+        # Whether session options are set back when exiting (see
+        # `prepare_session`)
+        self._session_prepared = False
+
+    def __enter__(self):
+        editor = super().__enter__()
+
+        if self.collect_phase_timings:
+            self.phase_timings = PhaseTimings()
+            self._phase_timings_token = current_timings.set(self.phase_timings)
+
+        # Dictionary metadata is only cached for the life of the editor
+        cache_constraints = getattr(
+            self.connection.introspection, 'cache_constraints', None
+        )
+        if cache_constraints is not None:
+            self._constraints_cache = cache_constraints()
+            self._constraints_cache.__enter__()
+
+        try:
+            self.prepare_session()
+        except Exception:
+            # Leave the atomic block and set back what was entered
+            self.__exit__(*sys.exc_info())
+            raise
+
+        return editor
+
+    def prepare_session(self):
+        """
+        Set the session options of the connection (statements wait up to
+        `DDL_LOCK_TIMEOUT` seconds for locks held by other sessions)
+        """
+        if self.ddl_lock_timeout is None or self.collect_sql:
+            return
+
+        super().execute(
+            self.sql_set_ddl_lock_timeout % dict(timeout=self.ddl_lock_timeout),
+            None,
+        )
+        self._session_prepared = True
+
+    def restore_session(self):
+        """
+        Set back the session options changed by `prepare_session`, as the
+        connection outlives the editor (the lock timeout is set to
+        `DDL_LOCK_TIMEOUT_RESTORE`, the database default by default)
+        """
+        if not self._session_prepared:
+            return
+
+        self._session_prepared = False
+        super().execute(
+            self.sql_set_ddl_lock_timeout
+            % dict(timeout=self.ddl_lock_timeout_restore),
+            None,
+        )
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            # Statements left in the steps, like indexes created INVISIBLE by
+            # operations not flushing them (add_index, alter_index_together)
+            if exc_type is None:
+                self._flush_deferred_sql()
+
+            if exc_type is None and self._parallel_deferred_sql():
+                executor = ParallelExecutor(
+                    self.connection.alias, workers=self.deferred_sql_workers
+                )
+                executor.extend(self.deferred_sql)
+                self.deferred_sql = []
+                try:
+                    executor.run()
+                finally:
+                    self.deferred_sql_timings = executor.timings
+
+                    # Slow statements are logged by the editors of workers
+                    report = getattr(self.connection, 'statement_report', None)
+                    for task in executor.tasks:
+                        if report is not None and task.duration is not None:
+                            report.add(task.sql, task.duration, task.object)
+            elif exc_type is None and self._batch_deferred_sql():
+                self.execute_batches(self.deferred_sql)
+                self.deferred_sql = []
+                self.deferred_sql_categories.clear()
+
+            return super().__exit__(exc_type, exc_value, traceback)
+        finally:
+            if self._constraints_cache is not None:
+                self._constraints_cache.__exit__(None, None, None)
+                self._constraints_cache = None
+            self.restore_session()
+
+            if self._phase_timings_token is not None:
+                self._finish_phase_timings()
+
+    def _clear_introspection_cache(self):
+        clear_cache = getattr(
+            self.connection.introspection, 'clear_cache', None
+        )
+        if clear_cache:
+            clear_cache()
+
+    def _finish_phase_timings(self):
+        current_timings.reset(self._phase_timings_token)
+        self._phase_timings_token = None
+
+        if self.phase_timings:
+            logger.info(
+                'Schema editor phases:\n%s', self.phase_timings.summary()
+            )
+        phase_timings_collected.send(
+            sender=self.__class__, editor=self, timings=self.phase_timings
+        )
+
+    def _parallel_deferred_sql(self):
+        # Other connections cannot see the changes of an atomic migration
+        return (
+            self.deferred_sql_workers > 1
+            and not self.collect_sql
+            and not self.atomic_migration
+            and len(self.deferred_sql) > 1
+        )
+
+    def _batch_deferred_sql(self):
+        return self.sql_batch_size > 1 and not self.collect_sql
+
+    def execute_batches(self, statements):
+        """
+        Execute consecutive statements of the same step of
+        `SQL_STATEMENTS_ORDER` (like primary keys or foreign keys, or of the
+        same type for other statements) by PL/SQL block of up to
+        `SQL_BATCH_SIZE` statements, saving round-trips to the database
+        """
+        batch = []
+        batch_category = None
+
+        for sql in statements:
+            obj = statement_object(sql)
+            obj_type = obj.type if obj else None
+            category = self.deferred_sql_categories.get(str(sql), obj_type)
+
+            batched = obj_type in self.batch_statement_types
+            is_full = len(batch) >= self.sql_batch_size
+            if batch and (category != batch_category or is_full or not batched):
+                self.execute_batch(batch)
+                batch = []
+
+            if not batched:
+                self.execute(sql)
+                continue
+
+            batch_category = category
+            batch.append(sql)
+
+        if batch:
+            self.execute_batch(batch)
+
+    def execute_batch(self, statements):
+        """
+        Execute statements in a single PL/SQL block. Errors tell which
+        statement failed (the ones before it are already applied, as DDL
+        statements are committed one by one).
+        """
+        if len(statements) == 1:
+            return self.execute(statements[0])
+
+        formatted = [
+            self.connection.ops.format_sql(str(sql)) for sql in statements
+        ]
+        block = self.sql_batch_block % dict(
+            statements=''.join(
+                self.sql_batch_statement
+                % dict(index=index, sql=sql.replace("'", "''"))
+                for index, sql in enumerate(formatted, 1)
+            )
+        )
 
+        try:
+            # Statements are already formatted, and retried statements are
+            # resumed alone, see below
+            self.execute_with_retry(block, None, retries=0)
+        except DatabaseError as err:
+            match = re.search(r'Statement (\d+): ', str(err))
+            if not match:
+                raise
+
+            index = int(match.group(1)) - 1
+            if self.ddl_retry_options['retries'] and self.is_retryable_error(
+                err
+            ):
+                for sql in formatted[index:]:
+                    self.execute_with_retry(sql)
+                return
+
+            sql = formatted[index]
+            raise type(err)('%s\nStatement: %s' % (err, sql)) from err
+
+    @timed('execute')
     def execute(self, sql, params=()):
         sql = self.connection.ops.format_sql(sql)
 
         if self.collect_sql:
-            ending = '' if sql.endswith(self.sql_ending) else self.sql_ending
+            ending = self.sql_ending
+            if sql.endswith(ending):
+                ending = ''
+            elif sql.endswith(';') and ending.startswith(';'):
+                # PL/SQL blocks end with their own semicolon (like `END;`)
+                ending = ending[1:]
             if params is not None:
                 self.collected_sql.append(
                     (sql % tuple(map(self.quote_value, params))) + ending
@@ -58,11 +430,98 @@ class DatabaseSchemaEditor:
             else:
                 self.collected_sql.append(sql + ending)
         else:
-            super().execute(sql, params)
+            self.execute_with_retry(sql, params)
+
+    def execute_with_retry(self, sql, params=(), retries=None):
+        """
+        Execute a statement, retrying it after a jittered exponential backoff
+        while it fails on locks held by other sessions
+        """
+        retries = (
+            self.ddl_retry_options['retries'] if retries is None else retries
+        )
+        attempt = 0
+        waited = 0.0
+        started = time.perf_counter()
+
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    result = super().execute(sql, params)
+                except DatabaseError as err:
+                    waited += time.perf_counter() - start
+                    if attempt >= retries or not self.is_retryable_error(err):
+                        raise
+
+                    delay = self.retry_delay(attempt)
+                    attempt += 1
+                    logger.warning(
+                        '%s (attempt %d of %d, retrying in %.1f seconds): %s',
+                        str(err).strip(),
+                        attempt,
+                        retries + 1,
+                        delay,
+                        sql,
+                    )
+                    time.sleep(delay)
+                    waited += delay
+                else:
+                    # Cached dictionary metadata is stale after DDL
+                    self._clear_introspection_cache()
+                    self.record_statement(sql, time.perf_counter() - started)
+                    return result
+        finally:
+            if attempt:
+                self.lock_waits.append((sql, attempt + 1, waited))
+                logger.info(
+                    '(%.3f) waiting for locks (%d attempts): %s',
+                    waited,
+                    attempt + 1,
+                    sql,
+                )
 
+    def record_statement(self, sql, duration):
+        """
+        Log statements slower than `SLOW_STATEMENT_THRESHOLD` and add them to
+        the report of the connection (see `db_adapter.statement_report`)
+        """
+        threshold = self.slow_statement_threshold
+        is_slow = threshold is not None and duration >= threshold
+        report = getattr(self.connection, 'statement_report', None)
+        if not is_slow and report is None:
+            return
+
+        obj = statement_object(sql)
+        if is_slow:
+            logger.warning(
+                'Slow statement (%.3fs, %s %s): %s',
+                duration,
+                obj.type if obj else 'UNKNOWN',
+                (obj.name or obj.table) if obj else '-',
+                sql,
+            )
+
+        if report is not None:
+            report.add(sql, duration, obj)
+
+    def is_retryable_error(self, error):
+        message = str(error)
+        return any(code in message for code in self.retryable_errors)
+
+    def retry_delay(self, attempt):
+        options = self.ddl_retry_options
+        delay = min(options['backoff'] * 2**attempt, options['max_backoff'])
+        return delay * random.uniform(1 - options['jitter'], 1)
+
+    @timed('column_sql')
     def column_sql(
         self, model: Model, field: Field, include_default=False
     ) -> Tuple[str, list]:
+        """
+        Return the definition of the column. NOT NULL is enforced by a named
+        check constraint, or inline along with the default of added columns.
+        """
         # Get the column's type and use that as the basis of the SQL
         db_params = field.db_parameters(connection=self.connection)
         sql = db_params['type']
@@ -72,11 +531,30 @@ class DatabaseSchemaEditor:
         if sql is None:
             return None, None
 
+        # Work out the default (set on existing rows as a metadata-only
+        # change when adding columns)
+        include_default = include_default and not self.skip_default(field)
+        if include_default:
+            default_value = self.effective_default(field)
+            if default_value is not None:
+                if self.connection.features.requires_literal_defaults:
+                    sql += ' DEFAULT %s' % self.prepare_default(default_value)
+                else:
+                    sql += ' DEFAULT %s'
+                    params += [default_value]
+
         if field.null and not self.connection.features.implied_column_null:
             sql += ' NULL'
 
-        # Check constraints
-        if not field.null:
+        # Check constraints (NOT NULL with a default is a metadata-only
+        # change, while a check constraint would validate existing rows)
+        if not field.null and include_default:
+            sql += self.sql_column_not_null % dict(
+                name=self._create_index_name(
+                    model, [field.column], suffix='_check', qualifier='_nn'
+                )
+            )
+        elif not field.null:
             check = '%s IS NOT NULL' % self.quote_name(field.column)
             self.deferred_column_sql['CHECK'].append(
                 self._create_check_sql_for_field(
@@ -126,7 +604,7 @@ class DatabaseSchemaEditor:
 
         return sql, params
 
-    def table_sql(self, model: Model) -> Tuple[str, list]:
+    def table_sql(self, model: Model, db_table=None) -> Tuple[str, list]:
         column_sqls = []
         params = []
 
@@ -145,7 +623,7 @@ class DatabaseSchemaEditor:
             )
 
         sql = self.sql_create_table % dict(
-            table=self.quote_name(model._meta.db_table),
+            table=self.quote_name(db_table or model._meta.db_table),
             definition=self.sql_column_separator.join(column_sqls),
         )
 
@@ -166,29 +644,553 @@ class DatabaseSchemaEditor:
         if control_sql:
             self.deferred_table_sql['CONTROL'].append(control_sql)
 
+        # Optimizer statistics (held until the data is loaded during a bulk
+        # load), before its indexes are made visible
+        if self.gather_statistics:
+            self.deferred_table_sql['STATISTICS'].extend(
+                self.statistics_sql(model, visible_indexes=False)
+            )
+
         return sql, params
 
+    def _loading_data(self):
+        return (
+            not self.collect_sql
+            and getattr(self.connection, 'bulk_load', None) is not None
+        )
+
+    def statistics_sql(self, model: Model, visible_indexes=True):
+        output = []
+
+        if self.gather_statistics:
+            namespace, table = split_identifier(model._meta.db_table)
+            opts = self.statistics_options
+            output.append(
+                self.sql_gather_table_stats
+                % dict(
+                    owner="'%s'" % namespace if namespace else 'USER',
+                    table=self.quote_name(table).strip('"'),
+                    estimate_percent=opts['estimate_percent'],
+                    degree=opts['degree'],
+                    cascade='TRUE' if opts['cascade'] else 'FALSE',
+                )
+            )
+
+        # Indexes are made visible only after statistics are gathered
+        if visible_indexes and self.invisible_indexes:
+            output.extend(
+                self.sql_alter_index_visible % dict(name=name)
+                for name in self._model_index_names(model)
+            )
+
+        return output
+
+    def _defer_visible_indexes(self):
+        self.deferred_table_sql['STATISTICS'].extend(
+            self.sql_alter_index_visible % dict(name=name)
+            for name in self.invisible_index_names
+        )
+        self.invisible_index_names.clear()
+
+    def update_statistics(self, model: Model):
+        """
+        Gather optimizer statistics (and make invisible indexes visible) for
+        an existing model, like after data is loaded by a data migration.
+        """
+        for sql in self.statistics_sql(model):
+            self.execute(sql, params=None)
+
+    def materialized_view_sql(self, model: Model) -> Tuple[str, list]:
+        view = model._meta.materialized_view
+
+        # Materialized view logs on base tables (once per table)
+        for table in view.get_base_tables(model):
+            if table in self.materialized_view_logs:
+                continue
+
+            self.materialized_view_logs.add(table)
+            self.deferred_table_sql['MATERIALIZED_VIEW_LOG'].append(
+                self.sql_create_materialized_view_log
+                % dict(
+                    table=self.quote_name(table),
+                    options=view.log_options,
+                )
+            )
+
+        sql = self.sql_create_materialized_view % dict(
+            table=self.quote_name(model._meta.db_table),
+            refresh=view.refresh_sql(),
+            query=view.query,
+        )
+
+        # Comment columns for fields with help_text
+        for field in model._meta.local_fields:
+            if field.help_text:
+                self.deferred_table_sql['COMMENT'].append(
+                    self._create_comment_sql(model, field)
+                )
+
+        self.deferred_table_sql['INDEX'].extend(self._model_indexes_sql(model))
+
+        # Materialized views are read-only
+        control_sql = self.connection.ops.control_sql(
+            model._meta.db_table, privileges=['SELECT']
+        )
+        if control_sql:
+            self.deferred_table_sql['CONTROL'].append(control_sql)
+
+        return sql, []
+
     def create_model(self, model: Model):
-        sql, params = self.table_sql(model)
+        if getattr(model._meta, 'materialized_view', None):
+            # Deferred, as materialized view logs must be created before
+            sql, _ = self.materialized_view_sql(model)
+            self.deferred_table_sql['MATERIALIZED_VIEW'].append(sql)
+        else:
+            sql, params = self.table_sql(model)
+
+            if sql:
+                self.execute(sql, params or None)
+
+        self._flush_deferred_sql()
+
+    def model_statements(self, model: Model):
+        """
+        Return the statements collected by `create_model`, grouped by step of
+        `SQL_STATEMENTS_ORDER` (the table itself on the `TABLE` step) instead
+        of deferring them. Only available on editors collecting SQL.
+        """
+        if not self.collect_sql:
+            raise ValueError('model_statements() requires collect_sql=True')
+
+        collected_sql = self.collected_sql
+        statements = {}
+        try:
+            self.collected_sql = statements['TABLE'] = []
+            if getattr(model._meta, 'materialized_view', None):
+                sql, _ = self.materialized_view_sql(model)
+                self.deferred_table_sql['MATERIALIZED_VIEW'].append(sql)
+            else:
+                sql, params = self.table_sql(model)
+                self.execute(sql, params or None)
+
+            self._defer_visible_indexes()
+            for item in self.deferred_steps:
+                self.collected_sql = statements[item] = []
+                for sql in self.deferred_column_sql[item]:
+                    self.execute(sql)
+                for sql in self.deferred_table_sql[item]:
+                    self.execute(sql)
+
+                self.deferred_column_sql[item].clear()
+                self.deferred_table_sql[item].clear()
+        finally:
+            self.collected_sql = collected_sql
+
+        return statements
+
+    def add_field(self, model: Model, field: Field):
+        # Special-case implicit M2M tables
+        through = field.many_to_many and field.remote_field.through
+        if through and through._meta.auto_created:
+            return self.create_model(through)
 
-        if sql:
+        # Migrations provide the model from the previous state (without the
+        # new field), while object names are built from the field's model
+        model = getattr(field, 'model', model)
+
+        # Nullable columns, or NOT NULL columns with a default, are added as
+        # a metadata-only change. Other constraints are added by named
+        # statements
+        definition, params = self.column_sql(model, field, include_default=True)
+        if definition is None:
+            return
+
+        sql = self.sql_create_column % dict(
+            table=self.quote_name(model._meta.db_table),
+            column=self.quote_name(field.column),
+            definition=definition,
+        )
+        self.execute(sql, params or None)
+
+        # Drop the default if we need to
+        # (Django usually does not use in-database defaults)
+        default_value = self.effective_default(field)
+        if not self.skip_default(field) and default_value is not None:
+            if hasattr(self, '_alter_column_default_sql'):
+                changes_sql, params = self._alter_column_default_sql(
+                    model, None, field, drop=True
+                )
+            else:  # Django 1.11
+                changes_sql = self.sql_alter_column_no_default % dict(
+                    column=self.quote_name(field.column)
+                )
+                params = []
+            sql = self.sql_alter_column % dict(
+                table=self.quote_name(model._meta.db_table),
+                changes=changes_sql,
+            )
             self.execute(sql, params or None)
 
-        for item in self.deferred_sql_order:
+        self.deferred_column_sql['INDEX'].extend(
+            self._field_indexes_sql(model, field)
+        )
+
+        self._flush_deferred_sql()
+
+        # Reset connection if required
+        if self.connection.features.connection_persists_old_columns:
+            self.connection.close()
+
+    def remove_field(self, model: Model, field: Field):
+        super().remove_field(model, field)
+
+        # Discard the deferred statements of the column (like Django 2.0)
+        self.deferred_sql = [
+            sql
+            for sql in self.deferred_sql
+            if not (
+                isinstance(sql, Statement)
+                and sql.references_column(model._meta.db_table, field.column)
+            )
+        ]
+
+    def alter_field(self, model: Model, old_field, new_field, strict=False):
+        if self._redefinition_required(model, old_field, new_field):
+            self.redefine_table(model, old_field, new_field)
+        else:
+            super().alter_field(model, old_field, new_field, strict)
+        self._flush_deferred_sql()
+
+    def _redefinition_required(self, model: Model, old_field, new_field):
+        if not self.online_redefinition:
+            return False
+        if getattr(model._meta, 'materialized_view', None):
+            return False
+
+        old_type = old_field.db_parameters(connection=self.connection)['type']
+        new_type = new_field.db_parameters(connection=self.connection)['type']
+        if old_type is None or new_type is None or old_type == new_type:
+            return False
+
+        # Only column type changes (along with other changes, or on columns
+        # referenced by foreign keys, columns are altered in place)
+        attributes = ['column', 'null', 'primary_key', 'unique', 'db_index']
+        if any(
+            getattr(old_field, attr) != getattr(new_field, attr)
+            for attr in attributes
+        ):
+            return False
+
+        return not any(_related_non_m2m_objects(old_field, new_field))
+
+    def redefine_table(self, model: Model, old_field, new_field):
+        """
+        Change the type of a column with DBMS_REDEFINITION: rows are copied to
+        an interim table (created from the new state of the model) while the
+        table remains available, then dependent objects are copied and both
+        tables are swapped, locking the table only briefly
+        """
+        new_model = self._redefined_model(model, old_field, new_field)
+        interim_table = self.connection.ops.name_builder.process_name(
+            model, [], type='interim_table'
+        )
+
+        namespace, table = split_identifier(model._meta.db_table)
+        _, interim = split_identifier(interim_table)
+        args = dict(
+            owner="'%s'" % namespace if namespace else 'USER',
+            table=self.quote_name(table).strip('"'),
+            interim=self.quote_name(interim).strip('"'),
+            options=(
+                # Rows of tables are identified by their primary keys, unless
+                # its type is changing
+                'DBMS_REDEFINITION.CONS_USE_ROWID'
+                if new_field.primary_key
+                else 'DBMS_REDEFINITION.CONS_USE_PK'
+            ),
+        )
+        delete_interim_sql = self.sql_delete_table % dict(
+            table=self.quote_name(interim_table)
+        )
+
+        # Only the interim table is created, as constraints and indexes are
+        # copied from the table
+        editor = type(self)(self.connection, collect_sql=True)
+        sql, params = editor.table_sql(new_model, db_table=interim_table)
+
+        self.execute(self.sql_can_redef_table % args)
+        self.execute(sql, params or None)
+        try:
+            for template in [
+                self.sql_start_redef_table,
+                self.sql_copy_table_dependents,
+                self.sql_sync_interim_table,
+                self.sql_finish_redef_table,
+            ]:
+                self.execute(template % args)
+        except DatabaseError:
+            self.execute(self.sql_abort_redef_table % args)
+            self.execute(delete_interim_sql)
+            raise
+
+        # The interim table holds the previous version of the table
+        self.execute(delete_interim_sql)
+
+        # Comments are not copied with dependent objects
+        for field in new_model._meta.local_fields:
+            if field.help_text:
+                self.deferred_table_sql['COMMENT'].append(
+                    self._create_comment_sql(model, field)
+                )
+
+    def _redefined_model(self, model: Model, old_field, new_field):
+        """
+        Return a copy of the model with the new field (like the SQLite backend
+        remaking tables)
+        """
+        body = {
+            field.name: copy.deepcopy(
+                new_field if field.name == old_field.name else field
+            )
+            for field in model._meta.local_concrete_fields
+        }
+        body.update(
+            Meta=type(
+                'Meta',
+                (),
+                dict(
+                    app_label=model._meta.app_label,
+                    db_table=model._meta.db_table,
+                    apps=Apps(),
+                ),
+            ),
+            __module__=model.__module__,
+        )
+
+        return type(model._meta.object_name, (Model,), body)
+
+    def _alter_column_null_sql(self, model: Model, old_field, new_field):
+        # NOT NULL is enforced by a named check constraint instead of an
+        # inline column constraint
+        if new_field.null:
+            name = self._create_index_name(
+                model, [old_field.column], suffix='_check', qualifier='_nn'
+            )
+            self.execute(self._delete_check_sql(model, name))
+        else:
+            # Enabled without validating existing rows (locking the table only
+            # briefly), then validated while DML goes on
+            check = '%s IS NOT NULL' % self.quote_name(new_field.column)
+            statement = self._create_check_sql_for_field(
+                model, new_field, check, qualifier='_nn', novalidate=True
+            )
+            self.deferred_column_sql['CHECK'].extend(
+                [
+                    statement,
+                    self.sql_validate_constraint
+                    % dict(
+                        table=self.quote_name(model._meta.db_table),
+                        name=statement.parts['name'],
+                    ),
+                ]
+            )
+
+        return None
+
+    def _flush_deferred_sql(self):
+        """
+        Move statements from the deferred buckets to `deferred_sql`, following
+        the `SQL_STATEMENTS_ORDER` setting (or hold them back during a bulk
+        load, see `db_adapter.bulk_load`)
+        """
+        bulk_load = None
+        if self._loading_data():
+            bulk_load = self.connection.bulk_load
+
+        self._defer_visible_indexes()
+
+        # Objects of deferred statements (created once, even when statements
+        # are repeated, like primary keys of fields also in `unique_together`)
+        objects = set()
+
+        for item in self.deferred_steps:
             sql_column = self.deferred_column_sql[item]
             sql_table = self.deferred_table_sql[item]
 
-            self.deferred_sql.extend(sql_column)
-            self.deferred_sql.extend(sql_table)
+            statements = []
+            for sql in [*sql_column, *sql_table]:
+                if isinstance(sql, DeferredStatement):
+                    if sql.object in objects:
+                        continue
+                    objects.add(sql.object)
+                statements.append(sql)
 
-    def _create_check_sql_for_field(self, model, field, check, qualifier=''):
-        if not qualifier:
-            data_type_check_constraints_suffixes = getattr(
-                self.connection, 'data_type_check_constraints_suffixes', {}
-            )
-            qualifier = data_type_check_constraints_suffixes.get(
-                field.get_internal_type(), ''
+            # Statistics are always gathered once the data is loaded
+            if bulk_load is not None and (
+                item in bulk_load.steps or item == 'STATISTICS'
+            ):
+                bulk_load.hold(item, statements)
+            else:
+                self.deferred_sql.extend(statements)
+                self.deferred_sql_categories.update(
+                    (str(sql), item) for sql in statements
+                )
+
+            sql_column.clear()
+            sql_table.clear()
+
+    def bulk_load_sql(
+        self, item, sql, parallel=None, novalidate=False, **kwargs
+    ):
+        """
+        Return the statements applying a constraint or index held back during
+        a bulk load: indexes are built in parallel (and set back to
+        `NOPARALLEL`), and foreign keys and checks skip the validation of the
+        loaded rows when `novalidate` is set.
+        """
+        sql = str(sql)
+
+        if item == 'INDEX' and parallel:
+            match = re.match(
+                r'\s*CREATE\s+(?:UNIQUE\s+)?INDEX\s+(\S+)', sql, re.IGNORECASE
             )
+            if match:
+                return [
+                    sql + self.sql_index_parallel % dict(degree=parallel),
+                    self.sql_alter_index_noparallel % dict(name=match.group(1)),
+                ]
+
+        # Unless validation is already deferred (see `alter_field`)
+        if (
+            item in ('FOREIGN_KEY', 'CHECK')
+            and novalidate
+            and not sql.upper().endswith('VALIDATE')
+        ):
+            return [sql + self.sql_constraint_novalidate]
+
+        return [sql]
+
+    def delete_model(self, model: Model):
+        if not getattr(model._meta, 'materialized_view', None):
+            return super().delete_model(model)
+
+        self.execute(
+            self.sql_delete_materialized_view
+            % dict(table=self.quote_name(model._meta.db_table))
+        )
+
+    def _constraint_names(
+        self,
+        model,
+        column_names=None,
+        unique=None,
+        primary_key=None,
+        index=None,
+        foreign_key=None,
+        check=None,
+        type_=None,
+        exclude=None,
+    ):
+        """
+        Return the constraint names built from the object name patterns,
+        querying the database only when they cannot be resolved (or when
+        `VALIDATE_CONSTRAINT_NAMES` is enabled).
+        """
+        kwargs = dict(
+            unique=unique,
+            primary_key=primary_key,
+            index=index,
+            foreign_key=foreign_key,
+            check=check,
+            type_=type_,
+            exclude=exclude,
+        )
+
+        names = self._expected_constraint_names(model, column_names, **kwargs)
+        if names is None:
+            return super()._constraint_names(model, column_names, **kwargs)
+
+        excluded = {self._normalize_constraint_name(n) for n in exclude or []}
+        names = [
+            name
+            for name in names
+            if self._normalize_constraint_name(name) not in excluded
+        ]
+
+        if self.validate_constraint_names:
+            found = super()._constraint_names(model, column_names, **kwargs)
+            normalized = {self._normalize_constraint_name(n) for n in found}
+            expected = {self._normalize_constraint_name(n) for n in names}
+            if normalized != expected:
+                logger.warning(
+                    'Expected constraint names %s for table %s, found %s.',
+                    sorted(expected),
+                    model._meta.db_table,
+                    sorted(normalized),
+                )
+                return found
+
+        return names
+
+    def _expected_constraint_names(
+        self,
+        model,
+        column_names=None,
+        unique=None,
+        primary_key=None,
+        index=None,
+        foreign_key=None,
+        check=None,
+        **kwargs,
+    ):
+        if column_names is None:
+            if not primary_key:
+                return None
+            column_names = [model._meta.pk.column]
+
+        try:
+            fields = enforce_model_fields(model, column_names)
+        except StopIteration:
+            return None
+
+        qualifier = ''
+        if primary_key:
+            suffix = '_pk'
+        elif foreign_key:
+            suffix = '_fk'
+        elif check:
+            # Only data type check constraints are looked up by Django
+            qualifier = len(fields) == 1 and self._check_qualifier(fields[0])
+            if not qualifier:
+                return None
+            suffix = '_check'
+        elif unique:
+            suffix = '_uniq'
+        elif index:
+            suffix = '_idx'
+        else:
+            return None
+
+        return [self._create_index_name(model, fields, suffix, qualifier)]
+
+    def _normalize_constraint_name(self, name):
+        _, name = split_identifier(name)
+        return name.upper()
+
+    def _check_qualifier(self, field: Field):
+        data_type_check_constraints_suffixes = getattr(
+            self.connection, 'data_type_check_constraints_suffixes', {}
+        )
+        return data_type_check_constraints_suffixes.get(
+            field.get_internal_type(), ''
+        )
+
+    def _create_check_sql_for_field(
+        self, model, field, check, qualifier='', novalidate=False
+    ):
+        if not qualifier:
+            qualifier = self._check_qualifier(field)
 
         constraint_name = self._create_index_name(
             model,
@@ -197,36 +1199,159 @@ class DatabaseSchemaEditor:
             qualifier=qualifier,
         )
 
-        return self._create_check_sql(model, constraint_name, check)
+        return self._create_check_sql(
+            model,
+            constraint_name,
+            check,
+            columns=[field.column],
+            novalidate=novalidate,
+        )
 
-    def _create_check_sql(self, model: Model, name, check):
-        return self.sql_create_check % dict(
-            table=self.quote_name(model._meta.db_table),
+    def _create_check_sql(
+        self, model: Model, name, check, columns=(), novalidate=False
+    ):
+        table = model._meta.db_table
+        template = self.sql_create_check
+        if novalidate:
+            template += self.sql_constraint_novalidate
+
+        return DeferredStatement(
+            'CONSTRAINT',
+            name,
+            template,
+            table=Table(table, self.quote_name),
             name=self.quote_name(name),
             check=check,
+            # Checked columns (not part of the template), so statements are
+            # discarded along with their columns
+            columns=Columns(table, columns, self.quote_name),
         )
 
     def _create_primary_key_sql(self, model: Model, field: Field):
-        return self.sql_create_pk % dict(
-            table=self.quote_name(model._meta.db_table),
-            name=self.quote_name(
-                self._create_index_name(
-                    model._meta.db_table, [field.column], suffix='_pk'
-                )
-            ),
-            columns=self.quote_name(field.column),
+        table = model._meta.db_table
+        name = self._create_index_name(table, [field.column], suffix='_pk')
+        return DeferredStatement(
+            'CONSTRAINT',
+            name,
+            self.sql_create_pk,
+            table=Table(table, self.quote_name),
+            name=self.quote_name(name),
+            columns=Columns(table, [field.column], self.quote_name),
         )
 
     def _create_comment_sql(self, model: Model, field: Field):
-        return self.sql_comment_on_column % dict(
-            table=self.quote_name(model._meta.db_table),
-            column=self.quote_name(field.column),
+        table = model._meta.db_table
+        return DeferredStatement(
+            'COMMENT',
+            field.column,
+            self.sql_comment_on_column,
+            table=Table(table, self.quote_name),
+            column=Columns(table, [field.column], self.quote_name),
             comment=field.help_text.replace("'", "''"),
         )
 
+    def _create_unique_sql(self, model: Model, columns, *args, **kwargs):
+        return DeferredStatement.from_statement(
+            'CONSTRAINT',
+            super()._create_unique_sql(model, columns, *args, **kwargs),
+        )
+
+    def _create_fk_sql(self, model: Model, field: Field, suffix):
+        return DeferredStatement.from_statement(
+            'CONSTRAINT', super()._create_fk_sql(model, field, suffix)
+        )
+
     def _create_index_sql(self, model, fields, suffix='_idx', **kwargs):
-        return super()._create_index_sql(model, fields, suffix=suffix, **kwargs)
+        invisible = self.invisible_indexes and kwargs.get('sql') is None
+        if invisible:
+            kwargs['sql'] = self.sql_create_index + self.sql_index_invisible
+
+        statement = DeferredStatement.from_statement(
+            'INDEX',
+            super()._create_index_sql(model, fields, suffix=suffix, **kwargs),
+        )
+        if invisible:
+            self.invisible_index_names.append(statement.object_name)
+        return statement
+
+    def _model_index_names(self, model: Model):
+        """
+        Return the names of the B-tree indexes created for the model (the ones
+        from `_model_indexes_sql`, excluding Oracle Text indexes)
+        """
+        opts = model._meta
+        if not opts.managed or opts.proxy or opts.swapped:
+            return []
+
+        names = [
+            self._create_index_name(model, [field.column])
+            for field in opts.local_fields
+            if self._field_should_be_indexed(model, field)
+        ]
+
+        for field_names in opts.index_together:
+            columns = [opts.get_field(field).column for field in field_names]
+            names.append(self._create_index_name(model, columns))
+
+        for index in opts.indexes:
+            if isinstance(index, ContextIndex):
+                continue
+
+            if isinstance(index, UpperIndex):
+                columns = [
+                    opts.get_field(field_name).column
+                    for field_name, _ in index.fields_orders
+                ]
+                names.append(
+                    self._create_index_name(
+                        model, columns, qualifier=index.qualifier
+                    )
+                )
+            else:
+                names.append(self.quote_name(index.name))
+
+        return names
+
+    def _create_function_index_sql(
+        self, model: Model, fields, function='UPPER', qualifier='', orders=()
+    ):
+        columns = [field.column for field in fields]
+        orders = list(orders) + [''] * (len(columns) - len(orders))
+        expressions = ', '.join(
+            ('%s(%s) %s' % (function, self.quote_name(column), order)).rstrip()
+            for column, order in zip(columns, orders)
+        )
+
+        name = self._create_index_name(
+            model, columns, suffix='_idx', qualifier=qualifier
+        )
+
+        sql = self.sql_create_function_index
+        if self.invisible_indexes:
+            sql += self.sql_index_invisible
+            self.invisible_index_names.append(name)
+
+        return sql % dict(
+            table=self.quote_name(model._meta.db_table),
+            name=name,
+            expressions=expressions,
+        )
+
+    def _create_context_index_sql(
+        self, model: Model, fields, sync='ON COMMIT', qualifier=''
+    ):
+        columns = [field.column for field in fields]
+
+        return self.sql_create_context_index % dict(
+            table=self.quote_name(model._meta.db_table),
+            name=self._create_index_name(
+                model, columns, suffix='_idx', qualifier=qualifier
+            ),
+            columns=', '.join(map(self.quote_name, columns)),
+            sync=sync.replace("'", "''"),
+        )
 
+    @timed('create_index_name')
     def _create_index_name(
         self, model_or_table_name, column_names, suffix='_idx', qualifier=''
     ):
@@ -1,11 +1,12 @@
 from django.db.backends.oracle import base as oracle
+from django.utils.functional import cached_property
 
-from . import operations, schema
+from . import introspection, operations
 
 
 class DatabaseWrapper(oracle.DatabaseWrapper):
-    SchemaEditorClass = schema.DatabaseSchemaEditor
     ops_class = operations.DatabaseOperations
+    introspection_class = introspection.DatabaseIntrospection
 
     data_types = {
         **oracle.DatabaseWrapper.data_types,
@@ -24,3 +25,11 @@ class DatabaseWrapper(oracle.DatabaseWrapper):
         'PositiveIntegerField': '_gte',
         'PositiveSmallIntegerField': '_gte',
     }
+
+    @cached_property
+    def SchemaEditorClass(self):
+        # Only loaded by the processes editing the schema (the connections of
+        # web workers never need it)
+        from .schema import DatabaseSchemaEditor
+
+        return DatabaseSchemaEditor
@@ -4,6 +4,11 @@ CREATE TABLE %(table)s (
 )\
 '''
 
+SQL_CREATE_COLUMN = '''\
+ALTER TABLE %(table)s
+    ADD %(column)s %(definition)s\
+'''
+
 SQL_CREATE_CHECK = '''\
 ALTER TABLE %(table)s
     ADD CONSTRAINT %(name)s
@@ -38,6 +43,140 @@ CREATE INDEX %(name)s
     ON %(table)s (%(columns)s)\
 '''
 
+SQL_CREATE_FUNCTION_INDEX = '''\
+CREATE INDEX %(name)s
+    ON %(table)s (%(expressions)s)\
+'''
+
+SQL_CREATE_CONTEXT_INDEX = '''\
+CREATE INDEX %(name)s
+    ON %(table)s (%(columns)s)
+    INDEXTYPE IS CTXSYS.CONTEXT
+    PARAMETERS ('SYNC (%(sync)s)')\
+'''
+
+SQL_CREATE_MATERIALIZED_VIEW = '''\
+CREATE MATERIALIZED VIEW %(table)s
+    BUILD IMMEDIATE
+    REFRESH %(refresh)s
+    AS %(query)s\
+'''
+
+SQL_CREATE_MATERIALIZED_VIEW_LOG = '''\
+CREATE MATERIALIZED VIEW LOG ON %(table)s
+    WITH %(options)s
+    INCLUDING NEW VALUES\
+'''
+
+SQL_GATHER_TABLE_STATS = '''\
+BEGIN
+    DBMS_STATS.GATHER_TABLE_STATS(
+        ownname => %(owner)s,
+        tabname => '%(table)s',
+        estimate_percent => %(estimate_percent)s,
+        degree => %(degree)s,
+        cascade => %(cascade)s
+    );
+END;\
+'''
+
+SQL_ALTER_INDEX_VISIBLE = '''\
+ALTER INDEX %(name)s
+    VISIBLE\
+'''
+
+SQL_ALTER_INDEX_NOPARALLEL = '''\
+ALTER INDEX %(name)s
+    NOPARALLEL\
+'''
+
+SQL_BATCH_BLOCK = '''\
+DECLARE
+    i PLS_INTEGER := 0;
+BEGIN
+%(statements)s
+EXCEPTION
+    WHEN OTHERS THEN
+        RAISE_APPLICATION_ERROR(
+            -20001, 'Statement ' || i || ': ' || SQLERRM
+        );
+END;\
+'''
+
+SQL_BATCH_STATEMENT = '''\
+    i := %(index)s;
+    EXECUTE IMMEDIATE '%(sql)s';
+'''
+
+SQL_CAN_REDEF_TABLE = '''\
+BEGIN
+    DBMS_REDEFINITION.CAN_REDEF_TABLE(
+        uname => %(owner)s,
+        tname => '%(table)s',
+        options_flag => %(options)s
+    );
+END;\
+'''
+
+SQL_START_REDEF_TABLE = '''\
+BEGIN
+    DBMS_REDEFINITION.START_REDEF_TABLE(
+        uname => %(owner)s,
+        orig_table => '%(table)s',
+        int_table => '%(interim)s',
+        options_flag => %(options)s
+    );
+END;\
+'''
+
+SQL_COPY_TABLE_DEPENDENTS = '''\
+DECLARE
+    num_errors PLS_INTEGER;
+BEGIN
+    DBMS_REDEFINITION.COPY_TABLE_DEPENDENTS(
+        uname => %(owner)s,
+        orig_table => '%(table)s',
+        int_table => '%(interim)s',
+        copy_indexes => DBMS_REDEFINITION.CONS_ORIG_PARAMS,
+        copy_triggers => TRUE,
+        copy_constraints => TRUE,
+        copy_privileges => TRUE,
+        ignore_errors => FALSE,
+        num_errors => num_errors
+    );
+END;\
+'''
+
+SQL_SYNC_INTERIM_TABLE = '''\
+BEGIN
+    DBMS_REDEFINITION.SYNC_INTERIM_TABLE(
+        uname => %(owner)s,
+        orig_table => '%(table)s',
+        int_table => '%(interim)s'
+    );
+END;\
+'''
+
+SQL_FINISH_REDEF_TABLE = '''\
+BEGIN
+    DBMS_REDEFINITION.FINISH_REDEF_TABLE(
+        uname => %(owner)s,
+        orig_table => '%(table)s',
+        int_table => '%(interim)s'
+    );
+END;\
+'''
+
+SQL_ABORT_REDEF_TABLE = '''\
+BEGIN
+    DBMS_REDEFINITION.ABORT_REDEF_TABLE(
+        uname => %(owner)s,
+        orig_table => '%(table)s',
+        int_table => '%(interim)s'
+    );
+END;\
+'''
+
 SQL_GRANT = '''\
 GRANT %(privileges)s
     ON %(name)s
@@ -63,3 +202,103 @@ WHEN (new.%(col_name)s IS NULL)
         INTO :new.%(col_name)s FROM dual;
     END\
 '''
+
+SQL_GET_CONSTRAINTS = '''\
+SELECT
+    cons.table_name,
+    cons.constraint_name,
+    LISTAGG(LOWER(cols.column_name), ',')
+        WITHIN GROUP (ORDER BY cols.position),
+    CASE cons.constraint_type WHEN 'P' THEN 1 ELSE 0 END,
+    CASE WHEN cons.constraint_type IN ('P', 'U') THEN 1 ELSE 0 END,
+    CASE cons.constraint_type WHEN 'C' THEN 1 ELSE 0 END
+FROM all_constraints cons
+LEFT OUTER JOIN all_cons_columns cols
+    ON cols.owner = cons.owner
+    AND cols.constraint_name = cons.constraint_name
+WHERE cons.owner = NVL(UPPER(%s), USER)
+    AND cons.constraint_type IN ('P', 'U', 'C')
+GROUP BY cons.table_name, cons.constraint_name, cons.constraint_type\
+'''
+
+SQL_GET_FOREIGN_KEYS = '''\
+SELECT
+    cons.table_name,
+    cons.constraint_name,
+    LISTAGG(LOWER(cols.column_name), ',')
+        WITHIN GROUP (ORDER BY cols.position),
+    LOWER(rcols.table_name),
+    LOWER(rcols.column_name)
+FROM all_constraints cons
+INNER JOIN all_cons_columns rcols
+    ON rcols.owner = cons.r_owner
+    AND rcols.constraint_name = cons.r_constraint_name
+    AND rcols.position = 1
+LEFT OUTER JOIN all_cons_columns cols
+    ON cols.owner = cons.owner
+    AND cols.constraint_name = cons.constraint_name
+WHERE cons.owner = NVL(UPPER(%s), USER)
+    AND cons.constraint_type = 'R'
+GROUP BY
+    cons.table_name,
+    cons.constraint_name,
+    rcols.table_name,
+    rcols.column_name\
+'''
+
+SQL_GET_INDEXES = '''\
+SELECT
+    ind.table_name,
+    ind.index_name,
+    LOWER(ind.index_type),
+    LISTAGG(LOWER(cols.column_name), ',')
+        WITHIN GROUP (ORDER BY cols.column_position),
+    LISTAGG(cols.descend, ',')
+        WITHIN GROUP (ORDER BY cols.column_position)
+FROM all_indexes ind
+LEFT OUTER JOIN all_ind_columns cols
+    ON cols.index_owner = ind.owner
+    AND cols.index_name = ind.index_name
+WHERE ind.owner = NVL(UPPER(%s), USER)
+    AND NOT EXISTS (
+        SELECT 1
+        FROM all_constraints cons
+        WHERE cons.owner = ind.owner
+            AND cons.index_name = ind.index_name
+    )
+GROUP BY ind.table_name, ind.index_name, ind.index_type\
+'''
+
+SQL_GET_SCHEMA_OBJECTS = '''\
+SELECT 'TABLE', table_name, NULL
+FROM all_tables
+WHERE owner = NVL(UPPER(%(owner)s), USER)
+UNION ALL
+SELECT 'COLUMN', table_name, column_name
+FROM all_tab_columns
+WHERE owner = NVL(UPPER(%(owner)s), USER)
+UNION ALL
+SELECT 'CONSTRAINT', table_name, constraint_name
+FROM all_constraints
+WHERE owner = NVL(UPPER(%(owner)s), USER)
+UNION ALL
+SELECT 'INDEX', table_name, index_name
+FROM all_indexes
+WHERE owner = NVL(UPPER(%(owner)s), USER)
+UNION ALL
+SELECT 'SEQUENCE', NULL, sequence_name
+FROM all_sequences
+WHERE sequence_owner = NVL(UPPER(%(owner)s), USER)
+UNION ALL
+SELECT 'TRIGGER', table_name, trigger_name
+FROM all_triggers
+WHERE owner = NVL(UPPER(%(owner)s), USER)
+UNION ALL
+SELECT 'GRANT', table_name, grantee
+FROM all_tab_privs
+WHERE table_schema = NVL(UPPER(%(owner)s), USER)
+UNION ALL
+SELECT 'MATERIALIZED_VIEW_LOG', master, NULL
+FROM all_mview_logs
+WHERE log_owner = NVL(UPPER(%(owner)s), USER)\
+'''
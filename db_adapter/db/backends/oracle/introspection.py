@@ -0,0 +1,13 @@
+from django.db.backends.oracle import introspection as oracle
+
+from ..base.introspection import DatabaseIntrospection
+from . import constants
+
+
+class DatabaseIntrospection(
+    DatabaseIntrospection, oracle.DatabaseIntrospection
+):
+    sql_get_constraints = constants.SQL_GET_CONSTRAINTS
+    sql_get_foreign_keys = constants.SQL_GET_FOREIGN_KEYS
+    sql_get_indexes = constants.SQL_GET_INDEXES
+    sql_get_schema_objects = constants.SQL_GET_SCHEMA_OBJECTS
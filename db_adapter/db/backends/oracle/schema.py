@@ -6,12 +6,30 @@ from . import constants
 
 class DatabaseSchemaEditor(DatabaseSchemaEditor, oracle.DatabaseSchemaEditor):
     sql_create_table = constants.SQL_CREATE_TABLE
+    sql_create_column = constants.SQL_CREATE_COLUMN
     sql_create_check = constants.SQL_CREATE_CHECK
     sql_create_comment = constants.SQL_COMMENT_ON_COLUMN
     sql_create_pk = constants.SQL_CREATE_PK
     sql_create_fk = constants.SQL_CREATE_FK
     sql_create_index = constants.SQL_CREATE_INDEX
+    sql_create_function_index = constants.SQL_CREATE_FUNCTION_INDEX
+    sql_create_context_index = constants.SQL_CREATE_CONTEXT_INDEX
+    sql_create_materialized_view = constants.SQL_CREATE_MATERIALIZED_VIEW
+    sql_create_materialized_view_log = (
+        constants.SQL_CREATE_MATERIALIZED_VIEW_LOG
+    )
     sql_create_unique = constants.SQL_CREATE_UNIQUE
+    sql_gather_table_stats = constants.SQL_GATHER_TABLE_STATS
+    sql_alter_index_visible = constants.SQL_ALTER_INDEX_VISIBLE
+    sql_alter_index_noparallel = constants.SQL_ALTER_INDEX_NOPARALLEL
+    sql_batch_block = constants.SQL_BATCH_BLOCK
+    sql_batch_statement = constants.SQL_BATCH_STATEMENT
+    sql_can_redef_table = constants.SQL_CAN_REDEF_TABLE
+    sql_start_redef_table = constants.SQL_START_REDEF_TABLE
+    sql_copy_table_dependents = constants.SQL_COPY_TABLE_DEPENDENTS
+    sql_sync_interim_table = constants.SQL_SYNC_INTERIM_TABLE
+    sql_finish_redef_table = constants.SQL_FINISH_REDEF_TABLE
+    sql_abort_redef_table = constants.SQL_ABORT_REDEF_TABLE
     sql_grant = constants.SQL_GRANT
     sql_comment_on_column = constants.SQL_COMMENT_ON_COLUMN
 
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import List
+
+from django.db.migrations.state import ModelState
+from django.db.models import Model
+
+# Bump when the statements produced for the same model state change
+CACHE_VERSION = 1
+
+
+def _encode(value):
+    if hasattr(value, 'deconstruct') and not isinstance(value, type):
+        return value.deconstruct()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if callable(value):
+        return '%s.%s' % (value.__module__, value.__qualname__)
+    return repr(value)
+
+
+def _hash(data) -> str:
+    encoded = json.dumps(data, sort_keys=True, default=_encode)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def settings_fingerprint(connection) -> str:
+    """
+    Fingerprint of everything besides the models that changes the statements
+    produced for them: the `DB_ADAPTER` settings (naming patterns included)
+    and the backend classes.
+    """
+    from .settings import DEFAULTS, db_settings
+
+    return _hash(
+        dict(
+            version=CACHE_VERSION,
+            settings={key: getattr(db_settings, key) for key in DEFAULTS},
+            classes=[
+                type(connection),
+                type(connection.ops),
+                connection.SchemaEditorClass,
+            ],
+        )
+    )
+
+
+def model_fingerprint(model: Model, connection, settings_fingerprint='') -> str:
+    """
+    Fingerprint of the rendered state of a model: fields, `Meta` options,
+    column types and the tables/columns referenced by its relations.
+    """
+    state = ModelState.from_model(model)
+    opts = model._meta
+
+    relations = [
+        (
+            field.column,
+            field.remote_field.model._meta.db_table,
+            field.target_field.column,
+        )
+        for field in opts.local_fields
+        if field.remote_field
+    ]
+
+    view = getattr(opts, 'materialized_view', None)
+    base_tables = view.get_base_tables(model) if view else []
+
+    return _hash(
+        dict(
+            settings=settings_fingerprint,
+            fields=[
+                (name, field.deconstruct()[1:]) for name, field in state.fields
+            ],
+            options=state.options,
+            db_table=opts.db_table,
+            columns=[
+                (field.column, field.db_parameters(connection=connection))
+                for field in opts.local_fields
+            ],
+            relations=relations,
+            base_tables=base_tables,
+        )
+    )
+
+
+class DDLCache:
+    """
+    On-disk cache (a JSON file) of the statements produced for each model,
+    keyed by model label and invalidated by the model fingerprint.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = self._load()
+        self.hits = self.misses = 0
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if data.get('version') != CACHE_VERSION:
+            return {}
+        return data.get('models', {})
+
+    def get(self, label, fingerprint):
+        entry = self.entries.get(label)
+        if entry and entry['fingerprint'] == fingerprint:
+            self.hits += 1
+            return entry['statements']
+
+        self.misses += 1
+        return None
+
+    def set(self, label, fingerprint, statements):
+        self.entries[label] = dict(
+            fingerprint=fingerprint, statements=statements
+        )
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Replace the file at once, so readers never see partial writes
+        tmp_path = '%s.tmp' % self.path
+        with open(tmp_path, 'w') as f:
+            json.dump(dict(version=CACHE_VERSION, models=self.entries), f)
+        os.replace(tmp_path, self.path)
+
+
+def incremental_sql(
+    connection, models: List[Model], cache: DDLCache = None
+) -> List[str]:
+    """
+    Return the statements creating the models, regenerating only the ones of
+    models whose fingerprint changed since they were cached. Statements are
+    merged by step of `SQL_STATEMENTS_ORDER` (tables first).
+    """
+    settings_key = settings_fingerprint(connection)
+    steps = OrderedDict()
+
+    with connection.schema_editor(collect_sql=True, atomic=False) as editor:
+        for model in models:
+            label = model._meta.label
+            fingerprint = model_fingerprint(model, connection, settings_key)
+
+            statements = None
+            if cache is not None:
+                statements = cache.get(label, fingerprint)
+
+            if statements is None:
+                # Cached statements must not depend on other models, like
+                # materialized view logs shared by several views
+                editor.materialized_view_logs.clear()
+                statements = editor.model_statements(model)
+                if cache is not None:
+                    cache.set(label, fingerprint, statements)
+
+            for step in ['TABLE', *editor.deferred_steps]:
+                steps.setdefault(step, OrderedDict()).update(
+                    OrderedDict.fromkeys(statements.get(step, []))
+                )
+
+    if cache is not None:
+        cache.save()
+
+    return [sql for statements in steps.values() for sql in statements]
@@ -0,0 +1,183 @@
+from .schema_diff import STATEMENT_PATTERNS, SchemaObject, normalize_name
+
+try:
+    from django.db.backends.ddl_references import Columns, Statement, Table
+except ImportError:  # Django 1.11 builds statements as strings
+
+    class Reference:
+        def references_table(self, table):
+            return False
+
+        def references_column(self, table, column):
+            return False
+
+        def rename_table_references(self, old_table, new_table):
+            pass
+
+        def rename_column_references(self, table, old_column, new_column):
+            pass
+
+        def __repr__(self):
+            return '<%s %r>' % (self.__class__.__name__, str(self))
+
+        def __str__(self):
+            raise NotImplementedError
+
+    class Table(Reference):
+        def __init__(self, table, quote_name):
+            self.table = table
+            self.quote_name = quote_name
+
+        def references_table(self, table):
+            return self.table == table
+
+        def rename_table_references(self, old_table, new_table):
+            if self.table == old_table:
+                self.table = new_table
+
+        def __str__(self):
+            return self.quote_name(self.table)
+
+    class Columns(Table):
+        def __init__(self, table, columns, quote_name, col_suffixes=()):
+            super().__init__(table, quote_name)
+            self.columns = columns
+            self.col_suffixes = col_suffixes
+
+        def references_column(self, table, column):
+            return self.table == table and column in self.columns
+
+        def rename_column_references(self, table, old_column, new_column):
+            if self.table == table:
+                self.columns = [
+                    new_column if column == old_column else column
+                    for column in self.columns
+                ]
+
+        def __str__(self):
+            return ', '.join(
+                self.quote_name(column) + suffix
+                for column, suffix in zip(
+                    self.columns,
+                    list(self.col_suffixes)
+                    + [''] * (len(self.columns) - len(self.col_suffixes)),
+                )
+            )
+
+    class Statement(Reference):
+        def __init__(self, template, **parts):
+            self.template = template
+            self.parts = parts
+
+        def references_table(self, table):
+            return any(
+                hasattr(part, 'references_table')
+                and part.references_table(table)
+                for part in self.parts.values()
+            )
+
+        def references_column(self, table, column):
+            return any(
+                hasattr(part, 'references_column')
+                and part.references_column(table, column)
+                for part in self.parts.values()
+            )
+
+        def rename_table_references(self, old_table, new_table):
+            for part in self.parts.values():
+                if hasattr(part, 'rename_table_references'):
+                    part.rename_table_references(old_table, new_table)
+
+        def rename_column_references(self, table, old_column, new_column):
+            for part in self.parts.values():
+                if hasattr(part, 'rename_column_references'):
+                    part.rename_column_references(table, old_column, new_column)
+
+        def __str__(self):
+            return self.template % self.parts
+
+
+class DeferredStatement(Statement):
+    """
+    Statement deferred by the schema editor (constraints, indexes and
+    comments), formatted once (when executed or collected). The type and name
+    of the object it creates are known without parsing its SQL, and references
+    to tables and columns are renamed like the ones of Django statements.
+
+        DeferredStatement(
+            'CONSTRAINT',
+            'tbl_post_id_pk',
+            editor.sql_create_pk,
+            table=Table('tbl_post', quote_name),
+            name='tbl_post_id_pk',
+            columns=Columns('tbl_post', ['id'], quote_name),
+        )
+
+    Statements built by `DatabaseOperations` (grants, sequences and triggers),
+    materialized views and optimizer statistics are plain strings, matched by
+    `db_adapter.schema_diff.statement_object`.
+    """
+
+    def __init__(self, type, object_name, template, **parts):
+        super().__init__(template, **parts)
+        self.type = type
+        self.object_name = object_name
+        self._sql = None
+
+    @classmethod
+    def from_statement(cls, type, statement):
+        """
+        Return a deferred statement from a statement of Django (like unique
+        and foreign key constraints or indexes), named after its `name` part
+        """
+        if statement is None:
+            return None
+        if isinstance(statement, str):
+            # Django 1.11 returns formatted SQL, named after the matched object
+            for _, pattern in STATEMENT_PATTERNS:
+                match = pattern.match(statement)
+                if match:
+                    groups = match.groupdict()
+                    return cls(
+                        type,
+                        groups.get('name'),
+                        '%(sql)s',
+                        sql=statement,
+                        table=groups.get('table'),
+                    )
+            return statement
+        return cls(
+            type,
+            str(statement.parts['name']),
+            statement.template,
+            **statement.parts,
+        )
+
+    @property
+    def table(self):
+        table = self.parts.get('table')
+        return getattr(table, 'table', table)
+
+    @property
+    def object(self):
+        """
+        Return the `SchemaObject` created by the statement
+        """
+        return SchemaObject(
+            self.type,
+            normalize_name(self.table),
+            normalize_name(self.object_name),
+        )
+
+    def rename_table_references(self, old_table, new_table):
+        super().rename_table_references(old_table, new_table)
+        self._sql = None
+
+    def rename_column_references(self, table, old_column, new_column):
+        super().rename_column_references(table, old_column, new_column)
+        self._sql = None
+
+    def __str__(self):
+        if self._sql is None:
+            self._sql = super().__str__()
+        return self._sql
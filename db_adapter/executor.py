@@ -0,0 +1,212 @@
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .schema_diff import normalize_name, statement_object
+
+logger = logging.getLogger('django.db.backends.schema')
+
+# Tables referenced by statements besides their target table
+REFERENCE_PATTERNS = [
+    re.compile(r'\sREFERENCES\s+(\S+?)\s*\(', re.IGNORECASE),
+    re.compile(r'(\S+)\.nextval', re.IGNORECASE),
+]
+
+
+class Task:
+    """
+    A statement run by the `ParallelExecutor`, after the ones it depends on
+    """
+
+    def __init__(self, sql, index):
+        self.sql = sql
+        self.index = index
+        self.object = statement_object(sql)
+        self.dependencies = set()
+        self.dependents = set()
+        self.duration = None
+        self.worker = None
+
+    @property
+    def category(self):
+        return self.object.type if self.object else None
+
+    def resources(self):
+        """
+        Return the tables (or sequences) locked by the statement, or `None`
+        when they cannot be told (the statement is then run alone)
+        """
+        if self.object is None:
+            return None
+
+        resources = {self.object.table or self.object.name}
+        for pattern in REFERENCE_PATTERNS:
+            resources.update(
+                normalize_name(name) for name in pattern.findall(str(self.sql))
+            )
+
+        return resources
+
+
+class WorkerEditors:
+    """
+    Schema editors of worker threads: each worker enters an editor on its own
+    connection when it executes its first statement, and exits it (restoring
+    its session) before closing the connection.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+        self._local = threading.local()
+
+    def execute(self, sql, params=()):
+        local = self._local
+        if not hasattr(local, 'editor'):
+            local.stack = ExitStack()
+            local.editor = local.stack.enter_context(
+                connections[self.using].schema_editor(atomic=False)
+            )
+        local.editor.execute(sql, params)
+
+    def close(self):
+        local = self._local
+        try:
+            if hasattr(local, 'editor'):
+                del local.editor
+                local.stack.close()
+        finally:
+            connections[self.using].close()
+
+
+class ParallelExecutor:
+    """
+    Run statements on a bounded pool of connections. Statements on the same
+    tables (like a foreign key and the primary key it references) run in
+    order, while statements on different tables run concurrently.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS, workers=4):
+        self.using = using
+        self.workers = workers
+        self.tasks = []
+        self._last_tasks = {}
+        self._barrier = None
+
+    def add(self, sql):
+        task = Task(sql, len(self.tasks))
+        resources = task.resources()
+
+        if resources is None:
+            # Barrier: after all previous statements, before all next ones
+            task.dependencies.update(self.tasks)
+            self._last_tasks.clear()
+            self._barrier = task
+        else:
+            for resource in resources:
+                previous = self._last_tasks.get(resource, self._barrier)
+                if previous is not None:
+                    task.dependencies.add(previous)
+                self._last_tasks[resource] = task
+
+        for dependency in task.dependencies:
+            dependency.dependents.add(task)
+
+        self.tasks.append(task)
+        return task
+
+    def extend(self, statements):
+        for sql in statements:
+            self.add(sql)
+
+    @property
+    def timings(self):
+        return [(task.sql, task.duration) for task in self.tasks]
+
+    def execute_statement(self, sql):
+        """
+        Execute a statement on the connection of the current worker
+        """
+        self._editors.execute(sql)
+
+    def close_connection(self):
+        self._editors.close()
+
+    def run(self):
+        """
+        Execute all statements, raising the first error (statements depending
+        on a failed one are not run)
+        """
+        self._editors = WorkerEditors(self.using)
+        self._condition = threading.Condition()
+        self._ready = deque(
+            task for task in self.tasks if not task.dependencies
+        )
+        self._pending = {task: len(task.dependencies) for task in self.tasks}
+        self._running = 0
+        self._errors = []
+
+        threads = [
+            threading.Thread(target=self._work, name='ddl-worker-%d' % i)
+            for i in range(min(self.workers, len(self.tasks)))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if self._errors:
+            _, error = min(self._errors, key=lambda item: item[0].index)
+            raise error
+
+    def _next_task(self):
+        with self._condition:
+            while True:
+                if self._errors:
+                    return None
+                if self._ready:
+                    self._running += 1
+                    return self._ready.popleft()
+                if not self._running:
+                    return None
+                self._condition.wait()
+
+    def _work(self):
+        try:
+            while True:
+                task = self._next_task()
+                if task is None:
+                    break
+
+                task.worker = threading.current_thread().name
+                start = time.perf_counter()
+                try:
+                    self.execute_statement(task.sql)
+                except Exception as err:
+                    error = (task, err)
+                else:
+                    error = None
+                task.duration = time.perf_counter() - start
+
+                logger.debug(
+                    '(%.3f) %s; worker=%s', task.duration, task.sql, task.worker
+                )
+
+                with self._condition:
+                    self._running -= 1
+                    if error:
+                        self._errors.append(error)
+                    else:
+                        for dependent in sorted(
+                            task.dependents, key=lambda item: item.index
+                        ):
+                            self._pending[dependent] -= 1
+                            if not self._pending[dependent]:
+                                self._ready.append(dependent)
+                    self._condition.notify_all()
+        finally:
+            self.close_connection()
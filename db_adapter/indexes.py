@@ -0,0 +1,66 @@
+from django.db.models import Index
+
+
+class UpperIndex(Index):
+    """
+    Function-based index over `UPPER(column)`, matching how case-insensitive
+    lookups (`iexact`, `istartswith`) are compiled by the Oracle backend.
+
+    The index name always follows the `INDEX` object name pattern, the `name`
+    argument is only kept to satisfy Django's migration framework. Descending
+    fields (`'-name'`) are kept as `UPPER(column) DESC`. Backends other than
+    the adapter ones render it as a regular index.
+    """
+
+    function = 'UPPER'
+    qualifier = '_upper'
+
+    def create_sql(self, model, schema_editor, using=''):
+        if not hasattr(schema_editor, '_create_function_index_sql'):
+            return super().create_sql(model, schema_editor, using=using)
+
+        fields = [
+            model._meta.get_field(field_name)
+            for field_name, _ in self.fields_orders
+        ]
+        return schema_editor._create_function_index_sql(
+            model,
+            fields,
+            function=self.function,
+            qualifier=self.qualifier,
+            orders=[order for _, order in self.fields_orders],
+        )
+
+
+class ContextIndex(Index):
+    """
+    Oracle Text `CTXSYS.CONTEXT` index, required by the `text_contains` lookup
+    (see `db_adapter.lookups.TextContains`).
+
+    `sync` sets when the index is synchronized with DML changes, like
+    `'ON COMMIT'`, `'MANUAL'` or `'EVERY "SYSDATE+1/24"'`. Backends other than
+    the adapter ones render it as a regular index.
+    """
+
+    qualifier = '_ctx'
+
+    def __init__(self, *, sync='ON COMMIT', **kwargs):
+        super().__init__(**kwargs)
+        self.sync = sync
+
+    def create_sql(self, model, schema_editor, using=''):
+        if not hasattr(schema_editor, '_create_context_index_sql'):
+            return super().create_sql(model, schema_editor, using=using)
+
+        fields = [
+            model._meta.get_field(field_name)
+            for field_name, _ in self.fields_orders
+        ]
+        return schema_editor._create_context_index_sql(
+            model, fields, sync=self.sync, qualifier=self.qualifier
+        )
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        kwargs['sync'] = self.sync
+        return path, args, kwargs
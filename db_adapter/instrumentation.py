@@ -0,0 +1,141 @@
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.dispatch import Signal
+
+# Sent by schema editors when they exit, with the `PhaseTimings` they collected
+# (see the `PHASE_TIMINGS` setting) as `timings`, and the `editor` itself
+phase_timings_collected = Signal()
+
+
+class ThreadLocalVar:
+    """
+    Thread-local variable with the API of `contextvars.ContextVar`, used where
+    `contextvars` is not available (Python 3.6)
+    """
+
+    def __init__(self, name, default=None):
+        self.name = name
+        self.default = default
+        self._local = threading.local()
+
+    def get(self):
+        return getattr(self._local, 'value', self.default)
+
+    def set(self, value):
+        # Tokens hold the previous value (and are never `None`, like the ones
+        # of context variables)
+        token = (self.get(),)
+        self._local.value = value
+        return token
+
+    def reset(self, token):
+        (self._local.value,) = token
+
+
+class LazyContextVar:
+    """
+    Context variable (defaulting to `None`) created when it is first set, so
+    processes never setting it (like web workers) don't import `contextvars`
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._var = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        return None if self._var is None else self._var.get()
+
+    def set(self, value):
+        if self._var is None:
+            try:
+                from contextvars import ContextVar
+            except ImportError:  # Python 3.6
+                ContextVar = ThreadLocalVar
+
+            with self._lock:
+                if self._var is None:
+                    self._var = ContextVar(self.name, default=None)
+
+        return self._var.set(value)
+
+    def reset(self, token):
+        self._var.reset(token)
+
+
+# Timings of the schema editor running in the current context
+current_timings = LazyContextVar('current_timings')
+
+
+class PhaseTimings:
+    """
+    Cumulative durations and number of calls of the phases of a schema editor.
+    Nested calls of a phase (like statements executed by other statements) are
+    measured once, by their outermost call.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self._active = set()
+
+    def __len__(self):
+        return len(self.phases)
+
+    @contextmanager
+    def measure(self, phase):
+        if phase in self._active:
+            yield
+            return
+
+        self._active.add(phase)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self._active.discard(phase)
+
+            count, total = self.phases.get(phase, (0, 0.0))
+            self.phases[phase] = (count + 1, total + duration)
+
+    def as_dict(self):
+        return {
+            phase: dict(count=count, time=total)
+            for phase, (count, total) in self.phases.items()
+        }
+
+    def summary(self):
+        """
+        Return a line per phase, the slowest ones first
+        """
+        phases = sorted(
+            self.phases.items(), key=lambda item: item[1][1], reverse=True
+        )
+        return '\n'.join(
+            '%s: %d calls, %.3fs' % (phase, count, total)
+            for phase, (count, total) in phases
+        )
+
+
+def timed(phase):
+    """
+    Measure calls of the decorated function as a phase of the schema editor
+    running in the current context (if it collects timings)
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = current_timings.get()
+            if timings is None:
+                return func(*args, **kwargs)
+
+            with timings.measure(phase):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,21 @@
+from django.db.models import Lookup
+
+
+class TextContains(Lookup):
+    """
+    Oracle Text search through `CONTAINS()`, resolved by a `ContextIndex`
+    instead of the full scan made by `icontains`. The value is handled as an
+    Oracle Text query expression.
+
+    Fields opt in by registering the lookup on their class:
+
+        TextField.register_lookup(TextContains)
+    """
+
+    lookup_name = 'text_contains'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        params = [*lhs_params, *rhs_params]
+        return 'CONTAINS(%s, %s) > 0' % (lhs, rhs), params
@@ -0,0 +1,22 @@
+from django.core.management.commands import inspectdb
+from django.db import connections
+
+
+class Command(inspectdb.Command):
+    help = (
+        inspectdb.Command.help + ' Table names are stripped of the parts '
+        'added by the DEFAULT_DB_TABLE_PATTERN setting.'
+    )
+
+    def handle_inspection(self, options):
+        introspection = connections[options['database']].introspection
+        reverse_table_patterns = getattr(
+            introspection, 'reverse_table_patterns', None
+        )
+        if reverse_table_patterns is None:
+            yield from super().handle_inspection(options)
+            return
+
+        # Constraints of the schema are loaded once for all tables
+        with reverse_table_patterns(), introspection.cache_constraints():
+            yield from super().handle_inspection(options)
@@ -0,0 +1,28 @@
+from django.core.management.commands import migrate
+
+from db_adapter.statement_report import statement_report
+
+
+class Command(migrate.Command):
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--statement-report',
+            choices=['table', 'json'],
+            help='Report the slowest statements at the end of the command '
+            '(see the STATEMENT_REPORT_SIZE setting).',
+        )
+
+    def handle(self, *args, **options):
+        if not options['statement_report']:
+            return super().handle(*args, **options)
+
+        with statement_report(options['database']) as report:
+            output = super().handle(*args, **options)
+
+        if options['statement_report'] == 'json':
+            self.stdout.write(report.as_json())
+        else:
+            self.stdout.write(report.as_table())
+
+        return output
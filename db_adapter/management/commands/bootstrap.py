@@ -0,0 +1,117 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.sql import (
+    emit_post_migrate_signal,
+    emit_pre_migrate_signal,
+)
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.state import ProjectState
+
+from db_adapter.bootstrap import (
+    create_schema,
+    data_migrations,
+    mark_applied,
+    migrated_models,
+    migration_plan,
+    replay_differences,
+    unmigrated_models,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Creates the schema of an empty database from the final state of the '
+        'models, instead of replaying all migrations, and marks the '
+        'migrations as applied.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Nominates a database to bootstrap. Defaults to the '
+            '"default" database.',
+        )
+        parser.add_argument(
+            '--skip-replay-check',
+            action='store_true',
+            help='Skip the comparison with the statements of the state after '
+            'replaying all migrations.',
+        )
+        parser.add_argument(
+            '--skip-data-migrations',
+            action='store_true',
+            help='Bootstrap even if migrations have data operations '
+            '(RunPython/RunSQL), which are not run.',
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        loader = MigrationLoader(connection)
+
+        if loader.applied_migrations:
+            raise CommandError(
+                'Cannot bootstrap database %r: %d migrations are already '
+                'applied, use migrate instead.'
+                % (connection.alias, len(loader.applied_migrations))
+            )
+
+        skipped = data_migrations(loader)
+        if skipped:
+            labels = ', '.join('%s.%s' % key for key in skipped)
+            if not options['skip_data_migrations']:
+                raise CommandError(
+                    'Data operations (RunPython/RunSQL) of %s would not be '
+                    'run, use migrate instead (or --skip-data-migrations).'
+                    % labels
+                )
+            self.stderr.write(
+                'Data operations (RunPython/RunSQL) are not run for: %s'
+                % labels
+            )
+
+        models = migrated_models(loader)
+
+        if not options['skip_replay_check']:
+            differences = replay_differences(connection, loader, models)
+            if differences:
+                for label, missing, unexpected in differences:
+                    self.stderr.write('Model %s:' % label)
+                    for sql in missing:
+                        self.stderr.write('  - %s' % sql)
+                    for sql in unexpected:
+                        self.stderr.write('  + %s' % sql)
+                raise CommandError(
+                    'Models differ from the state of their migrations, run '
+                    'makemigrations first.'
+                )
+
+        # Handlers of the migrate signals (like the ones creating content
+        # types and permissions) run as if the migrations were applied
+        plan = [
+            (loader.graph.nodes[key], False) for key in migration_plan(loader)
+        ]
+        pre_migrate_state = ProjectState(real_apps=list(loader.unmigrated_apps))
+        emit_pre_migrate_signal(
+            options['verbosity'],
+            False,
+            connection.alias,
+            apps=pre_migrate_state.apps,
+            plan=plan,
+        )
+
+        # Apps without migrations are synced like by migrate
+        models += unmigrated_models(loader)
+        create_schema(connection, models)
+        keys = mark_applied(connection, loader)
+
+        emit_post_migrate_signal(
+            options['verbosity'], False, connection.alias, apps=apps, plan=plan
+        )
+
+        if options['verbosity'] > 0:
+            self.stdout.write(
+                'Created %d models, marked %d migrations as applied.'
+                % (len(models), len(keys))
+            )
@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from db_adapter.aliases import AliasMigration, run_coroutine
+from db_adapter.settings import db_settings
+
+
+class Command(BaseCommand):
+    help = (
+        'Migrates several databases (all databases by default) concurrently, '
+        'and reports the outcome of each one.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'args',
+            metavar='database',
+            nargs='*',
+            help='Aliases of the databases to migrate (all by default).',
+        )
+        parser.add_argument(
+            '--app-label',
+            help='App label of an application to migrate (all by default).',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Number of databases migrated concurrently. Defaults to the '
+            'ALIAS_WORKERS setting.',
+        )
+        parser.add_argument(
+            '--fail-fast',
+            action='store_true',
+            help='Skip the databases not started yet once one fails.',
+        )
+        parser.add_argument(
+            '--report',
+            choices=['table', 'json'],
+            default='table',
+            help='Format of the report printed at the end of the command.',
+        )
+
+    def handle(self, *aliases, **options):
+        aliases = aliases or list(settings.DATABASES)
+        unknown = [
+            alias for alias in aliases if alias not in settings.DATABASES
+        ]
+        if unknown:
+            raise CommandError('Unknown databases: %s' % ', '.join(unknown))
+
+        def progress(result):
+            if result.status == 'done':
+                self.stdout.write(
+                    '%s: migrated in %.1fs.' % (result.alias, result.duration)
+                )
+            elif result.status == 'failed':
+                self.stderr.write(
+                    '%s: failed: %s' % (result.alias, result.error)
+                )
+
+        migration = AliasMigration(
+            aliases,
+            concurrency=options['workers'] or db_settings.ALIAS_WORKERS,
+            fail_fast=options['fail_fast'],
+            progress=progress,
+            app_label=options['app_label'],
+        )
+        try:
+            report = run_coroutine(migration.run())
+        except (LookupError, ValueError) as err:
+            raise CommandError(str(err))
+
+        if options['report'] == 'json':
+            self.stdout.write(report.as_json())
+        else:
+            self.stdout.write(report.as_table())
+
+        failed = report.failed
+        if failed:
+            raise CommandError(
+                '%d of %d databases failed: %s'
+                % (
+                    len(failed),
+                    len(report),
+                    ', '.join(result.alias for result in failed),
+                )
+            )
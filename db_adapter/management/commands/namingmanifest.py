@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from db_adapter.naming_manifest import build_manifest
+from db_adapter.settings import db_settings
+
+
+class Command(BaseCommand):
+    help = (
+        'Builds the manifest of the normalized tables and object names of '
+        'the models of apps, and reports the names used by several objects '
+        'or too long for the database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'args',
+            metavar='app_label',
+            nargs='*',
+            help='App labels of the models (all apps by default).',
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Nominates a database to compute the names for. Defaults to '
+            'the "default" database.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Path of the manifest file. Defaults to the NAMING_MANIFEST '
+            'setting.',
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Exit with a non-zero status when names are reported.',
+        )
+
+    def handle(self, *app_labels, **options):
+        connection = connections[options['database']]
+        output = options['output'] or db_settings.NAMING_MANIFEST
+
+        try:
+            manifest = build_manifest(connection, app_labels)
+        except LookupError as err:
+            raise CommandError(str(err))
+
+        if output:
+            manifest.dump(output)
+
+        if options['verbosity'] > 0:
+            self.stdout.write(
+                '%d tables, %d object names.'
+                % (len(manifest.tables), len(manifest.names))
+            )
+
+        problems = manifest.problems(connection.ops.max_name_length())
+        for problem in problems:
+            self.stderr.write(problem)
+
+        if problems and options['check']:
+            raise CommandError('%d naming problems found.' % len(problems))
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from db_adapter.schema_diff import schema_diff
+from db_adapter.utils import created_models
+
+
+class Command(BaseCommand):
+    help = (
+        'Prints the SQL statements creating the objects of the models that '
+        'are missing from the database schema.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'args',
+            metavar='app_label',
+            nargs='*',
+            help='App labels of the models (all apps by default).',
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Nominates a database to compare with. Defaults to the '
+            '"default" database.',
+        )
+        parser.add_argument(
+            '--owner',
+            help='Schema to compare with. Defaults to the connected user.',
+        )
+
+    def handle(self, *app_labels, **options):
+        connection = connections[options['database']]
+
+        try:
+            models = created_models(app_labels)
+        except LookupError as err:
+            raise CommandError(str(err))
+
+        try:
+            with connection.cursor() as cursor:
+                snapshot = connection.introspection.get_schema_snapshot(
+                    cursor, options['owner']
+                )
+        except (AttributeError, NotImplementedError):
+            raise CommandError(
+                "Schema snapshots aren't supported for the currently selected "
+                'database backend.'
+            )
+
+        statements = schema_diff(connection, models, snapshot)
+        if statements:
+            self.stdout.write('\n'.join(statements))
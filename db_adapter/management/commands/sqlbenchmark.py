@@ -0,0 +1,99 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from db_adapter.benchmark import (
+    compare_results,
+    run_benchmark,
+    synthetic_project,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the generation of the SQL statements of a migration '
+        'creating a synthetic project of models.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Nominates a database to generate the SQL for. Defaults to '
+            'the "default" database.',
+        )
+        parser.add_argument(
+            '--models',
+            type=int,
+            default=1000,
+            help='Number of models of the synthetic project.',
+        )
+        parser.add_argument(
+            '--fields',
+            type=int,
+            default=5,
+            help='Number of fields of the models, besides their code, name '
+            'and foreign key.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Seed of the foreign keys between the models.',
+        )
+        parser.add_argument(
+            '--no-memory',
+            action='store_false',
+            dest='memory',
+            help='Do not measure the peak memory usage (it requires a second '
+            'run).',
+        )
+        parser.add_argument(
+            '--output',
+            help='Path of a JSON file the results are written to.',
+        )
+        parser.add_argument(
+            '--compare',
+            help='Path of a JSON file of previous results to compare with.',
+        )
+
+    def handle(self, **options):
+        connection = connections[options['database']]
+        parameters = dict(fields=options['fields'], seed=options['seed'])
+
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+
+        with synthetic_project(options['models'], **parameters) as models:
+            results = run_benchmark(
+                connection, models, parameters, options['memory']
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+
+        if baseline is None:
+            for name, value in results['results'].items():
+                if name != 'phases':
+                    self.stdout.write('%s: %s' % (name, value))
+            return
+
+        try:
+            comparison = compare_results(baseline, results)
+        except ValueError as err:
+            raise CommandError(str(err))
+
+        for name, before, after, change in comparison:
+            self.stdout.write(
+                '%s: %s -> %s%s'
+                % (
+                    name,
+                    before,
+                    after,
+                    '' if change is None else ' (%+.1f%%)' % (change * 100),
+                )
+            )
@@ -0,0 +1,99 @@
+import cProfile
+import pstats
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from db_adapter.profiling import (
+    PROFILED_FUNCTIONS,
+    SamplingProfiler,
+    generate_sql,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Profiles the generation of the SQL statements creating the models '
+        '(or applying the migrations) of apps.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'args',
+            metavar='app_label',
+            nargs='*',
+            help='App labels of the models (all apps by default).',
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Nominates a database to generate the SQL for. Defaults to '
+            'the "default" database.',
+        )
+        parser.add_argument(
+            '--migrations',
+            action='store_true',
+            help='Profile the statements of the migrations of the apps (like '
+            'sqlmigrate) instead of the statements creating their models.',
+        )
+        parser.add_argument(
+            '--profiler',
+            nargs='+',
+            choices=['cprofile', 'sampling'],
+            default=['cprofile', 'sampling'],
+            help='Profilers to run the generation with (each one runs it '
+            'separately).',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=1,
+            help='Number of times the statements are generated.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0.001,
+            help='Interval between samples of the sampling profiler, in '
+            'seconds.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Path prefix of the profiles: the cProfile stats are written '
+            'to <output>.pstats and the collapsed stacks of the sampling '
+            'profiler to <output>.collapsed.',
+        )
+
+    def handle(self, *app_labels, **options):
+        connection = connections[options['database']]
+
+        def run():
+            try:
+                for _ in range(options['repeat']):
+                    generate_sql(connection, app_labels, options['migrations'])
+            except LookupError as err:
+                raise CommandError(str(err))
+
+        if 'cprofile' in options['profiler']:
+            profile = cProfile.Profile()
+            profile.runcall(run)
+
+            stats = pstats.Stats(profile, stream=self.stdout)
+            if options['output']:
+                stats.dump_stats('%s.pstats' % options['output'])
+
+            stats.sort_stats('cumulative').print_stats(
+                r'\((%s)\)' % '|'.join(PROFILED_FUNCTIONS)
+            )
+
+        if 'sampling' in options['profiler']:
+            with SamplingProfiler(options['interval']) as profiler:
+                run()
+
+            if options['output']:
+                with open('%s.collapsed' % options['output'], 'w') as f:
+                    f.write(profiler.collapsed())
+
+            self.stdout.write('%d samples' % len(profiler))
+            for name, count in profiler.function_samples().most_common():
+                self.stdout.write('  %s: %d' % (name, count))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from db_adapter.ddl_cache import DDLCache, incremental_sql
+from db_adapter.utils import created_models
+
+
+class Command(BaseCommand):
+    help = (
+        'Prints the SQL statements creating the models, following the '
+        'SQL_STATEMENTS_ORDER setting.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'args',
+            metavar='app_label',
+            nargs='*',
+            help='App labels of the models (all apps by default).',
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Nominates a database to print the SQL for. Defaults to the '
+            '"default" database.',
+        )
+        parser.add_argument(
+            '--cache',
+            help='Path of a cache file of the statements of each model. Only '
+            'the models that changed since the last run are regenerated.',
+        )
+
+    def handle(self, *app_labels, **options):
+        connection = connections[options['database']]
+
+        try:
+            models = created_models(app_labels)
+        except LookupError as err:
+            raise CommandError(str(err))
+
+        cache = DDLCache(options['cache']) if options['cache'] else None
+        statements = incremental_sql(connection, models, cache)
+        if statements:
+            self.stdout.write('\n'.join(statements))
+
+        if cache is not None and options['verbosity'] > 1:
+            self.stderr.write(
+                '%d models regenerated, %d from cache.'
+                % (cache.misses, cache.hits)
+            )
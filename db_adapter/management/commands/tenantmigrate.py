@@ -0,0 +1,122 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from db_adapter.profiling import generate_sql
+from db_adapter.settings import db_settings
+from db_adapter.tenants import StatementTemplate, TenantFanOut
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates the SQL statements creating the models (or applying the '
+        'migrations) of apps once, and applies them to the namespace of each '
+        'tenant concurrently.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'args',
+            metavar='app_label',
+            nargs='*',
+            help='App labels of the models (all apps by default).',
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Nominates a database to apply the statements to. Defaults '
+            'to the "default" database.',
+        )
+        parser.add_argument(
+            '--migrations',
+            action='store_true',
+            help='Apply the statements of the migrations of the apps (like '
+            'sqlmigrate) instead of the statements creating their models. '
+            'Migrations are not recorded in the tenants, so every migration '
+            'is applied again on each run.',
+        )
+        parser.add_argument(
+            '--tenants',
+            nargs='+',
+            help='Namespaces of the tenants. Defaults to the TENANTS setting.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Number of tenants migrated concurrently (on as many '
+            'connections). Defaults to the TENANT_WORKERS setting.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Print the statements of the first tenant instead of '
+            'applying them.',
+        )
+
+    def handle(self, *app_labels, **options):
+        connection = connections[options['database']]
+        tenants = options['tenants'] or db_settings.TENANTS
+        if not tenants:
+            raise CommandError('No tenants to migrate.')
+
+        try:
+            statements = generate_sql(
+                connection, app_labels, options['migrations']
+            )
+        except LookupError as err:
+            raise CommandError(str(err))
+
+        # Django schema editors end collected statements with a semicolon
+        template = StatementTemplate(
+            statements,
+            sql_ending=getattr(connection.SchemaEditorClass, 'sql_ending', ';'),
+        )
+
+        if options['dry_run']:
+            for sql in template.instantiate(tenants[0]):
+                self.stdout.write(sql)
+            return
+
+        if options['migrations']:
+            self.stderr.write(
+                self.style.WARNING(
+                    'Migrations are not recorded in the tenants: running the '
+                    'command again applies all their statements again.'
+                )
+            )
+
+        def progress(result):
+            if result.status == 'done':
+                self.stdout.write(
+                    '%s: %d statements applied in %.1fs.'
+                    % (result.tenant, result.executed, result.duration)
+                )
+            else:
+                self.stderr.write(
+                    '%s: failed on statement %d of %d: %s'
+                    % (
+                        result.tenant,
+                        result.executed + 1,
+                        result.total,
+                        result.error,
+                    )
+                )
+
+        fan_out = TenantFanOut(
+            template,
+            tenants,
+            using=options['database'],
+            workers=options['workers'] or db_settings.TENANT_WORKERS,
+            progress=progress,
+        )
+        fan_out.run()
+
+        failed = fan_out.failed
+        if failed:
+            raise CommandError(
+                '%d of %d tenants failed: %s'
+                % (
+                    len(failed),
+                    len(tenants),
+                    ', '.join(result.tenant for result in failed),
+                )
+            )
@@ -0,0 +1,58 @@
+from django.db.models import Model
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class MaterializedView:
+    """
+    Definition of a materialized view declared on `Meta.materialized_view`.
+    The schema editor creates the view from `query` instead of a table, along
+    with the materialized view logs on `base_tables`, required by fast refresh.
+
+    Base tables are model labels (`app_label.ModelName`) or table names. The
+    view is refreshed on `on` (`COMMIT` or `DEMAND`), or scheduled when `next`
+    is provided.
+    """
+
+    def __init__(
+        self,
+        query,
+        base_tables=(),
+        refresh='FAST',
+        on='COMMIT',
+        start_with='SYSDATE',
+        next=None,
+        log_options='PRIMARY KEY, ROWID',
+    ):
+        self.query = query
+        self.base_tables = list(base_tables)
+        self.refresh = refresh
+        self.on = on
+        self.start_with = start_with
+        self.next = next
+        self.log_options = log_options
+
+    def refresh_sql(self) -> str:
+        if self.next:
+            return '%s START WITH %s NEXT %s' % (
+                self.refresh,
+                self.start_with,
+                self.next,
+            )
+        return '%s ON %s' % (self.refresh, self.on)
+
+    def get_base_tables(self, model: Model):
+        tables = []
+        for label in self.base_tables:
+            try:
+                label = model._meta.apps.get_model(label)._meta.db_table
+            except (LookupError, ValueError):
+                pass
+            tables.append(label)
+        return tables
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, MaterializedView)
+            and self.deconstruct() == other.deconstruct()
+        )
@@ -1,26 +1,52 @@
+from functools import lru_cache
+
 from django.db.models import Model
-from django.db.models.signals import class_prepared, pre_init
 
-from .utils import normalize_table
+from .utils import clear_models_by_table, normalize_table
+
+# Normalized names of the tables transformed in this process, by source name
+transformed_tables = {}
+
+
+@lru_cache(maxsize=None)
+def normalized_table(db_table, format, exclude):
+    return normalize_table(db_table, format=format, exclude=exclude)
+
+
+def manifest_table(db_table):
+    """
+    Return the normalized table of the `NAMING_MANIFEST` (if any)
+    """
+    from .settings import db_settings
+
+    if not db_settings.snapshot.NAMING_MANIFEST:
+        return None
+
+    # Only imported by projects with a manifest
+    from .naming_manifest import get_manifest
+
+    manifest = get_manifest()
+    return manifest.tables.get(db_table) if manifest is not None else None
 
 
 def transform_db_table(sender: Model, **kwargs):
     from .settings import db_settings
 
+    settings = db_settings.snapshot
     should_transform = (
-        db_settings.ENABLE_TRANSFORM_DB_TABLE
-        and db_settings.DEFAULT_DB_TABLE_PATTERN
+        settings.ENABLE_TRANSFORM_DB_TABLE and settings.DEFAULT_DB_TABLE_PATTERN
     )
 
     if should_transform:
-        normalized_name = normalize_table(
-            sender._meta.db_table,
-            format=db_settings.DEFAULT_DB_TABLE_PATTERN,
-            exclude=db_settings.IGNORE_DB_TABLE_PATTERNS,
+        source = sender._meta.db_table
+        table = manifest_table(source) or normalized_table(
+            source,
+            settings.DEFAULT_DB_TABLE_PATTERN,
+            settings.IGNORE_DB_TABLE_PATTERNS,
         )
 
-        sender._meta.db_table = normalized_name
-
-
-pre_init.connect(transform_db_table)
-class_prepared.connect(transform_db_table)
+        sender._meta.db_table = table
+        if table != source:
+            transformed_tables[source] = table
+            # Like the tables of models loaded before the app is ready
+            clear_models_by_table()
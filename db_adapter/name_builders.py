@@ -2,19 +2,59 @@ from typing import List
 
 from django.db.models import Field, Model
 
-from .settings import db_settings
+from .instrumentation import timed
+from .settings import DEFAULTS, db_settings, setting
 from .utils import split_table_identifiers
 
 Fields = List[Field]
 
+# The naming manifest module and the names of the manifest (or `None`),
+# resolved once names are first built (not by processes only importing the
+# adapter, like web workers), until the settings are reloaded
+_manifest_lookup = {}
+
+
+@db_settings.register_invalidation
+def clear_manifest_lookup():
+    _manifest_lookup.clear()
+
+
+def manifest_lookup():
+    lookup = _manifest_lookup.get('lookup')
+    if lookup is None:
+        from . import naming_manifest
+
+        manifest = naming_manifest.get_manifest()
+        lookup = (naming_manifest, manifest and manifest.names)
+        _manifest_lookup['lookup'] = lookup
+
+    return lookup
+
 
 class ObjectNameBuilder:
-    default_db_table_pattern = db_settings.DEFAULT_DB_TABLE_PATTERN
-    default_object_name_patterns = db_settings.DEFAULT_OBJECT_NAME_PATTERNS
+    default_db_table_pattern = setting('DEFAULT_DB_TABLE_PATTERN')
+    default_object_name_patterns = setting('DEFAULT_OBJECT_NAME_PATTERNS')
 
+    @timed('process_name')
     def process_name(
         self, model: Model, fields: Fields, type: str, qualifier=''
     ):
+        naming_manifest, names = manifest_lookup()
+
+        recording = naming_manifest.current_recording.get()
+        if recording is None:
+            if names is not None:
+                key = naming_manifest.name_key(model, fields, type, qualifier)
+                if key in names:
+                    return names[key]
+
+            return self.build_name(model, fields, type, qualifier)
+
+        key = naming_manifest.name_key(model, fields, type, qualifier)
+        recording[key] = self.build_name(model, fields, type, qualifier)
+        return recording[key]
+
+    def build_name(self, model: Model, fields: Fields, type: str, qualifier=''):
         parts = split_table_identifiers(
             model._meta.db_table,
             format=self.default_db_table_pattern,
@@ -46,7 +86,13 @@ class ObjectNameBuilder:
         return obj_name
 
     def should_include_namespace(self, model, field, type, qualifier=''):
-        return type in ['sequence', 'trigger', 'index']
+        return type in ['sequence', 'trigger', 'index', 'interim_table']
 
     def object_name_pattern(self, type: str) -> str:
-        return self.default_object_name_patterns[type.upper()]
+        type = type.upper()
+        patterns = self.default_object_name_patterns
+        if type == 'INTERIM_TABLE' and type not in patterns:
+            # Object name patterns set by projects before interim tables
+            # were named replace the default ones
+            return DEFAULTS['DEFAULT_OBJECT_NAME_PATTERNS'][type]
+        return patterns[type]
@@ -0,0 +1,193 @@
+"""
+Manifest of the normalized tables and object names of a project, built once
+(see the `namingmanifest` command) and loaded by the processes of the project
+from the `NAMING_MANIFEST` setting, so names are looked up instead of computed.
+
+Names missing from the manifest (like the ones of models added since it was
+built) are still computed, and the manifest is ignored when the settings it
+was built with changed.
+"""
+import json
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.db.backends.utils import split_identifier
+
+from .instrumentation import LazyContextVar
+from .models import transformed_tables
+from .settings import DEFAULTS, db_settings
+
+logger = logging.getLogger('db_adapter')
+
+# Bump when the names computed for the same settings change
+MANIFEST_VERSION = 1
+
+# Names computed while building a manifest
+current_recording = LazyContextVar('current_recording')
+
+
+def name_key(model, fields, type, qualifier=''):
+    return (
+        model._meta.db_table,
+        tuple(field.column for field in fields),
+        type,
+        qualifier,
+    )
+
+
+def manifest_fingerprint() -> str:
+    from .ddl_cache import _hash
+
+    return _hash(
+        dict(
+            version=MANIFEST_VERSION,
+            settings={
+                key: getattr(db_settings, key)
+                for key in DEFAULTS
+                if key != 'NAMING_MANIFEST'
+            },
+        )
+    )
+
+
+class NamingManifest:
+    def __init__(self, fingerprint, tables=None, names=None):
+        self.fingerprint = fingerprint
+        self.tables = tables or {}
+        self.names = names or {}
+
+    @classmethod
+    def load(cls, path):
+        """
+        Return the manifest of the file, or `None` when it cannot be read or
+        was built with other settings
+        """
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            manifest = cls(
+                data['fingerprint'],
+                dict(data['tables']),
+                {
+                    (table, tuple(columns), type, qualifier): name
+                    for table, columns, type, qualifier, name in data['names']
+                },
+            )
+        except (OSError, ValueError, KeyError, TypeError) as err:
+            logger.warning('Naming manifest %s ignored: %s', path, err)
+            return None
+
+        if manifest.fingerprint != manifest_fingerprint():
+            logger.warning(
+                'Naming manifest %s ignored: built with other settings', path
+            )
+            return None
+
+        return manifest
+
+    def dump(self, path):
+        data = dict(
+            fingerprint=self.fingerprint,
+            tables=sorted(self.tables.items()),
+            names=[
+                [key[0], list(key[1]), key[2], key[3], name]
+                for key, name in sorted(self.names.items())
+            ],
+        )
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=1)
+
+    def problems(self, max_length=None):
+        """
+        Return messages of the names used by several tables or objects, and of
+        the names longer than `max_length` (when the database has a limit)
+        """
+        problems = []
+
+        transformed = set(self.tables.values())
+        owners = defaultdict(set)
+        for source, table in self.tables.items():
+            owners[table.upper()].add('table %s' % source)
+        for (table, columns, type, qualifier), name in self.names.items():
+            if table not in transformed:
+                owners[table.upper()].add('table %s' % table)
+            owners[name.upper()].add(
+                '%s%s of %s(%s)' % (type, qualifier, table, ', '.join(columns))
+            )
+
+        for name, items in sorted(owners.items()):
+            if len(items) > 1:
+                problems.append(
+                    'Name %s is used by %s' % (name, '; '.join(sorted(items)))
+                )
+
+            for part in split_identifier(name):
+                if max_length and len(part) > max_length:
+                    problems.append(
+                        'Name %s is longer than %d characters'
+                        % (name, max_length)
+                    )
+
+        return problems
+
+
+_manifest = {}
+
+
+def get_manifest():
+    """
+    Return the manifest of the `NAMING_MANIFEST` setting (loaded once), or
+    `None` when there is none or it is ignored
+    """
+    if 'manifest' not in _manifest:
+        path = db_settings.snapshot.NAMING_MANIFEST
+        _manifest['manifest'] = NamingManifest.load(path) if path else None
+
+    return _manifest['manifest']
+
+
+@db_settings.register_invalidation
+def clear_manifest():
+    _manifest.clear()
+
+
+@contextmanager
+def recording_names():
+    """
+    Record the names computed by name builders in the block (instead of
+    looking them up in the manifest)
+    """
+    names = {}
+    token = current_recording.set(names)
+    try:
+        yield names
+    finally:
+        current_recording.reset(token)
+
+
+def build_manifest(connection, app_labels=()):
+    """
+    Return a manifest of the normalized tables of the models of the apps (all
+    apps by default) and of the names of the objects created with them
+    """
+    from .profiling import generate_sql
+
+    with recording_names() as names:
+        generate_sql(connection, app_labels)
+
+    tables = {
+        model._meta.db_table
+        for model in apps.get_models(include_auto_created=True)
+        if not app_labels or model._meta.app_label in app_labels
+    }
+    return NamingManifest(
+        manifest_fingerprint(),
+        {
+            source: table
+            for source, table in transformed_tables.items()
+            if table in tables
+        },
+        names,
+    )
@@ -0,0 +1,135 @@
+import sys
+import threading
+from collections import Counter
+
+from django.db.migrations.executor import MigrationExecutor
+
+from .bootstrap import migration_plan
+from .ddl_cache import incremental_sql
+from .models import transformed_tables
+from .settings import db_settings
+from .utils import created_models, normalize_table
+
+# Functions of the adapter reported by profiles
+PROFILED_FUNCTIONS = [
+    'normalize_table',
+    'process_name',
+    'format_sql',
+    'table_sql',
+    'column_sql',
+    'enforce_model',
+]
+
+
+class SamplingProfiler:
+    """
+    Sample the stack of the profiling thread every `interval` seconds, counting
+    collapsed stacks (`module:function;module:function` lines, as read by
+    flame graph tools)
+
+        with SamplingProfiler() as profiler:
+            generate_sql(connection)
+        print(profiler.collapsed())
+    """
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._thread_id = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __len__(self):
+        return sum(self.stacks.values())
+
+    def start(self):
+        self._thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._sample, name='sampling-profiler', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _sample(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+
+            stack = []
+            while frame is not None:
+                stack.append(
+                    '%s:%s'
+                    % (frame.f_globals.get('__name__'), frame.f_code.co_name)
+                )
+                frame = frame.f_back
+
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def function_samples(self, names=PROFILED_FUNCTIONS):
+        """
+        Return the number of samples within each function
+        """
+        samples = Counter()
+        for stack, count in self.stacks.items():
+            functions = {frame.rsplit(':', 1)[-1] for frame in stack.split(';')}
+            for name in names:
+                if name in functions:
+                    samples[name] += count
+
+        return samples
+
+    def collapsed(self):
+        return '\n'.join(
+            '%s %d' % (stack, count)
+            for stack, count in sorted(self.stacks.items())
+        )
+
+
+def generate_sql(connection, app_labels=(), migrations=False):
+    """
+    Return the statements creating the models of the apps (all apps by
+    default), or the statements of their migrations (like `sqlmigrate`)
+    """
+    if migrations:
+        executor = MigrationExecutor(connection)
+        plan = [
+            (executor.loader.graph.nodes[key], False)
+            for key in migration_plan(executor.loader, app_labels)
+        ]
+        return executor.collect_sql(plan)
+
+    models = created_models(app_labels)
+    normalize_tables(models)
+    return incremental_sql(connection, models)
+
+
+def normalize_tables(models):
+    """
+    Normalize the tables of the models again (from their source names), as
+    live models were normalized when their classes were prepared
+    """
+    settings = db_settings.snapshot
+    if not (
+        settings.ENABLE_TRANSFORM_DB_TABLE and settings.DEFAULT_DB_TABLE_PATTERN
+    ):
+        return
+
+    sources = {table: source for source, table in transformed_tables.items()}
+    for model in models:
+        db_table = model._meta.db_table
+        normalize_table(
+            sources.get(db_table, db_table),
+            format=settings.DEFAULT_DB_TABLE_PATTERN,
+            exclude=settings.IGNORE_DB_TABLE_PATTERNS,
+        )
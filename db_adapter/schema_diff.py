@@ -0,0 +1,163 @@
+import re
+from collections import OrderedDict, namedtuple
+from typing import Iterable, List
+
+from django.db.models import Model
+
+SchemaObject = namedtuple('SchemaObject', ['type', 'table', 'name'])
+
+# Objects created by the statements of the schema editor (the first matching
+# pattern wins, so more specific ones come first)
+STATEMENT_PATTERNS = [
+    (
+        'MATERIALIZED_VIEW_LOG',
+        r'CREATE\s+MATERIALIZED\s+VIEW\s+LOG\s+ON\s+(?P<table>\S+)',
+    ),
+    ('TABLE', r'CREATE\s+MATERIALIZED\s+VIEW\s+(?P<table>\S+)'),
+    ('TABLE', r'CREATE\s+TABLE\s+(?P<table>\S+)'),
+    (
+        'CONSTRAINT',
+        r'ALTER\s+TABLE\s+(?P<table>\S+)\s+ADD\s+CONSTRAINT\s+(?P<name>\S+)',
+    ),
+    (
+        'COLUMN',
+        r'ALTER\s+TABLE\s+(?P<table>\S+)\s+ADD\s+(?:COLUMN\s+)?(?P<name>\S+)',
+    ),
+    (
+        'INDEX',
+        r'CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?P<name>\S+)\s+ON\s+(?P<table>\S+)',
+    ),
+    ('VISIBLE_INDEX', r'ALTER\s+INDEX\s+(?P<name>\S+)\s+VISIBLE'),
+    ('SEQUENCE', r'CREATE\s+SEQUENCE\s+(?P<name>\S+)'),
+    (
+        'TRIGGER',
+        r'CREATE\s+(?:OR\s+REPLACE\s+)?TRIGGER\s+(?P<name>\S+)'
+        r'.*?\sON\s+(?P<table>\S+)',
+    ),
+    ('GRANT', r'GRANT\s+.+?\s+ON\s+(?P<table>\S+)\s+TO\s+(?P<name>\S+)'),
+    ('COMMENT', r'COMMENT\s+ON\s+COLUMN\s+(?P<table>\S+)\.(?P<name>[^.\s]+)'),
+    (
+        'STATISTICS',
+        r"DBMS_STATS\.GATHER_TABLE_STATS\(.*?tabname\s*=>\s*'(?P<table>[^']+)'",
+    ),
+]
+STATEMENT_PATTERNS = [
+    (type, re.compile(r'^\s*' + pattern, re.IGNORECASE | re.DOTALL))
+    for type, pattern in STATEMENT_PATTERNS
+]
+
+# Objects whose names are unique within a schema
+SCHEMA_OBJECT_TYPES = ['CONSTRAINT', 'INDEX', 'SEQUENCE', 'TRIGGER']
+
+
+def normalize_name(name):
+    if not name:
+        return None
+    return name.replace('"', '').rsplit('.', 1)[-1].upper()
+
+
+def statement_object(sql):
+    """
+    Return the `SchemaObject` created by a statement of the schema editor, or
+    `None` when the statement cannot be matched
+    """
+    # Deferred statements know their objects
+    obj = getattr(sql, 'object', None)
+    if obj is not None:
+        return obj
+
+    sql = str(sql).rstrip().rstrip('/').rstrip().rstrip(';')
+
+    for type, pattern in STATEMENT_PATTERNS:
+        match = pattern.match(sql)
+        if match:
+            groups = match.groupdict()
+            return SchemaObject(
+                type,
+                normalize_name(groups.get('table')),
+                normalize_name(groups.get('name')),
+            )
+
+    return None
+
+
+class SchemaSnapshot:
+    """
+    Objects of a database schema, loaded from the data dictionary as
+    `(type, table, name)` rows (see `DatabaseIntrospection.get_schema_snapshot`)
+    """
+
+    def __init__(self, objects: Iterable[tuple] = ()):
+        self.objects = {self._key(SchemaObject(*obj)) for obj in objects}
+
+    def __contains__(self, obj):
+        return self._key(SchemaObject(*obj)) in self.objects
+
+    def __len__(self):
+        return len(self.objects)
+
+    def _key(self, obj: SchemaObject):
+        table = normalize_name(obj.table)
+        name = normalize_name(obj.name)
+
+        if obj.type in SCHEMA_OBJECT_TYPES:
+            return (obj.type, None, name)
+        if obj.type in ('TABLE', 'MATERIALIZED_VIEW_LOG'):
+            return (obj.type, table, None)
+
+        return (obj.type, table, name)
+
+    def has_table(self, table):
+        return ('TABLE', table, None) in self
+
+    def has_column(self, table, column):
+        return ('COLUMN', table, column) in self
+
+    def is_missing(self, obj: SchemaObject) -> bool:
+        """
+        Return whether the object created by a statement is missing from the
+        schema (statements that cannot be matched are always kept)
+        """
+        if obj is None:
+            return True
+
+        if obj.type == 'VISIBLE_INDEX':
+            return ('INDEX', None, obj.name) not in self
+        if obj.type == 'COMMENT':
+            return not self.has_column(obj.table, obj.name)
+        if obj.type == 'STATISTICS':
+            return not self.has_table(obj.table)
+
+        return obj not in self
+
+
+def schema_diff(connection, models: List[Model], snapshot: SchemaSnapshot):
+    """
+    Return the statements creating the objects of the models (tables,
+    columns, named constraints, indexes, sequences, triggers and grants)
+    missing from the schema snapshot, in the `SQL_STATEMENTS_ORDER` order.
+    """
+    with connection.schema_editor(collect_sql=True, atomic=False) as editor:
+        for model in models:
+            editor.create_model(model)
+
+        # Columns missing from existing tables
+        for model in models:
+            opts = model._meta
+            if getattr(opts, 'materialized_view', None):
+                continue
+            if not snapshot.has_table(opts.db_table):
+                continue
+
+            for field in opts.local_fields:
+                if field.column and not snapshot.has_column(
+                    opts.db_table, field.column
+                ):
+                    editor.add_field(model, field)
+
+    # Statements of added columns repeat the constraints of created models
+    statements = OrderedDict.fromkeys(editor.collected_sql)
+
+    return [
+        sql for sql in statements if snapshot.is_missing(statement_object(sql))
+    ]
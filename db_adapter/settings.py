@@ -28,8 +28,10 @@ DB_ADAPTER = {
 Based on similar settings structure from django-rest-framework:
 https://github.com/encode/django-rest-framework/blob/master/rest_framework/settings.py
 """
+from types import MappingProxyType
+
 from django.conf import settings
-from django.test.signals import setting_changed
+from django.core.signals import setting_changed
 from django.utils.module_loading import import_string
 
 # fmt: off
@@ -43,11 +45,12 @@ DEFAULTS = {
     'DEFAULT_OBJECT_NAME_PATTERNS': {
         'SEQUENCE': '{table}_sq',
         'TRIGGER': '{table}_tr',
-        'INDEX': '{table}_{columns}_idx',
+        'INDEX': '{table}_{columns}{qualifier}_idx',
         'PRIMARY_KEY': '{table}_{columns}_pk',
         'FOREIGN_KEY': '{table}_{columns}_fk',
         'UNIQUE': '{table}_{columns}_uniq',
         'CHECK': '{table}_{columns}{qualifier}_check',
+        'INTERIM_TABLE': '{table}_int',
     },
 
     # Grant options
@@ -67,6 +70,8 @@ DEFAULTS = {
         'unquote': False,
     },
     'SQL_STATEMENTS_ORDER': [
+        'MATERIALIZED_VIEW_LOG',
+        'MATERIALIZED_VIEW',
         'PRIMARY_KEY',
         'UNIQUE',
         'FOREIGN_KEY',
@@ -75,13 +80,87 @@ DEFAULTS = {
         'COMMENT',
         'CONTROL',
         'AUTOINCREMENT',
-    ]
+        'STATISTICS',
+    ],
+
+    # Optimizer statistics
+    'GATHER_STATISTICS': False,
+    'STATISTICS_OPTIONS': {
+        'estimate_percent': 'DBMS_STATS.AUTO_SAMPLE_SIZE',
+        'degree': 'NULL',
+        'cascade': True,
+    },
+    'INVISIBLE_INDEXES': False,
+
+    # Constraint names resolution
+    'VALIDATE_CONSTRAINT_NAMES': False,
+
+    # Parallel execution of deferred statements (on as many connections)
+    'DEFERRED_SQL_WORKERS': 1,
+
+    # Deferred statements run by PL/SQL block (of up to as many statements)
+    'SQL_BATCH_SIZE': 1,
+
+    # Lock-timeout-aware execution (timeout in seconds, set back to the
+    # restore timeout when schema editors exit, backoff delays in seconds
+    # doubled on each retry)
+    'DDL_LOCK_TIMEOUT': None,
+    'DDL_LOCK_TIMEOUT_RESTORE': 0,
+    'DDL_RETRY_OPTIONS': {
+        'retries': 0,
+        'backoff': 1,
+        'max_backoff': 60,
+        'jitter': 0.5,
+    },
+
+    # Online redefinition of tables on column type changes
+    'ONLINE_REDEFINITION': False,
+
+    # Durations of the phases of schema editors (logged and sent with the
+    # `db_adapter.instrumentation.phase_timings_collected` signal)
+    'PHASE_TIMINGS': False,
+
+    # Statements taking longer (in seconds) are logged, and the number of the
+    # slowest statements of reports
+    'SLOW_STATEMENT_THRESHOLD': None,
+    'STATEMENT_REPORT_SIZE': 10,
+
+    # Namespaces of the tenants statements are fanned out to (replacing the
+    # namespace of `DEFAULT_DB_TABLE_PATTERN`), on as many connections
+    'TENANTS': [],
+    'TENANT_WORKERS': 4,
+
+    # Number of database aliases migrated concurrently by `migratealiases`
+    'ALIAS_WORKERS': 4,
+
+    # Path of the manifest of table and object names to look names up in
+    # (built by the `namingmanifest` command)
+    'NAMING_MANIFEST': None,
+
+    # Bulk-load mode
+    'BULK_LOAD_STEPS': [
+        'PRIMARY_KEY',
+        'UNIQUE',
+        'FOREIGN_KEY',
+        'CHECK',
+        'INDEX',
+    ],
+    'BULK_LOAD_OPTIONS': {
+        'direct_path': False,
+        'parallel': None,
+        'novalidate': False,
+    },
 }
 # fmt: on
 
 IMPORT_STRINGS = ['NAME_BUILDER_CLASS']
 
-DICT_STRINGS = ['SQL_FORMAT_OPTIONS']
+DICT_STRINGS = [
+    'SQL_FORMAT_OPTIONS',
+    'STATISTICS_OPTIONS',
+    'DDL_RETRY_OPTIONS',
+    'BULK_LOAD_OPTIONS',
+]
 
 
 def perform_import(val, setting_name):
@@ -112,6 +191,30 @@ def import_from_string(val, setting_name):
         raise ImportError(msg)
 
 
+class SettingsSnapshot:
+    """
+    Immutable values of the settings at a version, read by attribute like the
+    settings (dictionaries are read-only, lists are tuples)
+    """
+
+    __slots__ = ('version',)
+
+    def __init__(self, version, values):
+        object.__setattr__(self, 'version', version)
+        for attr, val in values.items():
+            if isinstance(val, dict):
+                val = MappingProxyType(val)
+            elif isinstance(val, list):
+                val = tuple(val)
+            object.__setattr__(self, attr, val)
+
+    def __setattr__(self, attr, val):
+        raise AttributeError('Settings snapshots are immutable')
+
+    def __delattr__(self, attr):
+        raise AttributeError('Settings snapshots are immutable')
+
+
 class DatabaseAdapterSettings:
     def __init__(
         self,
@@ -128,12 +231,34 @@ class DatabaseAdapterSettings:
         self.dict_strings = dict_strings or DICT_STRINGS
         self._cached_attrs = set()
 
+        self.version = 0
+        self._snapshot = None
+        self._snapshot_class = type(
+            'SettingsSnapshot',
+            (SettingsSnapshot,),
+            dict(__slots__=tuple(self.defaults)),
+        )
+        self._invalidation_callbacks = []
+
     @property
     def user_settings(self):
         if not hasattr(self, '_user_settings'):
             self._user_settings = getattr(settings, 'DB_ADAPTER', {})
         return self._user_settings
 
+    @property
+    def snapshot(self):
+        """
+        Return the values of all the settings at the current version (built
+        once per version)
+        """
+        if self._snapshot is None:
+            self._snapshot = self._snapshot_class(
+                self.version,
+                {attr: getattr(self, attr) for attr in self.defaults},
+            )
+        return self._snapshot
+
     def __getattr__(self, attr):
         if attr not in self.defaults:
             raise AttributeError("Invalid API setting: '%s'" % attr)
@@ -161,6 +286,14 @@ class DatabaseAdapterSettings:
         setattr(self, attr, val)
         return val
 
+    def register_invalidation(self, callback):
+        """
+        Call `callback` (without arguments) whenever the settings are reloaded,
+        to clear a cache depending on them. Can be used as a decorator.
+        """
+        self._invalidation_callbacks.append(callback)
+        return callback
+
     def reload(self):
         for attr in self._cached_attrs:
             delattr(self, attr)
@@ -168,6 +301,24 @@ class DatabaseAdapterSettings:
         if hasattr(self, '_user_settings'):
             delattr(self, '_user_settings')
 
+        self.version += 1
+        self._snapshot = None
+        for callback in self._invalidation_callbacks:
+            callback()
+
+
+class setting:
+    """
+    Class attribute reading a setting from the current snapshot, so classes
+    follow reloads of the settings (instances can still override it)
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        return getattr(db_settings.snapshot, self.name)
+
 
 db_settings = DatabaseAdapterSettings(None, DEFAULTS)
 
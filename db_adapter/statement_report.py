@@ -0,0 +1,93 @@
+import heapq
+import json
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class StatementReport:
+    """
+    Number and total duration of the statements executed by the schema
+    editors of a connection, along with the slowest ones
+    """
+
+    def __init__(self, size=None):
+        from .settings import db_settings
+
+        self.size = db_settings.STATEMENT_REPORT_SIZE if size is None else size
+        self.count = 0
+        self.total = 0.0
+        self._slowest = []
+
+    def __len__(self):
+        return self.count
+
+    def add(self, sql, duration, obj=None):
+        self.count += 1
+        self.total += duration
+
+        entry = dict(
+            duration=duration,
+            type=obj.type if obj else None,
+            table=obj.table if obj else None,
+            name=obj.name if obj else None,
+            sql=str(sql),
+        )
+        item = (duration, -self.count, entry)
+        if len(self._slowest) < self.size:
+            heapq.heappush(self._slowest, item)
+        elif self.size:
+            heapq.heappushpop(self._slowest, item)
+
+    @property
+    def slowest(self):
+        return [entry for *_, entry in sorted(self._slowest, reverse=True)]
+
+    def as_json(self):
+        return json.dumps(
+            dict(count=self.count, total=self.total, slowest=self.slowest),
+            indent=2,
+        )
+
+    def as_table(self):
+        lines = [
+            '%d statements in %.3fs, slowest:' % (self.count, self.total),
+            '%10s  %-13s  %-30s  %s' % ('Duration', 'Type', 'Object', 'SQL'),
+        ]
+        for entry in self.slowest:
+            sql = ' '.join(entry['sql'].split())
+            lines.append(
+                '%9.3fs  %-13s  %-30s  %s'
+                % (
+                    entry['duration'],
+                    entry['type'] or '-',
+                    entry['name'] or entry['table'] or '-',
+                    sql if len(sql) <= 60 else sql[:57] + '...',
+                )
+            )
+
+        return '\n'.join(lines)
+
+
+@contextmanager
+def statement_report(using=DEFAULT_DB_ALIAS, size=None):
+    """
+    Report the statements executed by schema editors within the block (nested
+    blocks share the outermost report).
+
+        with statement_report() as report:
+            call_command('migrate')
+        print(report.as_table())
+    """
+    connection = connections[using]
+
+    current = getattr(connection, 'statement_report', None)
+    if current is not None:
+        yield current
+        return
+
+    report = connection.statement_report = StatementReport(size)
+    try:
+        yield report
+    finally:
+        connection.statement_report = None
@@ -0,0 +1,211 @@
+"""
+Schema-per-tenant fan-out: statements are generated once for the namespace of
+the `DEFAULT_DB_TABLE_PATTERN` setting (the template namespace), instantiated
+for the namespace of each tenant, and applied to the tenants concurrently.
+
+    template = StatementTemplate(generate_sql(connection, ['shop']))
+    fan_out = TenantFanOut(template, ['tenant_1', 'tenant_2'], workers=8)
+    results = fan_out.run()
+"""
+import logging
+import queue
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+from django.db.backends.utils import split_identifier
+from django.db.utils import DatabaseError
+
+from .executor import WorkerEditors
+
+logger = logging.getLogger('django.db.backends.schema')
+
+# PL/SQL blocks (and triggers) need their ending semicolon
+PLSQL_BLOCK = re.compile(
+    r'^\s*(?:BEGIN|DECLARE|CREATE\s+(?:OR\s+REPLACE\s+)?TRIGGER)\b.*\bEND$',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def template_namespace():
+    from .settings import db_settings
+
+    namespace, _ = split_identifier(db_settings.DEFAULT_DB_TABLE_PATTERN)
+    if not namespace:
+        raise ImproperlyConfigured(
+            'DEFAULT_DB_TABLE_PATTERN must include a namespace (like '
+            '\'"tenant"."tb_{table_name}"\') to fan out statements to tenants'
+        )
+    return namespace
+
+
+class StatementTemplate:
+    """
+    Statements of the template namespace, instantiated for other namespaces.
+    The namespace is replaced where it qualifies identifiers (`ns.name` or
+    `"ns".name`) and where it is the owner passed to `DBMS_STATS` or
+    `DBMS_REDEFINITION` (`ownname => 'NS'` or `uname => 'NS'`), keeping its
+    case. Other string literals (like column defaults) are left as is.
+    """
+
+    def __init__(self, statements, namespace=None, sql_ending=''):
+        self.namespace = namespace or template_namespace()
+        self.statements = []
+        for sql in map(str, statements):
+            # Comments of operations collected from migrations
+            if sql.startswith('--'):
+                continue
+            # Endings added by schema editors collecting statements
+            if sql_ending and sql.endswith(sql_ending):
+                sql = sql[: -len(sql_ending)]
+            if PLSQL_BLOCK.match(sql):
+                sql += ';'
+            self.statements.append(sql)
+
+        namespace = re.escape(self.namespace)
+        self._pattern = re.compile(
+            r'(?<![\w$#"\'])(?:(?P<quote>"?)(?P<ident>%s)(?P=quote)(?=\.)'
+            r"|(?P<owner>\b(?:ownname|uname)\s*=>\s*)'(?P<literal>%s)')"
+            % (namespace, namespace),
+            re.IGNORECASE,
+        )
+
+    def __len__(self):
+        return len(self.statements)
+
+    def instantiate(self, namespace):
+        def replace(match):
+            name = match.group('ident') or match.group('literal')
+            if name.isupper():
+                value = namespace.upper()
+            elif name.islower():
+                value = namespace.lower()
+            else:
+                value = namespace
+
+            if match.group('literal'):
+                return "%s'%s'" % (match.group('owner'), value)
+            quote = match.group('quote')
+            return '%s%s%s' % (quote, value, quote)
+
+        return [self._pattern.sub(replace, sql) for sql in self.statements]
+
+
+class TenantResult:
+    """
+    Progress of the statements of a tenant
+    """
+
+    def __init__(self, tenant, total):
+        self.tenant = tenant
+        self.total = total
+        self.executed = 0
+        self.status = 'pending'
+        self.error = None
+        self.failed_sql = None
+        self.duration = None
+
+    def __repr__(self):
+        return '<TenantResult %s: %s %d/%d>' % (
+            self.tenant,
+            self.status,
+            self.executed,
+            self.total,
+        )
+
+
+class TenantFanOut:
+    """
+    Apply the statements of a template to tenants on a bounded pool of
+    connections. Statements of a tenant run in order, and stop at the first
+    failed one (the other tenants go on).
+    """
+
+    def __init__(
+        self,
+        template,
+        tenants,
+        using=DEFAULT_DB_ALIAS,
+        workers=4,
+        progress=None,
+    ):
+        self.template = template
+        self.using = using
+        self.workers = workers
+        self.progress = progress
+        self.results = [
+            TenantResult(tenant, len(template)) for tenant in tenants
+        ]
+
+    @property
+    def failed(self):
+        return [result for result in self.results if result.status == 'failed']
+
+    def execute_statement(self, sql):
+        """
+        Execute a statement on the connection of the current worker
+        """
+        self._editors.execute(sql, None)
+
+    def close_connection(self):
+        self._editors.close()
+
+    def apply(self, result):
+        result.status = 'running'
+        start = time.perf_counter()
+        try:
+            for sql in self.template.instantiate(result.tenant):
+                try:
+                    self.execute_statement(sql)
+                except DatabaseError as err:
+                    result.status = 'failed'
+                    result.error = err
+                    result.failed_sql = sql
+                    logger.error(
+                        'Tenant %s failed on statement %d: %s',
+                        result.tenant,
+                        result.executed + 1,
+                        err,
+                    )
+                    break
+                result.executed += 1
+            else:
+                result.status = 'done'
+        finally:
+            result.duration = time.perf_counter() - start
+            if self.progress is not None:
+                self.progress(result)
+
+    def worker(self, pending):
+        try:
+            while True:
+                try:
+                    result = pending.get_nowait()
+                except queue.Empty:
+                    return
+                self.apply(result)
+        finally:
+            self.close_connection()
+
+    def run(self):
+        """
+        Apply the statements to all tenants (each worker takes the next tenant
+        on its own connection), returning their results
+        """
+        self._editors = WorkerEditors(self.using)
+
+        pending = queue.Queue()
+        for result in self.results:
+            pending.put(result)
+
+        workers = max(1, min(self.workers, len(self.results)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(self.worker, pending) for _ in range(workers)
+            ]
+            for future in futures:
+                future.result()
+
+        return self.results
@@ -1,17 +1,30 @@
 from collections import namedtuple
+from functools import lru_cache
 from typing import List, Union
 
-from parse import compile, parse
-
 from django.apps import apps
 from django.db.backends.utils import split_identifier
 from django.db.models import Field, Model
 
+from .instrumentation import timed
+from .settings import db_settings
+
 TableIdentifiers = namedtuple(
     'TableIdentifiers', ['namespace', 'table', 'table_name']
 )
 
 
+@lru_cache(maxsize=None)
+def compile_pattern(format):
+    """
+    Return the parser of a pattern (`parse` is only imported once a pattern is
+    used, and each pattern is compiled once)
+    """
+    from parse import compile
+
+    return compile(format)
+
+
 def split_table_identifiers(db_table, format='') -> TableIdentifiers:
     namespace, table = split_identifier(db_table)
 
@@ -24,7 +37,7 @@ def split_table_identifiers(db_table, format='') -> TableIdentifiers:
     if format:
         _, table_format = split_identifier(format)
 
-        result = parse(table_format, table)
+        result = compile_pattern(table_format).parse(table)
         if result:
             groupdict.update(result.named)
 
@@ -34,7 +47,7 @@ def split_table_identifiers(db_table, format='') -> TableIdentifiers:
 def normalize_table(db_table: str, format: str, exclude=[]):
     # Ignore excluded formats
     for fmt in exclude:
-        result = parse(fmt, db_table)
+        result = compile_pattern(fmt).parse(db_table)
         if result:
             return db_table
 
@@ -43,32 +56,89 @@ def normalize_table(db_table: str, format: str, exclude=[]):
 
     # Add namespace from format when specified, but not included in db_table
     if namespace_format and not namespace:
-        result = parse(table_format, table_name)
+        result = compile_pattern(table_format).parse(table_name)
         formatted = table_name
         if not result:
             formatted = table_format.format(table_name=table_name)
         return '"{}"."{}"'.format(namespace_format, formatted)
 
-    pattern = compile(format)
-    result = pattern.parse(db_table)
+    result = compile_pattern(format).parse(db_table)
     if not result:
         return format.format(table_name=db_table)
 
     return db_table
 
 
+def is_created_model(model: Model) -> bool:
+    """
+    Return whether the schema of the model is created by the database (managed
+    models, neither proxy nor swapped)
+    """
+    opts = model._meta
+    return opts.managed and not opts.proxy and not opts.swapped
+
+
+def created_models(app_labels=()) -> List[Model]:
+    """
+    Return the models of the apps (all apps by default) whose schema is
+    created by the database, along with their auto-created models (like the
+    ones of many-to-many fields). Unknown apps raise `LookupError`.
+    """
+    app_configs = (
+        [apps.get_app_config(label) for label in app_labels]
+        if app_labels
+        else apps.get_app_configs()
+    )
+    return [
+        model
+        for app_config in app_configs
+        for model in app_config.get_models(include_auto_created=True)
+        if is_created_model(model)
+    ]
+
+
 Fields = List[Field]
 FieldsOrColumns = Union[Fields, List[str]]
 ModelOrTableName = Union[Model, str]
 
 
+# Models by table name (and tables without models), built once for the list
+# of models of the app registry, until it changes (like when the registry cache
+# is cleared), the settings are reloaded or tables are transformed
+_models_by_table = {}
+
+
+@db_settings.register_invalidation
+def clear_models_by_table():
+    _models_by_table.clear()
+
+
+def model_by_table(db_table):
+    models = apps.get_models(include_auto_created=True)
+    if _models_by_table.get('models') is models:
+        index = _models_by_table['index']
+        model = index.get(db_table)
+        if model is None:
+            # Misses are cached, instead of rebuilding the index
+            return index.setdefault(db_table, None)
+        if model._meta.db_table == db_table:
+            return model
+
+    # Rebuilt when the registry changed, or when the table of a model changed
+    # since the index was built
+    index = {}
+    for model in models:
+        index.setdefault(model._meta.db_table, model)
+    _models_by_table.update(models=models, index=index)
+
+    return index.setdefault(db_table, None)
+
+
+@timed('enforce_model')
 def enforce_model(model_or_table_name: ModelOrTableName):
     model = model_or_table_name
     if isinstance(model, str):
-        model = next(
-            (m for m in apps.get_models() if m._meta.db_table == model),
-            None,
-        )
+        model = model_by_table(model)
 
     return model
 
@@ -1,3 +1,7 @@
+from django.db.backends.base.introspection import (
+    BaseDatabaseIntrospection,
+    TableInfo,
+)
 from django.db.backends.base.schema import BaseDatabaseSchemaEditor
 from django.db.backends.dummy.base import (
     DatabaseOperations as DjangoDatabaseOperations,
@@ -5,6 +9,7 @@ from django.db.backends.dummy.base import (
 )
 from django.db.utils import DEFAULT_DB_ALIAS
 
+from db_adapter.db.backends.base.introspection import DatabaseIntrospection
 from db_adapter.db.backends.base.operations import DatabaseOperations
 from db_adapter.db.backends.base.schema import DatabaseSchemaEditor
 
@@ -79,7 +84,79 @@ class TestDatabaseOperationsFormatSql(TestDatabaseOperationsAutoincSql):
 
 
 class TestDatabaseSchemaEditor(DatabaseSchemaEditor, BaseDatabaseSchemaEditor):
-    pass
+    def quote_value(self, value):
+        if isinstance(value, str):
+            return "'%s'" % value.replace("'", "''")
+        return str(value)
+
+
+class TestDatabaseSchemaEditorStatistics(TestDatabaseSchemaEditor):
+    gather_statistics = True
+    invisible_indexes = True
+    statistics_options = {
+        'estimate_percent': 10,
+        'degree': 4,
+        'cascade': True,
+    }
+
+
+class TestCursor:
+    """
+    Cursor returning the rows registered for each executed query
+    """
+
+    def __init__(self, results):
+        self.results = results
+        self.executed = []
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        self._rows = self.results.get(sql, [])
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class DictionaryDatabaseIntrospection(BaseDatabaseIntrospection):
+    """
+    Introspection reading tables and relations from class attributes
+    """
+
+    table_list = [
+        TableInfo('TBL_CUSTOMER', 't'),
+        TableInfo('TBL_ORDER', 't'),
+        TableInfo('LEGACY', 't'),
+    ]
+    relations = {'TBL_ORDER': {'customer_id': ('id', 'TBL_CUSTOMER')}}
+
+    def get_table_list(self, cursor):
+        return list(self.table_list)
+
+    def get_relations(self, cursor, table_name):
+        return dict(self.relations.get(table_name, {}))
+
+    def identifier_converter(self, name):
+        return name.lower()
+
+
+class TestDatabaseIntrospection(
+    DatabaseIntrospection, DictionaryDatabaseIntrospection
+):
+    sql_get_constraints = 'constraints'
+    sql_get_foreign_keys = 'foreign_keys'
+    sql_get_indexes = 'indexes'
+
+    default_db_table_pattern = 'tbl_{table_name}'
 
 
 class TestDatabaseWrapper(DatabaseWrapper):
@@ -1,5 +1,8 @@
 from django.db import models
 
+from db_adapter.indexes import ContextIndex, UpperIndex
+from db_adapter.materialized_views import MaterializedView
+
 
 class DBAdapterModel(models.Model):
     """
@@ -142,3 +145,35 @@ class Circle(DBAdapterModel):
 
     class Meta:
         db_table = 'circle'
+
+
+class Customer(DBAdapterModel):
+    name = models.CharField(max_length=100)
+    email = models.CharField(max_length=100)
+    notes = models.TextField(null=True)
+    score = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'tbl_customer'
+        indexes = [
+            UpperIndex(fields=['name'], name='tbl_customer_name_upper'),
+            ContextIndex(
+                fields=['notes'],
+                name='tbl_customer_notes_ctx',
+                sync='EVERY "SYSDATE+1/24"',
+            ),
+        ]
+
+
+class CustomerReport(DBAdapterModel):
+    name = models.CharField(max_length=100, primary_key=True)
+    total = models.IntegerField(help_text='Number of customers')
+
+    class Meta:
+        db_table = 'tbl_customer_report'
+        materialized_view = MaterializedView(
+            query=(
+                'SELECT name, COUNT(*) AS total FROM tbl_customer GROUP BY name'
+            ),
+            base_tables=['tests.Customer'],
+        )
@@ -0,0 +1,211 @@
+"""
+Stub backend executing statements on recording cursors instead of a database,
+so that code opening connections of its own (like worker threads) runs as is.
+
+Each thread gets its own connection of the alias, while the statements of all
+connections are recorded by the `Recording` of the alias settings. Driver
+options (`OPTIONS`) simulate an unreachable database (`unreachable`), slow
+connections (`delay`) or failing statements (`fail_on`).
+"""
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import connections, utils as Database
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.base.introspection import TableInfo
+from django.db.backends.dummy.features import DummyDatabaseFeatures
+from django.db.backends.sqlite3.base import (
+    DatabaseWrapper as SQLiteDatabaseWrapper,
+)
+
+from tests.connection import TestDatabaseIntrospection, TestDatabaseWrapper
+
+CREATE_TABLE = re.compile(r'^\s*CREATE TABLE\s+(\S+)', re.IGNORECASE)
+
+
+class Recording:
+    """
+    Statements executed on the connections of stub databases, tables they
+    created, and connections open at a time
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.statements = []
+        self.tables = set()
+        self.connected = 0
+        self.max_connected = 0
+        self.closed = []
+
+    def connect(self, alias):
+        with self.lock:
+            self.connected += 1
+            self.max_connected = max(self.max_connected, self.connected)
+
+    def close(self, alias):
+        with self.lock:
+            self.connected -= 1
+            self.closed.append(alias)
+
+    def execute(self, alias, sql):
+        with self.lock:
+            self.statements.append((alias, sql))
+            match = CREATE_TABLE.match(sql)
+            if match:
+                self.tables.add(match.group(1).lower())
+
+    def executed(self, alias=None):
+        return [
+            sql
+            for using, sql in self.statements
+            if alias is None or using == alias
+        ]
+
+
+class StubCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 0
+        self.lastrowid = None
+        self.description = None
+
+    def execute(self, sql, params=None):
+        self.connection.execute(sql)
+
+    def executemany(self, sql, param_list):
+        for params in param_list:
+            self.execute(sql, params)
+
+    def fetchone(self):
+        return None
+
+    def fetchmany(self, size=None):
+        return []
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class StubConnection:
+    """
+    Driver connection of a stub database
+    """
+
+    def __init__(self, wrapper, fail_on=()):
+        self.wrapper = wrapper
+        self.fail_on = fail_on
+        self.last_id = 0
+
+    def execute(self, sql):
+        if sql in self.fail_on:
+            raise Database.DatabaseError(
+                'ORA-00955: name is already used by an existing object'
+            )
+        self.wrapper.recording.execute(self.wrapper.alias, sql)
+
+    def cursor(self):
+        cursor = StubCursor(self)
+        self.last_id += 1
+        cursor.lastrowid = self.last_id
+        return cursor
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.wrapper.recording.close(self.wrapper.alias)
+
+
+class StubDatabaseFeatures(DummyDatabaseFeatures):
+    # Rows inserted one at a time (the operations have no bulk insert)
+    has_bulk_insert = False
+
+
+class StubDatabaseIntrospection(TestDatabaseIntrospection):
+    def get_table_list(self, cursor):
+        return [
+            TableInfo(name, 't')
+            for name in sorted(self.connection.recording.tables)
+        ]
+
+    def get_relations(self, cursor, table_name):
+        return {}
+
+
+class DatabaseWrapper(TestDatabaseWrapper):
+    Database = Database
+    features_class = StubDatabaseFeatures
+    introspection_class = StubDatabaseIntrospection
+    # Lookups of queries (like the ones of post_migrate receivers)
+    operators = SQLiteDatabaseWrapper.operators
+
+    # Actual implementations instead of the ones of the dummy backend
+    _cursor = BaseDatabaseWrapper._cursor
+    _commit = BaseDatabaseWrapper._commit
+    _rollback = BaseDatabaseWrapper._rollback
+    _close = BaseDatabaseWrapper._close
+
+    @property
+    def recording(self):
+        return self.settings_dict['RECORDING']
+
+    def ensure_connection(self):
+        # Not blocked like database access by pytest-django (as the stub
+        # doesn't access any database)
+        if self.connection is None:
+            with self.wrap_database_errors:
+                self.connect()
+
+    def get_connection_params(self):
+        return dict(self.settings_dict['OPTIONS'])
+
+    def get_new_connection(self, conn_params):
+        if conn_params.get('unreachable'):
+            raise Database.OperationalError('ORA-12541: TNS:no listener')
+
+        self.recording.connect(self.alias)
+        time.sleep(conn_params.get('delay', 0))
+        return StubConnection(self, conn_params.get('fail_on', ()))
+
+    def init_connection_state(self):
+        pass
+
+    def create_cursor(self, name=None):
+        return self.connection.cursor()
+
+    def _set_autocommit(self, autocommit):
+        pass
+
+
+@contextmanager
+def stub_databases(recording=None, **databases):
+    """
+    Add stub databases (aliases with their driver options) to the connections
+    within the block, yielding their recording
+
+        with stub_databases(shard_1={}, shard_2={'unreachable': True}) as rec:
+            ...
+    """
+    recording = recording or Recording()
+    for alias, options in databases.items():
+        connections.databases[alias] = {
+            'ENGINE': 'tests.stub_backend',
+            'OPTIONS': options,
+            'RECORDING': recording,
+        }
+    try:
+        yield recording
+    finally:
+        for alias in databases:
+            if hasattr(connections._connections, alias):
+                connections[alias].close()
+                delattr(connections._connections, alias)
+            del connections.databases[alias]
@@ -0,0 +1,215 @@
+import json
+import threading
+import time
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.db.migrations.loader import MigrationLoader
+from django.db.models.signals import post_migrate, pre_migrate
+from django.test import TestCase
+
+from db_adapter.aliases import AliasMigration, run_coroutine
+from tests.stub_backend.base import Recording, stub_databases
+
+
+def stub_aliases(**databases):
+    """
+    Stub databases migrated by the tests: the table of the migration recorder
+    (a model of its own registry, unknown to the name builders) exists
+    """
+    recording = Recording()
+    recording.tables.add('django_migrations')
+    return stub_databases(recording, **databases)
+
+
+class AliasMigrationTests(TestCase):
+    aliases = ['shard_1', 'shard_2', 'shard_3', 'eu']
+
+    def test_run(self):
+        progress = []
+        migration = AliasMigration(
+            self.aliases,
+            concurrency=2,
+            progress=progress.append,
+            app_label='sessions',
+        )
+
+        databases = dict.fromkeys(self.aliases, {'delay': 0.05})
+        with stub_aliases(**databases) as recording:
+            report = run_coroutine(migration.run())
+
+        self.assertEqual([r.alias for r in report.results], self.aliases)
+        self.assertEqual([r.status for r in report.results], ['done'] * 4)
+        self.assertTrue(all(r.duration >= 0.05 for r in report.results))
+        self.assertCountEqual(progress, report.results)
+        for result in report.results:
+            executed = recording.executed(result.alias)
+            self.assertIn(
+                'CREATE INDEX django_session_expire_date_idx '
+                'ON django_session (expire_date)',
+                executed,
+            )
+            # Statements of schema editors (not the ones of the recorder)
+            self.assertEqual(result.statements, 6)
+
+        self.assertEqual(recording.max_connected, 2)
+        self.assertEqual(recording.connected, 0)
+        self.assertCountEqual(recording.closed, self.aliases)
+
+    def test_migrations_loaded_once(self):
+        threads = []
+        load_disk = MigrationLoader.load_disk
+
+        def record_thread(loader):
+            threads.append(threading.current_thread())
+            load_disk(loader)
+
+        migration = AliasMigration(self.aliases, concurrency=4)
+        with patch.object(MigrationLoader, 'load_disk', record_thread):
+            with stub_aliases(**dict.fromkeys(self.aliases, {})) as recording:
+                report = run_coroutine(migration.run())
+
+        self.assertEqual([r.status for r in report.results], ['done'] * 4)
+        self.assertEqual(threads, [threading.current_thread()])
+        # Content types created by the receivers of post_migrate
+        self.assertTrue(
+            any(
+                sql.startswith('INSERT INTO django_content_type')
+                for sql in recording.executed('eu')
+            )
+        )
+
+    def test_serialized_signals(self):
+        lock = threading.Lock()
+        receiving = []
+        max_receiving = []
+
+        def receiver(**kwargs):
+            with lock:
+                receiving.append(kwargs['using'])
+                max_receiving.append(len(receiving))
+            time.sleep(0.01)
+            with lock:
+                receiving.remove(kwargs['using'])
+
+        migration = AliasMigration(
+            self.aliases, concurrency=4, app_label='sessions'
+        )
+        with stub_aliases(**dict.fromkeys(self.aliases, {})):
+            pre_migrate.connect(receiver)
+            post_migrate.connect(receiver)
+            try:
+                run_coroutine(migration.run())
+            finally:
+                pre_migrate.disconnect(receiver)
+                post_migrate.disconnect(receiver)
+
+        # Sent by each app config (with models) for each alias
+        self.assertTrue(max_receiving)
+        self.assertEqual(max(max_receiving), 1)
+
+    def test_continue(self):
+        migration = AliasMigration(
+            self.aliases, concurrency=1, app_label='sessions'
+        )
+
+        databases = dict.fromkeys(self.aliases, {})
+        databases['shard_2'] = {'unreachable': True}
+        with stub_aliases(**databases) as recording:
+            with self.assertLogs('django.db.backends.schema', 'ERROR'):
+                report = run_coroutine(migration.run())
+
+        self.assertEqual(
+            [r.status for r in report.results],
+            ['done', 'failed', 'done', 'done'],
+        )
+        self.assertEqual(report.failed, [report.results[1]])
+        self.assertIn('ORA-12541', str(report.results[1].error))
+        self.assertEqual(recording.executed('shard_2'), [])
+
+    def test_fail_fast(self):
+        migration = AliasMigration(
+            self.aliases, concurrency=1, fail_fast=True, app_label='sessions'
+        )
+
+        databases = dict.fromkeys(self.aliases, {})
+        databases['shard_2'] = {'unreachable': True}
+        with stub_aliases(**databases) as recording:
+            with self.assertLogs('django.db.backends.schema', 'ERROR'):
+                report = run_coroutine(migration.run())
+
+        self.assertEqual(
+            [r.status for r in report.results],
+            ['done', 'failed', 'skipped', 'skipped'],
+        )
+        # The unreachable database never connected
+        self.assertEqual(recording.closed, ['shard_1'])
+        self.assertEqual(recording.executed('shard_3'), [])
+
+    def test_app_without_migrations(self):
+        migration = AliasMigration(['shard_1'], app_label='tests')
+
+        with stub_aliases(shard_1={}):
+            with self.assertRaisesMessage(LookupError, "App 'tests'"):
+                run_coroutine(migration.run())
+
+    def test_report(self):
+        migration = AliasMigration(['shard_1', 'shard_2'], app_label='sessions')
+        with stub_aliases(shard_1={}, shard_2={'unreachable': True}):
+            with self.assertLogs('django.db.backends.schema', 'ERROR'):
+                report = run_coroutine(migration.run())
+
+        table = report.as_table()
+        self.assertIn('2 aliases in', table)
+        self.assertIn('1 failed, 0 skipped', table)
+        self.assertIn('ORA-12541: TNS:no listener', table)
+
+        data = json.loads(report.as_json())
+        self.assertEqual(
+            [(a['alias'], a['status']) for a in data['aliases']],
+            [('shard_1', 'done'), ('shard_2', 'failed')],
+        )
+        self.assertEqual(data['failed'], 1)
+
+
+class MigrateAliasesCommandTests(TestCase):
+    def test_migratealiases(self):
+        out = StringIO()
+        with stub_aliases(shard_1={}, shard_2={}) as recording:
+            call_command(
+                'migratealiases',
+                'shard_1',
+                'shard_2',
+                app_label='sessions',
+                report='json',
+                stdout=out,
+            )
+
+        self.assertIn('shard_1: migrated in', out.getvalue())
+        self.assertIn('"statements": 6', out.getvalue())
+        self.assertCountEqual(recording.closed, ['shard_1', 'shard_2'])
+
+    def test_failed(self):
+        err = StringIO()
+        with stub_aliases(shard_1={'unreachable': True}):
+            with self.assertLogs('django.db.backends.schema', 'ERROR'):
+                with self.assertRaisesMessage(CommandError, '1 of 1 databases'):
+                    call_command(
+                        'migratealiases',
+                        'shard_1',
+                        app_label='sessions',
+                        stdout=StringIO(),
+                        stderr=err,
+                    )
+
+        self.assertIn('shard_1: failed: ORA-12541', err.getvalue())
+
+    def test_app_without_migrations(self):
+        with stub_aliases(shard_1={}):
+            with self.assertRaisesMessage(CommandError, "App 'tests'"):
+                call_command('migratealiases', 'shard_1', app_label='tests')
+
+    def test_unknown_database(self):
+        with self.assertRaisesMessage(CommandError, 'shard_9'):
+            call_command('migratealiases', 'default', 'shard_9')
@@ -0,0 +1,265 @@
+from unittest.mock import patch
+
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.test import TestCase
+
+from db_adapter.db.backends.base.introspection import DatabaseIntrospection
+from tests.connection import (
+    TestCursor,
+    TestDatabaseIntrospection,
+    TestDatabaseSchemaEditor,
+    test_connection,
+)
+from tests.models import Customer
+
+DICTIONARY = {
+    'constraints': [
+        ('TBL_CUSTOMER', 'TBL_CUSTOMER_ID_PK', 'id', 1, 1, 0),
+        ('TBL_CUSTOMER', 'TBL_CUSTOMER_SCORE_GTE', 'score', 0, 0, 1),
+        ('TBL_ORDER', 'TBL_ORDER_ID_PK', 'id', 1, 1, 0),
+    ],
+    'foreign_keys': [
+        (
+            'TBL_ORDER',
+            'TBL_ORDER_CUSTOMER_ID_FK',
+            'customer_id',
+            'tbl_customer',
+            'id',
+        ),
+    ],
+    'indexes': [
+        ('TBL_CUSTOMER', 'TBL_CUSTOMER_NAME_IDX', 'normal', 'name', 'ASC'),
+        (
+            'TBL_ORDER',
+            'TBL_ORDER_CREATED_IDX',
+            'normal',
+            'created,customer_id',
+            'DESC,ASC',
+        ),
+    ],
+}
+
+
+class SchemaConstraintsTests(TestCase):
+    def setUp(self):
+        self.introspection = TestDatabaseIntrospection(test_connection)
+        self.cursor = TestCursor(DICTIONARY)
+
+    def test_get_constraints(self):
+        constraints = self.introspection.get_constraints(
+            self.cursor, 'TBL_ORDER'
+        )
+
+        self.assertEqual(
+            constraints,
+            {
+                'tbl_order_id_pk': {
+                    'columns': ['id'],
+                    'primary_key': 1,
+                    'unique': 1,
+                    'foreign_key': None,
+                    'check': 0,
+                    'index': 1,
+                },
+                'tbl_order_customer_id_fk': {
+                    'columns': ['customer_id'],
+                    'primary_key': False,
+                    'unique': False,
+                    'foreign_key': ('tbl_customer', 'id'),
+                    'check': False,
+                    'index': False,
+                },
+                'tbl_order_created_idx': {
+                    'columns': ['created', 'customer_id'],
+                    'primary_key': False,
+                    'unique': False,
+                    'foreign_key': None,
+                    'check': False,
+                    'index': True,
+                    'type': 'idx',
+                    'orders': ['DESC', 'ASC'],
+                },
+            },
+        )
+
+    def test_schema_loaded_once(self):
+        with self.introspection.cache_constraints():
+            self.introspection.get_constraints(self.cursor, 'TBL_CUSTOMER')
+            self.introspection.get_constraints(self.cursor, 'TBL_ORDER')
+            self.introspection.get_constraints(self.cursor, 'LEGACY')
+
+        self.assertEqual(
+            self.cursor.executed,
+            [
+                ('constraints', [None]),
+                ('foreign_keys', [None]),
+                ('indexes', [None]),
+            ],
+        )
+
+    def test_schema_loaded_by_owner(self):
+        with self.introspection.cache_constraints():
+            self.introspection.get_constraints(self.cursor, 'NS"."TBL_ORDER')
+            self.introspection.get_constraints(self.cursor, 'TBL_ORDER')
+
+        self.assertEqual(
+            [params for _, params in self.cursor.executed],
+            [['NS'], ['NS'], ['NS'], [None], [None], [None]],
+        )
+
+    def test_clear_cache(self):
+        with self.introspection.cache_constraints():
+            self.introspection.get_constraints(self.cursor, 'TBL_ORDER')
+            self.introspection.clear_cache()
+            self.introspection.get_constraints(self.cursor, 'TBL_ORDER')
+
+        self.assertEqual(len(self.cursor.executed), 6)
+
+    def test_not_cached_outside_of_blocks(self):
+        self.introspection.get_constraints(self.cursor, 'TBL_ORDER')
+        with self.introspection.cache_constraints():
+            with self.introspection.cache_constraints():
+                self.introspection.get_constraints(self.cursor, 'TBL_ORDER')
+            # Nested blocks share the cache of the outermost one
+            self.introspection.get_constraints(self.cursor, 'TBL_ORDER')
+        self.introspection.get_constraints(self.cursor, 'TBL_ORDER')
+
+        self.assertEqual(len(self.cursor.executed), 9)
+
+    @patch.object(BaseDatabaseSchemaEditor, 'execute')
+    def test_cached_for_the_life_of_editors(self, execute):
+        with patch.object(test_connection, 'introspection', self.introspection):
+            with TestDatabaseSchemaEditor(test_connection):
+                self.introspection.get_constraints(self.cursor, 'TBL_ORDER')
+                self.introspection.get_constraints(self.cursor, 'TBL_ORDER')
+            self.introspection.get_constraints(self.cursor, 'TBL_ORDER')
+
+        self.assertEqual(len(self.cursor.executed), 6)
+
+    @patch.object(BaseDatabaseSchemaEditor, 'execute')
+    def test_cache_cleared_by_executed_statements(self, execute):
+        with self.introspection.cache_constraints():
+            self.introspection.get_constraints(self.cursor, 'TBL_ORDER')
+
+            with patch.object(
+                test_connection, 'introspection', self.introspection
+            ):
+                editor = TestDatabaseSchemaEditor(test_connection)
+                editor.execute('DROP INDEX tbl_order_created_idx')
+            self.introspection.get_constraints(self.cursor, 'TBL_ORDER')
+
+        self.assertEqual(len(self.cursor.executed), 6)
+
+    def test_null_column_lists(self):
+        cursor = TestCursor(
+            {
+                'constraints': [('TBL_ORDER', 'SYS_C0012', None, 0, 0, 1)],
+                'foreign_keys': [],
+                'indexes': [
+                    ('TBL_ORDER', 'TBL_ORDER_IDX', 'normal', None, None)
+                ],
+            }
+        )
+        constraints = self.introspection.get_constraints(cursor, 'TBL_ORDER')
+
+        self.assertEqual(constraints['sys_c0012']['columns'], [])
+        self.assertEqual(constraints['tbl_order_idx']['columns'], [])
+        self.assertEqual(constraints['tbl_order_idx']['orders'], [])
+
+    def test_table_name_converter_fallback(self):
+        class LegacyIntrospection:
+            def table_name_converter(self, name):
+                return name.lower()
+
+        class Introspection(DatabaseIntrospection, LegacyIntrospection):
+            pass
+
+        self.assertEqual(
+            Introspection().identifier_converter('TBL_ORDER'), 'tbl_order'
+        )
+
+    def test_returned_constraints_are_copies(self):
+        constraints = self.introspection.get_constraints(
+            self.cursor, 'TBL_ORDER'
+        )
+        constraints.clear()
+
+        self.assertEqual(
+            len(self.introspection.get_constraints(self.cursor, 'TBL_ORDER')),
+            3,
+        )
+
+
+class PatternReversalTests(TestCase):
+    def setUp(self):
+        self.introspection = TestDatabaseIntrospection(test_connection)
+        self.cursor = TestCursor(DICTIONARY)
+
+    def test_get_model_table_name(self):
+        get_model_table_name = self.introspection.get_model_table_name
+
+        self.assertEqual(get_model_table_name('TBL_CUSTOMER'), 'CUSTOMER')
+        self.assertEqual(get_model_table_name('NS"."TBL_ORDER'), 'ORDER')
+        self.assertEqual(get_model_table_name('LEGACY'), 'LEGACY')
+
+    def test_get_model(self):
+        self.assertIs(self.introspection.get_model('TBL_CUSTOMER'), Customer)
+        self.assertIsNone(self.introspection.get_model('LEGACY'))
+
+    def test_parse_object_name(self):
+        self.assertEqual(
+            self.introspection.parse_object_name('LEGACY_ID_PK', 'primary_key'),
+            {'table': 'legacy', 'columns': 'id'},
+        )
+        self.assertIsNone(
+            self.introspection.parse_object_name('SYS_C0012', 'primary_key')
+        )
+
+    def test_parse_object_name_with_known_parts(self):
+        self.assertEqual(
+            self.introspection.parse_object_name(
+                'TBL_CUSTOMER_NAME_UPPER_IDX',
+                'index',
+                table='TBL_CUSTOMER',
+                columns=['name'],
+            ),
+            {'qualifier': '_upper'},
+        )
+
+    def test_table_list_is_untouched_by_default(self):
+        table_names = [
+            info.name for info in self.introspection.get_table_list(None)
+        ]
+
+        self.assertEqual(table_names, ['TBL_CUSTOMER', 'TBL_ORDER', 'LEGACY'])
+
+    def test_reverse_table_patterns(self):
+        with self.introspection.reverse_table_patterns():
+            table_names = [
+                info.name for info in self.introspection.get_table_list(None)
+            ]
+            relations = self.introspection.get_relations(None, 'ORDER')
+            constraints = self.introspection.get_constraints(
+                self.cursor, 'CUSTOMER'
+            )
+
+        self.assertEqual(table_names, ['CUSTOMER', 'ORDER', 'LEGACY'])
+        self.assertEqual(relations, {'customer_id': ('id', 'CUSTOMER')})
+        self.assertEqual(
+            list(constraints),
+            [
+                'tbl_customer_id_pk',
+                'tbl_customer_score_gte',
+                'tbl_customer_name_idx',
+            ],
+        )
+
+    def test_reverse_table_patterns_without_transform(self):
+        self.introspection.enable_transform_db_table = False
+
+        with self.introspection.reverse_table_patterns():
+            table_names = [
+                info.name for info in self.introspection.get_table_list(None)
+            ]
+
+        self.assertEqual(table_names, ['TBL_CUSTOMER', 'TBL_ORDER', 'LEGACY'])
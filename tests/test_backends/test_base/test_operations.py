@@ -138,6 +138,27 @@ class FormatSqlTests(TestCase):
             "is 'Lorem ipsum';",
         )
 
+    def test_format_sql_unquote_option_parameters(self):
+        ops = TestDatabaseOperations(test_connection)
+        sql = (
+            'CREATE INDEX "tbl_customer_notes_ctx_idx" ON "tbl_customer" '
+            '("notes") INDEXTYPE IS CTXSYS.CONTEXT '
+            'PARAMETERS (\'SYNC (EVERY "SYSDATE+1/24")\')'
+        )
+
+        self.assertEqual(
+            ops.format_sql(sql, unquote=True),
+            'CREATE INDEX tbl_customer_notes_ctx_idx ON tbl_customer '
+            '(notes) INDEXTYPE IS CTXSYS.CONTEXT '
+            'PARAMETERS (\'SYNC (EVERY "SYSDATE+1/24")\')',
+        )
+        # Statements of PL/SQL blocks
+        block = "EXECUTE IMMEDIATE '%s'" % sql.replace("'", "''")
+        self.assertIn(
+            'PARAMETERS (\'\'SYNC (EVERY "SYSDATE+1/24")\'\')',
+            ops.format_sql(block, unquote=True),
+        )
+
     def test_format_sql_identifier_case_option(self):
         ops = TestDatabaseOperations(test_connection)
 
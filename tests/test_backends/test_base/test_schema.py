@@ -1,16 +1,42 @@
+import copy
 import json
+from unittest import skipIf
 from unittest.mock import patch
 
+import django
+from django.apps.registry import Apps
 from django.db.backends.base.schema import BaseDatabaseSchemaEditor
-from django.test import TestCase
-
+from django.db.migrations.state import ModelState
+from django.db.models import Index
+from django.db.utils import DatabaseError
+from django.test import TestCase, override_settings
+
+from db_adapter.bulk_load import BulkLoad
+from db_adapter.indexes import UpperIndex
+from db_adapter.materialized_views import MaterializedView
 from tests.connection import (
     TestDatabaseSchemaEditor,
+    TestDatabaseSchemaEditorStatistics,
     test_connection,
     test_control_connection,
     test_format_connetion,
 )
-from tests.models import Article, Author, Person, Post, Square, Tag
+from tests.models import (
+    Article,
+    Author,
+    Customer,
+    CustomerReport,
+    Person,
+    Post,
+    Square,
+    Tag,
+)
+
+# Django 1.11 alters NULL columns and creates `Meta.indexes` without the schema
+# editor hooks of Django 2.0 (`_alter_column_null_sql` and `_create_index_sql`)
+requires_django_2 = skipIf(
+    django.VERSION < (2, 0), 'Django 1.11 has no schema editor hook'
+)
 
 
 def enforce_str_values(data: dict) -> dict:
@@ -81,6 +107,47 @@ class SqlObjectCreationTests(TestCase):
             ),
         )
 
+    def test_create_function_index_sql(self):
+        model = Customer
+        field = Customer._meta.get_field('name')
+        sql = self.editor._create_function_index_sql(
+            model, [field], function='UPPER', qualifier='_upper'
+        )
+
+        self.assertEqual(
+            str(sql),
+            (
+                'CREATE INDEX tbl_customer_name_upper_idx '
+                'ON tbl_customer (UPPER(name))'
+            ),
+        )
+
+    def test_upper_index_descending_fields(self):
+        index = UpperIndex(fields=['-name', 'email'], name='customer_upper')
+
+        self.assertEqual(
+            str(index.create_sql(Customer, self.editor)),
+            'CREATE INDEX tbl_customer_name_email_upper_idx '
+            'ON tbl_customer (UPPER(name) DESC, UPPER(email))',
+        )
+
+    def test_create_context_index_sql(self):
+        model = Customer
+        field = Customer._meta.get_field('notes')
+        sql = self.editor._create_context_index_sql(
+            model, [field], sync="EVERY 'SYSDATE+1'", qualifier='_ctx'
+        )
+
+        self.assertEqual(
+            str(sql),
+            (
+                'CREATE INDEX tbl_customer_notes_ctx_idx '
+                'ON tbl_customer (notes) '
+                'INDEXTYPE IS CTXSYS.CONTEXT '
+                "PARAMETERS ('SYNC (EVERY ''SYSDATE+1'')')"
+            ),
+        )
+
 
 class SqlColumnTests(TestCase):
     def test_column_sql_for_null_field(self):
@@ -309,6 +376,23 @@ class SqlTableTests(TestCase):
             ],
         )
 
+    def test_table_sql_with_upper_index(self):
+        editor = TestDatabaseSchemaEditor(test_connection)
+
+        editor.table_sql(Customer)
+        table_sql = enforce_str_values(editor.deferred_table_sql)
+        self.assertEqual(
+            table_sql['INDEX'],
+            [
+                'CREATE INDEX tbl_customer_name_upper_idx '
+                'ON tbl_customer (UPPER(name))',
+                'CREATE INDEX tbl_customer_notes_ctx_idx '
+                'ON tbl_customer (notes) '
+                'INDEXTYPE IS CTXSYS.CONTEXT '
+                'PARAMETERS (\'SYNC (EVERY "SYSDATE+1/24")\')',
+            ],
+        )
+
     def test_table_sql_with_grant(self):
         editor = TestDatabaseSchemaEditor(test_control_connection)
 
@@ -414,6 +498,16 @@ WHEN (new.article_id IS NULL)
             ],
         )
 
+    def test_create_models_without_repeated_deferred_sql(self):
+        with TestDatabaseSchemaEditor(
+            test_connection, collect_sql=True
+        ) as editor:
+            editor.create_model(Author)
+            editor.create_model(Person)
+
+        self.assertEqual(len(editor.collected_sql), 14)
+        self.assertEqual(len(set(editor.collected_sql)), 14)
+
     def test_create_model_with_grant(self):
         with TestDatabaseSchemaEditor(
             test_control_connection, collect_sql=True
@@ -433,6 +527,386 @@ WHEN (new.article_id IS NULL)
         )
 
 
+class SqlFieldTests(TestCase):
+    def test_add_field(self):
+        with TestDatabaseSchemaEditor(
+            test_connection, collect_sql=True
+        ) as editor:
+            editor.add_field(Customer, Customer._meta.get_field('score'))
+
+        self.assertEqual(
+            editor.collected_sql,
+            [
+                (
+                    'ALTER TABLE tbl_customer ADD COLUMN score NUMBER(11) '
+                    'DEFAULT 0 CONSTRAINT tbl_customer_score_nn_check NOT NULL;'
+                ),
+                'ALTER TABLE tbl_customer ALTER COLUMN score DROP DEFAULT;',
+                (
+                    'ALTER TABLE tbl_customer '
+                    'ADD CONSTRAINT tbl_customer_score_gte_check '
+                    'CHECK (score >= 0);'
+                ),
+            ],
+        )
+
+    def test_add_nullable_fk_field(self):
+        with TestDatabaseSchemaEditor(
+            test_connection, collect_sql=True
+        ) as editor:
+            editor.add_field(Post, Post._meta.get_field('tag'))
+
+        self.assertEqual(
+            editor.collected_sql,
+            [
+                'ALTER TABLE tbl_post ADD COLUMN tag NVARCHAR2(100) NULL;',
+                (
+                    'ALTER TABLE tbl_post '
+                    'ADD CONSTRAINT tbl_post_tag_fk '
+                    'FOREIGN KEY (tag) '
+                    'REFERENCES tbl_tag (name) DEFERRABLE INITIALLY DEFERRED;'
+                ),
+                'CREATE INDEX tbl_post_tag_idx ON tbl_post (tag);',
+            ],
+        )
+
+    @requires_django_2
+    def test_alter_field_to_not_null(self):
+        old_field = Post._meta.get_field('name')
+        new_field = copy.deepcopy(old_field)
+        new_field.null = False
+
+        with TestDatabaseSchemaEditor(
+            test_connection, collect_sql=True
+        ) as editor:
+            editor.alter_field(Post, old_field, new_field)
+
+        self.assertEqual(
+            editor.collected_sql,
+            [
+                'ALTER TABLE tbl_post '
+                'ADD CONSTRAINT tbl_post_name_nn_check '
+                'CHECK (name IS NOT NULL) ENABLE NOVALIDATE;',
+                'ALTER TABLE tbl_post '
+                'MODIFY CONSTRAINT tbl_post_name_nn_check VALIDATE;',
+            ],
+        )
+
+    @requires_django_2
+    def test_alter_field_to_null(self):
+        old_field = Post._meta.get_field('text')
+        new_field = copy.deepcopy(old_field)
+        new_field.null = True
+
+        with TestDatabaseSchemaEditor(
+            test_connection, collect_sql=True
+        ) as editor:
+            editor.alter_field(Post, old_field, new_field)
+
+        self.assertEqual(
+            editor.collected_sql,
+            ['ALTER TABLE tbl_post DROP CONSTRAINT tbl_post_text_nn_check;'],
+        )
+
+
+class ConstraintNamesTests(TestCase):
+    def setUp(self):
+        self.editor = TestDatabaseSchemaEditor(test_connection)
+
+    @patch.object(BaseDatabaseSchemaEditor, '_constraint_names')
+    def test_constraint_names_from_patterns(self, mocked_constraint_names):
+        editor = self.editor
+
+        self.assertEqual(
+            editor._constraint_names(Post, ['tag'], foreign_key=True),
+            ['tbl_post_tag_fk'],
+        )
+        self.assertEqual(
+            editor._constraint_names(Post, primary_key=True),
+            ['tbl_post_id_pk'],
+        )
+        self.assertEqual(
+            editor._constraint_names(
+                Tag, ['flag'], unique=True, primary_key=False
+            ),
+            ['tbl_tag_flag_uniq'],
+        )
+        self.assertEqual(
+            editor._constraint_names(Post, ['tag'], index=True, type_='idx'),
+            ['tbl_post_tag_idx'],
+        )
+        self.assertEqual(
+            editor._constraint_names(Square, ['side'], check=True),
+            ['tbl_square_side_gte_check'],
+        )
+        self.assertFalse(mocked_constraint_names.called)
+
+    @patch.object(BaseDatabaseSchemaEditor, '_constraint_names')
+    def test_constraint_names_exclude(self, mocked_constraint_names):
+        names = self.editor._constraint_names(
+            Post, ['tag'], index=True, exclude=['"TBL_POST_TAG_IDX"']
+        )
+
+        self.assertEqual(names, [])
+        self.assertFalse(mocked_constraint_names.called)
+
+    @patch.object(
+        BaseDatabaseSchemaEditor, '_constraint_names', return_value=['C1']
+    )
+    def test_unresolved_constraint_names(self, mocked_constraint_names):
+        names = self.editor._constraint_names(Post, ['text'], check=True)
+
+        self.assertEqual(names, ['C1'])
+        self.assertTrue(mocked_constraint_names.called)
+
+    @patch.object(
+        BaseDatabaseSchemaEditor,
+        '_constraint_names',
+        return_value=['TBL_POST_TAG_FK'],
+    )
+    def test_validate_constraint_names(self, mocked_constraint_names):
+        self.editor.validate_constraint_names = True
+
+        names = self.editor._constraint_names(Post, ['tag'], foreign_key=True)
+        self.assertEqual(names, ['tbl_post_tag_fk'])
+
+        mocked_constraint_names.return_value = ['SYS_C0012345']
+        with self.assertLogs('django.db.backends.schema', 'WARNING'):
+            names = self.editor._constraint_names(
+                Post, ['tag'], foreign_key=True
+            )
+        self.assertEqual(names, ['SYS_C0012345'])
+
+    @patch.object(BaseDatabaseSchemaEditor, '_constraint_names')
+    def test_remove_field(self, mocked_constraint_names):
+        with TestDatabaseSchemaEditor(
+            test_connection, collect_sql=True
+        ) as editor:
+            editor.remove_field(Post, Post._meta.get_field('tag'))
+
+        self.assertEqual(
+            editor.collected_sql,
+            [
+                'ALTER TABLE tbl_post DROP CONSTRAINT tbl_post_tag_fk;',
+                'ALTER TABLE tbl_post DROP COLUMN tag CASCADE;',
+            ],
+        )
+        self.assertFalse(mocked_constraint_names.called)
+
+
+class SqlStatisticsTests(TestCase):
+    def test_table_sql_without_statistics(self):
+        editor = TestDatabaseSchemaEditor(test_connection)
+
+        editor.table_sql(Article)
+        table_sql = enforce_str_values(editor.deferred_table_sql)
+        self.assertEqual(table_sql['STATISTICS'], [])
+
+    def test_table_sql_with_statistics(self):
+        editor = TestDatabaseSchemaEditorStatistics(test_connection)
+
+        editor.table_sql(Customer)
+        table_sql = enforce_str_values(editor.deferred_table_sql)
+        self.assertEqual(
+            table_sql['STATISTICS'],
+            [
+                "BEGIN DBMS_STATS.GATHER_TABLE_STATS(ownname => USER, "
+                "tabname => 'tbl_customer', estimate_percent => 10, "
+                "degree => 4, cascade => TRUE);END;",
+            ],
+        )
+        self.assertEqual(
+            table_sql['INDEX'],
+            [
+                'CREATE INDEX tbl_customer_name_upper_idx '
+                'ON tbl_customer (UPPER(name)) INVISIBLE',
+                'CREATE INDEX tbl_customer_notes_ctx_idx '
+                'ON tbl_customer (notes) '
+                'INDEXTYPE IS CTXSYS.CONTEXT '
+                'PARAMETERS (\'SYNC (EVERY "SYSDATE+1/24")\')',
+            ],
+        )
+        # Made visible when deferred statements are flushed
+        self.assertEqual(
+            editor.invisible_index_names, ['tbl_customer_name_upper_idx']
+        )
+
+    def test_create_model_with_invisible_indexes(self):
+        with TestDatabaseSchemaEditorStatistics(
+            test_connection, collect_sql=True
+        ) as editor:
+            editor.create_model(Article)
+
+        # Indexes are made visible after statistics are gathered, on the
+        # STATISTICS step
+        self.assertIn(
+            'CREATE INDEX tbl_article_tag_idx ON tbl_article (tag) INVISIBLE;',
+            editor.collected_sql,
+        )
+        gather_sql, visible_sql = editor.collected_sql[-2:]
+        self.assertTrue(gather_sql.startswith('BEGIN DBMS_STATS'))
+        self.assertTrue(gather_sql.endswith('END;'))
+        self.assertEqual(
+            visible_sql, 'ALTER INDEX tbl_article_tag_idx VISIBLE;'
+        )
+        self.assertEqual(editor.invisible_index_names, [])
+
+    @requires_django_2
+    def test_add_index_with_invisible_indexes(self):
+        index = Index(fields=['tag'], name='tbl_article_tag2_idx')
+        with TestDatabaseSchemaEditorStatistics(
+            test_connection, collect_sql=True
+        ) as editor:
+            editor.add_index(Article, index)
+
+        self.assertEqual(
+            editor.collected_sql,
+            [
+                'CREATE INDEX tbl_article_tag2_idx '
+                'ON tbl_article (tag) INVISIBLE;',
+                'ALTER INDEX tbl_article_tag2_idx VISIBLE;',
+            ],
+        )
+
+    @patch.object(BaseDatabaseSchemaEditor, 'execute')
+    def test_create_model_during_bulk_load(self, execute):
+        load = test_connection.bulk_load = BulkLoad(test_connection, steps=[])
+        try:
+            with TestDatabaseSchemaEditorStatistics(test_connection) as editor:
+                editor.create_model(Article)
+        finally:
+            test_connection.bulk_load = None
+
+        executed = [str(call[0][0]) for call in execute.call_args_list]
+        self.assertFalse(any('DBMS_STATS' in sql for sql in executed))
+        self.assertEqual(len(load.statements['STATISTICS']), 2)
+
+        execute.reset_mock()
+        with patch.object(
+            type(test_connection),
+            'schema_editor',
+            lambda connection, **kwargs: TestDatabaseSchemaEditorStatistics(
+                connection, **kwargs
+            ),
+        ):
+            load.apply()
+
+        gather_sql, visible_sql = [
+            str(call[0][0]) for call in execute.call_args_list
+        ]
+        self.assertTrue(gather_sql.startswith('BEGIN DBMS_STATS'))
+        self.assertEqual(visible_sql, 'ALTER INDEX tbl_article_tag_idx VISIBLE')
+
+    def test_update_statistics(self):
+        editor = TestDatabaseSchemaEditorStatistics(
+            test_connection, collect_sql=True
+        )
+        editor.update_statistics(Post)
+
+        self.assertEqual(len(editor.collected_sql), 3)
+        _, *visible_sql = editor.collected_sql
+        self.assertEqual(
+            visible_sql,
+            [
+                'ALTER INDEX tbl_post_written_by_idx VISIBLE;',
+                'ALTER INDEX tbl_post_tag_idx VISIBLE;',
+            ],
+        )
+
+    def test_statements_order_without_new_steps(self):
+        order = [
+            'PRIMARY_KEY',
+            'UNIQUE',
+            'FOREIGN_KEY',
+            'CHECK',
+            'INDEX',
+            'COMMENT',
+            'CONTROL',
+            'AUTOINCREMENT',
+        ]
+        with override_settings(DB_ADAPTER={'SQL_STATEMENTS_ORDER': order}):
+            with TestDatabaseSchemaEditor(
+                test_connection, collect_sql=True
+            ) as editor:
+                editor.create_model(Article)
+                editor.create_model(CustomerReport)
+
+        # Steps missing from the setting run last
+        self.assertTrue(
+            editor.collected_sql[-1].startswith(
+                'CREATE MATERIALIZED VIEW tbl_customer_report'
+            )
+        )
+
+
+class SqlMaterializedViewTests(TestCase):
+    def test_create_model(self):
+        with TestDatabaseSchemaEditor(
+            test_control_connection, collect_sql=True
+        ) as editor:
+            editor.create_model(CustomerReport)
+
+        self.assertEqual(
+            editor.collected_sql,
+            [
+                (
+                    'CREATE MATERIALIZED VIEW LOG ON tbl_customer '
+                    'WITH PRIMARY KEY, ROWID INCLUDING NEW VALUES;'
+                ),
+                (
+                    'CREATE MATERIALIZED VIEW tbl_customer_report '
+                    'BUILD IMMEDIATE REFRESH FAST ON COMMIT AS '
+                    'SELECT name, COUNT(*) AS total '
+                    'FROM tbl_customer GROUP BY name;'
+                ),
+                (
+                    'COMMENT ON COLUMN tbl_customer_report.total '
+                    "IS 'Number of customers';"
+                ),
+                'GRANT SELECT ON tbl_customer_report TO rl_tests;',
+            ],
+        )
+
+    def test_materialized_view_log_created_once(self):
+        editor = TestDatabaseSchemaEditor(test_connection)
+
+        editor.materialized_view_sql(CustomerReport)
+        editor.materialized_view_sql(CustomerReport)
+
+        table_sql = enforce_str_values(editor.deferred_table_sql)
+        self.assertEqual(len(table_sql['MATERIALIZED_VIEW_LOG']), 1)
+
+    def test_model_state(self):
+        state = ModelState.from_model(CustomerReport)
+
+        self.assertEqual(
+            state.options['materialized_view'],
+            CustomerReport._meta.materialized_view,
+        )
+        self.assertTrue(state.render(Apps())._meta.materialized_view)
+
+    def test_scheduled_refresh(self):
+        view = MaterializedView(
+            query='SELECT 1 FROM dual', refresh='COMPLETE', next='SYSDATE + 1'
+        )
+
+        self.assertEqual(
+            view.refresh_sql(),
+            'COMPLETE START WITH SYSDATE NEXT SYSDATE + 1',
+        )
+
+    def test_delete_model(self):
+        with TestDatabaseSchemaEditor(
+            test_connection, collect_sql=True
+        ) as editor:
+            editor.delete_model(CustomerReport)
+
+        self.assertEqual(
+            editor.collected_sql,
+            ['DROP MATERIALIZED VIEW tbl_customer_report;'],
+        )
+
+
 class BaseSchemaEditorTests(TestCase):
     @patch.object(BaseDatabaseSchemaEditor, 'execute', retrun_value=None)
     def test_super_execute_called_with_formatted_sql(self, mocked_execute):
@@ -444,3 +918,408 @@ class BaseSchemaEditorTests(TestCase):
 
         formatted_sql = 'CREATE TABLE TBL_PERSON (NAME NVARCHAR(255))'
         mocked_execute.assert_called_once_with(formatted_sql, ())
+
+
+class SqlBatchTests(TestCase):
+    def setUp(self):
+        self.executed = []
+
+        def execute(editor, sql, params=()):
+            if getattr(self, 'error', None) and 'EXECUTE IMMEDIATE' in sql:
+                raise self.error
+            self.executed.append(sql)
+
+        patcher = patch.object(BaseDatabaseSchemaEditor, 'execute', execute)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.editor = TestDatabaseSchemaEditor(test_connection)
+        self.editor.sql_batch_size = 3
+
+    def test_batch_deferred_sql(self):
+        with self.editor as editor:
+            editor.create_model(Post)
+
+        create_table, primary_key, *blocks = self.executed
+        self.assertTrue(create_table.startswith('CREATE TABLE tbl_post'))
+
+        # By step of SQL_STATEMENTS_ORDER: the primary key runs alone, then
+        # foreign keys, checks and indexes by block, sequence and trigger
+        self.assertEqual(
+            primary_key,
+            'ALTER TABLE tbl_post ADD CONSTRAINT tbl_post_id_pk '
+            'PRIMARY KEY (id)',
+        )
+        self.assertEqual(len(blocks), 5)
+        self.assertEqual(
+            blocks[0],
+            'DECLARE i PLS_INTEGER := 0; BEGIN '
+            "i := 1; EXECUTE IMMEDIATE 'ALTER TABLE tbl_post "
+            'ADD CONSTRAINT tbl_post_written_by_fk FOREIGN KEY (written_by) '
+            "REFERENCES tbl_author (id) DEFERRABLE INITIALLY DEFERRED'; "
+            "i := 2; EXECUTE IMMEDIATE 'ALTER TABLE tbl_post "
+            'ADD CONSTRAINT tbl_post_tag_fk FOREIGN KEY (tag) '
+            "REFERENCES tbl_tag (name) DEFERRABLE INITIALLY DEFERRED'; "
+            'EXCEPTION WHEN OTHERS THEN RAISE_APPLICATION_ERROR('
+            "-20001, 'Statement ' || i || ': ' || SQLERRM);END;",
+        )
+        self.assertIn('_nn_check CHECK', blocks[1])
+        self.assertIn('EXECUTE IMMEDIATE \'CREATE INDEX', blocks[2])
+        self.assertTrue(blocks[3].startswith('\nCREATE SEQUENCE'))
+        self.assertTrue(blocks[4].startswith('\nCREATE OR REPLACE TRIGGER'))
+
+    def test_batch_quotes(self):
+        self.editor.execute_batch(
+            [
+                "COMMENT ON TABLE tbl_person IS 'People'",
+                "COMMENT ON COLUMN tbl_person.last_name IS 'It''s your name'",
+            ]
+        )
+
+        (block,) = self.executed
+        self.assertIn(
+            "EXECUTE IMMEDIATE 'COMMENT ON TABLE tbl_person IS ''People'''",
+            block,
+        )
+        self.assertIn(
+            "EXECUTE IMMEDIATE 'COMMENT ON COLUMN tbl_person.last_name "
+            "IS ''It''''s your name'''",
+            block,
+        )
+
+    def test_batch_formatted_once(self):
+        with patch.object(
+            test_connection.ops, 'format_sql', side_effect=str
+        ) as format_sql:
+            self.editor.execute_batch(
+                [
+                    "COMMENT ON TABLE tbl_person IS 'People'",
+                    "COMMENT ON TABLE tbl_post IS 'Posts'",
+                ]
+            )
+
+        self.assertEqual(format_sql.call_count, 2)
+
+    def test_single_statement_batch(self):
+        with self.editor as editor:
+            editor.create_model(Person)
+
+        # The primary key and the comment run alone
+        self.assertEqual(
+            self.executed[1],
+            'ALTER TABLE tbl_person ADD CONSTRAINT tbl_person_id_pk '
+            'PRIMARY KEY (id)',
+        )
+        self.assertTrue(self.executed[2].startswith('DECLARE'))
+        self.assertEqual(
+            self.executed[3],
+            "COMMENT ON COLUMN tbl_person.last_name IS 'It''s your last name'",
+        )
+
+    def test_batch_error(self):
+        self.error = DatabaseError(
+            'ORA-20001: Statement 2: ORA-02275: such a referential constraint '
+            'already exists in the table'
+        )
+
+        with self.assertRaises(DatabaseError) as ctx:
+            with self.editor as editor:
+                editor.create_model(Post)
+
+        self.assertTrue(
+            str(ctx.exception).endswith(
+                'Statement: ALTER TABLE tbl_post '
+                'ADD CONSTRAINT tbl_post_tag_fk '
+                'FOREIGN KEY (tag) REFERENCES tbl_tag (name) '
+                'DEFERRABLE INITIALLY DEFERRED'
+            )
+        )
+        self.assertIs(ctx.exception.__cause__, self.error)
+
+    def test_collected_sql_is_not_batched(self):
+        with TestDatabaseSchemaEditor(
+            test_connection, collect_sql=True
+        ) as editor:
+            editor.sql_batch_size = 3
+            editor.create_model(Post)
+
+        self.assertEqual(len(editor.collected_sql), 11)
+
+    def test_collected_sql_ending(self):
+        editor = TestDatabaseSchemaEditor(test_connection, collect_sql=True)
+        editor.sql_ending = ';\n/\n'
+
+        editor.execute('CREATE INDEX tbl_post_tag_idx ON tbl_post (tag)', None)
+        editor.execute('BEGIN NULL;END;', None)
+
+        # PL/SQL blocks keep their own semicolon, scripts add the slash
+        self.assertEqual(
+            editor.collected_sql,
+            [
+                'CREATE INDEX tbl_post_tag_idx ON tbl_post (tag);\n/\n',
+                'BEGIN NULL;END;\n/\n',
+            ],
+        )
+
+
+class LockRetryTests(TestCase):
+    busy = DatabaseError(
+        'ORA-00054: resource busy and acquire with NOWAIT specified '
+        'or timeout expired'
+    )
+
+    def setUp(self):
+        self.executed = []
+        self.errors = []
+
+        def execute(editor, sql, params=()):
+            self.executed.append(sql)
+            if self.errors:
+                raise self.errors.pop(0)
+
+        for patcher in [
+            patch.object(BaseDatabaseSchemaEditor, 'execute', execute),
+            patch('db_adapter.db.backends.base.schema.time.sleep'),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.editor = TestDatabaseSchemaEditor(test_connection)
+        self.editor.ddl_retry_options = {
+            'retries': 2,
+            'backoff': 1,
+            'max_backoff': 60,
+            'jitter': 0,
+        }
+        self.sql = 'ALTER TABLE tbl_post ADD (code NUMBER(11))'
+
+    def test_ddl_lock_timeout(self):
+        self.editor.ddl_lock_timeout = 30
+
+        with self.editor:
+            self.assertEqual(
+                self.executed, ['ALTER SESSION SET DDL_LOCK_TIMEOUT = 30']
+            )
+
+        # The database default is set back
+        self.assertEqual(
+            self.executed,
+            [
+                'ALTER SESSION SET DDL_LOCK_TIMEOUT = 30',
+                'ALTER SESSION SET DDL_LOCK_TIMEOUT = 0',
+            ],
+        )
+
+    @override_settings(
+        DB_ADAPTER={'DDL_LOCK_TIMEOUT': 30, 'DDL_LOCK_TIMEOUT_RESTORE': 10}
+    )
+    def test_ddl_lock_timeout_restore(self):
+        with TestDatabaseSchemaEditor(test_connection):
+            pass
+
+        self.assertEqual(
+            self.executed,
+            [
+                'ALTER SESSION SET DDL_LOCK_TIMEOUT = 30',
+                'ALTER SESSION SET DDL_LOCK_TIMEOUT = 10',
+            ],
+        )
+
+    def test_prepare_session_failure(self):
+        self.editor.ddl_lock_timeout = 30
+        self.errors = [DatabaseError('ORA-02248: invalid option')]
+
+        with patch.object(
+            BaseDatabaseSchemaEditor, '__exit__', return_value=None
+        ) as exit_editor:
+            with self.assertRaises(DatabaseError):
+                with self.editor:
+                    pass
+
+        # The editor (and its atomic block) is exited, the session unchanged
+        exit_editor.assert_called_once()
+        self.assertEqual(exit_editor.call_args[0][0], DatabaseError)
+        self.assertEqual(
+            self.executed, ['ALTER SESSION SET DDL_LOCK_TIMEOUT = 30']
+        )
+
+    def test_ddl_lock_timeout_collect_sql(self):
+        editor = TestDatabaseSchemaEditor(test_connection, collect_sql=True)
+        editor.ddl_lock_timeout = 30
+
+        with editor:
+            pass
+
+        self.assertEqual(self.executed, [])
+        self.assertEqual(editor.collected_sql, [])
+
+    def test_retry(self):
+        self.errors = [self.busy, self.busy]
+
+        self.editor.execute(self.sql)
+
+        self.assertEqual(self.executed, [self.sql] * 3)
+        ((sql, attempts, waited),) = self.editor.lock_waits
+        self.assertEqual((sql, attempts), (self.sql, 3))
+        self.assertGreaterEqual(waited, 3)
+
+    def test_retry_exhausted(self):
+        self.errors = [self.busy] * 3
+
+        with self.assertRaises(DatabaseError):
+            self.editor.execute(self.sql)
+
+        self.assertEqual(self.executed, [self.sql] * 3)
+        self.assertEqual(self.editor.lock_waits[0][1], 3)
+
+    def test_not_retryable(self):
+        self.errors = [DatabaseError('ORA-00955: name is already used')]
+
+        with self.assertRaises(DatabaseError):
+            self.editor.execute(self.sql)
+
+        self.assertEqual(self.executed, [self.sql])
+        self.assertEqual(self.editor.lock_waits, [])
+
+    def test_retry_delay(self):
+        self.editor.ddl_retry_options = {
+            'retries': 10,
+            'backoff': 2,
+            'max_backoff': 10,
+            'jitter': 0.5,
+        }
+
+        for attempt, delay in enumerate([2, 4, 8, 10, 10]):
+            self.assertTrue(
+                delay / 2 <= self.editor.retry_delay(attempt) <= delay
+            )
+
+    def test_batch_resumed(self):
+        statements = [
+            'ALTER TABLE tbl_post ADD CONSTRAINT tbl_post_id_pk '
+            'PRIMARY KEY (id)',
+            'ALTER TABLE tbl_post ADD CONSTRAINT tbl_post_written_by_fk '
+            'FOREIGN KEY (written_by) REFERENCES tbl_author (id)',
+            'ALTER TABLE tbl_post ADD CONSTRAINT tbl_post_tag_fk '
+            'FOREIGN KEY (tag) REFERENCES tbl_tag (name)',
+        ]
+        self.errors = [
+            DatabaseError('ORA-20001: Statement 2: %s' % self.busy),
+            self.busy,
+        ]
+
+        self.editor.execute_batch(statements)
+
+        # The block is not retried as a whole: the failed statement and the
+        # next ones run alone
+        self.assertEqual(len(self.executed), 4)
+        self.assertTrue(self.executed[0].startswith('DECLARE'))
+        self.assertEqual(
+            self.executed[1:],
+            [statements[1], statements[1], statements[2]],
+        )
+
+
+class OnlineRedefinitionTests(TestCase):
+    def alter_field(self, model, name, **attrs):
+        old_field = model._meta.get_field(name)
+        new_field = copy.deepcopy(old_field)
+        for attr, value in attrs.items():
+            setattr(new_field, attr, value)
+
+        with TestDatabaseSchemaEditor(
+            test_connection, collect_sql=True
+        ) as editor:
+            editor.online_redefinition = True
+            editor.alter_field(model, old_field, new_field)
+
+        return editor.collected_sql
+
+    def test_redefine_table(self):
+        collected_sql = self.alter_field(Person, 'last_name', max_length=60)
+
+        redefinition_args = (
+            "uname => USER, orig_table => 'tbl_person', "
+            "int_table => 'tbl_person_int'"
+        )
+        self.assertEqual(
+            collected_sql,
+            [
+                'BEGIN DBMS_REDEFINITION.CAN_REDEF_TABLE('
+                "uname => USER, tname => 'tbl_person', "
+                'options_flag => DBMS_REDEFINITION.CONS_USE_PK);END;',
+                'CREATE TABLE tbl_person_int (id NUMBER(11), '
+                'first_name NVARCHAR2(30), last_name NVARCHAR2(60));',
+                'BEGIN DBMS_REDEFINITION.START_REDEF_TABLE(%s, '
+                'options_flag => DBMS_REDEFINITION.CONS_USE_PK);END;'
+                % redefinition_args,
+                'DECLARE num_errors PLS_INTEGER;'
+                'BEGIN DBMS_REDEFINITION.COPY_TABLE_DEPENDENTS(%s, '
+                'copy_indexes => DBMS_REDEFINITION.CONS_ORIG_PARAMS, '
+                'copy_triggers => TRUE, copy_constraints => TRUE, '
+                'copy_privileges => TRUE, ignore_errors => FALSE, '
+                'num_errors => num_errors);END;' % redefinition_args,
+                'BEGIN DBMS_REDEFINITION.SYNC_INTERIM_TABLE(%s);END;'
+                % redefinition_args,
+                'BEGIN DBMS_REDEFINITION.FINISH_REDEF_TABLE(%s);END;'
+                % redefinition_args,
+                'DROP TABLE tbl_person_int CASCADE;',
+                'COMMENT ON COLUMN tbl_person.last_name '
+                "IS 'It''s your last name';",
+            ],
+        )
+
+    def test_redefine_table_executed(self):
+        old_field = Person._meta.get_field('last_name')
+        new_field = copy.deepcopy(old_field)
+        new_field.max_length = 60
+
+        executed = []
+        with patch.object(
+            BaseDatabaseSchemaEditor,
+            'execute',
+            side_effect=lambda sql, params=(): executed.append(str(sql)),
+        ):
+            with TestDatabaseSchemaEditor(test_connection) as editor:
+                editor.online_redefinition = True
+                editor.alter_field(Person, old_field, new_field)
+
+        # Blocks sent as is to the database end with their semicolon
+        self.assertEqual(
+            executed[0],
+            'BEGIN DBMS_REDEFINITION.CAN_REDEF_TABLE('
+            "uname => USER, tname => 'tbl_person', "
+            'options_flag => DBMS_REDEFINITION.CONS_USE_PK);END;',
+        )
+        blocks = [sql for sql in executed if 'DBMS_REDEFINITION' in sql]
+        self.assertEqual(len(blocks), 5)
+        self.assertTrue(all(sql.endswith(');END;') for sql in blocks))
+
+    def test_redefine_table_referenced_column(self):
+        # Foreign keys of other tables reference the column
+        collected_sql = self.alter_field(Tag, 'name', max_length=200)
+
+        self.assertNotIn('DBMS_REDEFINITION', ''.join(collected_sql))
+
+    def test_redefinition_not_required(self):
+        # Other changes than the column type
+        collected_sql = self.alter_field(
+            Person, 'last_name', max_length=60, null=True
+        )
+        self.assertNotIn('DBMS_REDEFINITION', ''.join(collected_sql))
+
+        # Unchanged column type
+        collected_sql = self.alter_field(Person, 'last_name', help_text='')
+        self.assertEqual(collected_sql, [])
+
+    def test_redefinition_disabled(self):
+        old_field = Person._meta.get_field('last_name')
+        new_field = copy.deepcopy(old_field)
+        new_field.max_length = 60
+
+        with TestDatabaseSchemaEditor(
+            test_connection, collect_sql=True
+        ) as editor:
+            editor.alter_field(Person, old_field, new_field)
+
+        self.assertNotIn('DBMS_REDEFINITION', ''.join(editor.collected_sql))
@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import CommandError, call_command
+from django.test import TestCase, TransactionTestCase
+
+from db_adapter.benchmark import (
+    BenchmarkConfig,
+    compare_results,
+    run_benchmark,
+    synthetic_project,
+)
+from tests.connection import test_connection
+
+
+class SyntheticProjectTests(TestCase):
+    def test_models(self):
+        with synthetic_project(models=3, fields=2) as models:
+            self.assertEqual(
+                list(apps.get_app_config(BenchmarkConfig.label).get_models()),
+                models,
+            )
+            self.assertEqual(
+                [f.name for f in models[1]._meta.local_fields],
+                ['id', 'code', 'name', 'field_0', 'field_1', 'parent'],
+            )
+            self.assertEqual(
+                models[1]._meta.unique_together, (('code', 'name'),)
+            )
+
+        self.assertFalse(apps.is_installed(BenchmarkConfig.name))
+
+    def test_seed(self):
+        def parents(seed):
+            with synthetic_project(models=10, seed=seed) as models:
+                return [
+                    m._meta.get_field('parent').related_model.__name__
+                    for m in models[1:]
+                ]
+
+        self.assertEqual(parents(1), parents(1))
+
+
+class RunBenchmarkTests(TestCase):
+    def test_results(self):
+        with synthetic_project(models=3, fields=2) as models:
+            results = run_benchmark(test_connection, models, dict(fields=2))
+
+        self.assertEqual(results['parameters'], dict(fields=2, models=3))
+        self.assertGreater(results['results']['statements'], 3)
+        self.assertGreater(results['results']['peak_memory'], 0)
+        self.assertIn('execute', results['results']['phases'])
+
+    def test_compare(self):
+        baseline = dict(
+            parameters=dict(models=3),
+            results=dict(wall_time=2.0, peak_memory=None, statements=10),
+        )
+        results = dict(
+            parameters=dict(models=3),
+            results=dict(wall_time=1.0, peak_memory=100, statements=10),
+        )
+
+        self.assertEqual(
+            compare_results(baseline, results),
+            [
+                ('wall_time', 2.0, 1.0, -0.5),
+                ('peak_memory', None, 100, None),
+                ('statements', 10, 10, 0.0),
+            ],
+        )
+
+        results['parameters']['models'] = 4
+        with self.assertRaises(ValueError):
+            compare_results(baseline, results)
+
+
+class SqlBenchmarkCommandTests(TransactionTestCase):
+    # The SQLite schema editor is not available in atomic blocks
+    def test_sqlbenchmark(self):
+        with tempfile.TemporaryDirectory() as path:
+            output = os.path.join(path, 'results.json')
+            call_command(
+                'sqlbenchmark', models=3, output=output, stdout=StringIO()
+            )
+            with open(output) as f:
+                self.assertEqual(
+                    json.load(f)['parameters'],
+                    dict(fields=5, seed=0, models=3),
+                )
+
+            out = StringIO()
+            call_command(
+                'sqlbenchmark',
+                models=3,
+                memory=False,
+                compare=output,
+                stdout=out,
+            )
+            self.assertIn('statements: ', out.getvalue())
+
+            with self.assertRaises(CommandError):
+                call_command(
+                    'sqlbenchmark', models=4, compare=output, stdout=StringIO()
+                )
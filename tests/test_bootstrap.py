@@ -0,0 +1,152 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.signals import post_migrate, pre_migrate
+from django.test import TestCase
+
+from db_adapter.bootstrap import (
+    mark_applied,
+    migrated_models,
+    migration_plan,
+    replay_differences,
+    unmigrated_models,
+)
+from tests.connection import test_connection
+from tests.models import Author
+
+
+class BootstrapTests(TestCase):
+    def setUp(self):
+        self.loader = MigrationLoader(None, ignore_no_migrations=True)
+
+    def test_migrated_models(self):
+        labels = {model._meta.label for model in migrated_models(self.loader)}
+
+        self.assertIn('contenttypes.ContentType', labels)
+        self.assertIn('auth.User_groups', labels)
+        self.assertNotIn('tests.Author', labels)
+
+    def test_unmigrated_models(self):
+        labels = {model._meta.label for model in unmigrated_models(self.loader)}
+
+        self.assertIn('tests.Author', labels)
+        self.assertNotIn('contenttypes.ContentType', labels)
+
+    def test_migration_plan(self):
+        plan = migration_plan(self.loader)
+
+        self.assertEqual(len(plan), len(self.loader.graph.nodes))
+        self.assertLess(
+            plan.index(('contenttypes', '0001_initial')),
+            plan.index(('auth', '0001_initial')),
+        )
+
+    def test_replay_without_differences(self):
+        models = migrated_models(self.loader)
+
+        self.assertEqual(
+            replay_differences(test_connection, self.loader, models), []
+        )
+
+    def test_replay_with_differences(self):
+        models = [*migrated_models(self.loader), Author]
+
+        ((label, missing, unexpected),) = replay_differences(
+            test_connection, self.loader, models
+        )
+
+        self.assertEqual(label, 'tests.author')
+        self.assertIn('id NUMBER(11)', missing)
+        self.assertIn('name NVARCHAR2(100)', missing)
+        self.assertIn(
+            'ALTER TABLE tbl_author ADD CONSTRAINT tbl_author_id_pk '
+            'PRIMARY KEY (id);',
+            missing,
+        )
+        self.assertEqual(unexpected, [])
+
+    def test_mark_applied(self):
+        recorder = MigrationRecorder(connection)
+        recorder.migration_qs.all().delete()
+
+        keys = mark_applied(connection, self.loader)
+
+        self.assertEqual(keys, migration_plan(self.loader))
+        self.assertEqual(set(recorder.applied_migrations()), set(keys))
+        self.assertEqual(mark_applied(connection, self.loader), [])
+
+    def test_bootstrap_with_applied_migrations(self):
+        with self.assertRaisesMessage(CommandError, 'use migrate instead'):
+            call_command('bootstrap', verbosity=0)
+
+    @patch('db_adapter.management.commands.bootstrap.mark_applied')
+    @patch('db_adapter.management.commands.bootstrap.create_schema')
+    def test_bootstrap_emits_migrate_signals(self, create_schema, mark_applied):
+        mark_applied.return_value = []
+        signals = []
+
+        def receiver(signal, sender, **kwargs):
+            signals.append((signal, sender.label, kwargs['using']))
+
+        pre_migrate.connect(receiver)
+        post_migrate.connect(receiver)
+        self.addCleanup(pre_migrate.disconnect, receiver)
+        self.addCleanup(post_migrate.disconnect, receiver)
+
+        with patch.object(
+            MigrationRecorder, 'applied_migrations', return_value=set()
+        ):
+            call_command(
+                'bootstrap',
+                skip_replay_check=True,
+                skip_data_migrations=True,
+                verbosity=0,
+                stderr=StringIO(),
+            )
+
+        create_schema.assert_called_once()
+        self.assertIn((pre_migrate, 'contenttypes', 'default'), signals)
+        self.assertIn((post_migrate, 'auth', 'default'), signals)
+        self.assertLess(
+            signals.index((pre_migrate, 'auth', 'default')),
+            signals.index((post_migrate, 'auth', 'default')),
+        )
+
+    @patch('db_adapter.management.commands.bootstrap.create_schema')
+    def test_bootstrap_with_data_migrations(self, create_schema):
+        with patch.object(
+            MigrationRecorder, 'applied_migrations', return_value=set()
+        ), self.assertRaisesMessage(
+            CommandError, 'contenttypes.0002_remove_content_type_name'
+        ):
+            call_command('bootstrap', skip_replay_check=True, verbosity=0)
+
+        create_schema.assert_not_called()
+
+    @patch('db_adapter.management.commands.bootstrap.mark_applied')
+    @patch('db_adapter.management.commands.bootstrap.create_schema')
+    def test_bootstrap_skip_data_migrations(self, create_schema, mark_applied):
+        mark_applied.return_value = []
+        stderr = StringIO()
+
+        with patch.object(
+            MigrationRecorder, 'applied_migrations', return_value=set()
+        ):
+            call_command(
+                'bootstrap',
+                skip_replay_check=True,
+                skip_data_migrations=True,
+                verbosity=0,
+                stderr=stderr,
+            )
+
+        self.assertIn(
+            'contenttypes.0002_remove_content_type_name', stderr.getvalue()
+        )
+        ((_, models), _) = create_schema.call_args
+        self.assertIn(Author, models)
+        self.assertIn(migrated_models(self.loader)[0], models)
@@ -0,0 +1,169 @@
+from unittest import skipUnless
+from unittest.mock import Mock, patch
+
+from django.db import connection
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.test import TestCase
+
+from db_adapter.bulk_load import BulkLoad, bulk_load
+from tests.connection import TestDatabaseSchemaEditor, test_connection
+from tests.models import Post
+
+# Direct-path inserts need execute wrappers and `insert_statement` (Django 2.2)
+requires_direct_path = skipUnless(
+    hasattr(connection, 'execute_wrapper'),
+    'Django 1.11 has no execute wrappers',
+)
+
+
+class BulkLoadTests(TestCase):
+    def setUp(self):
+        self.executed = []
+        patcher = patch.object(
+            BaseDatabaseSchemaEditor,
+            'execute',
+            side_effect=lambda sql, params=(): self.executed.append(str(sql)),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        test_connection.bulk_load = None
+
+    def create_post(self, **options):
+        load = test_connection.bulk_load = BulkLoad(
+            test_connection, options=options
+        )
+        with TestDatabaseSchemaEditor(test_connection) as editor:
+            editor.create_model(Post)
+
+        test_connection.bulk_load = None
+        return load
+
+    def test_hold_constraints_and_indexes(self):
+        load = self.create_post()
+
+        self.assertEqual(len(load), 8)
+        self.assertEqual(len(load.statements['INDEX']), 2)
+
+        # Table, sequence and trigger (autoincrement is not held back)
+        self.assertEqual(len(self.executed), 3)
+        self.assertEqual(
+            self.executed[0],
+            'CREATE TABLE tbl_post (id NUMBER(11), '
+            'name NVARCHAR2(30) NULL, text NCLOB, written_by NUMBER(11), '
+            'tag NVARCHAR2(100) NULL)',
+        )
+
+    def test_apply(self):
+        load = self.create_post()
+        self.executed.clear()
+
+        load.apply()
+
+        self.assertEqual(len(load), 0)
+        self.assertEqual(len(self.executed), 8)
+        self.assertEqual(
+            self.executed[0],
+            'ALTER TABLE tbl_post ADD CONSTRAINT tbl_post_id_pk '
+            'PRIMARY KEY (id)',
+        )
+        self.assertEqual(
+            self.executed[-1], 'CREATE INDEX tbl_post_tag_idx ON tbl_post (tag)'
+        )
+
+    def test_apply_with_options(self):
+        load = self.create_post(parallel=8, novalidate=True)
+        self.executed.clear()
+
+        load.apply()
+
+        self.assertEqual(len(self.executed), 10)
+        self.assertEqual(
+            self.executed[1],
+            'ALTER TABLE tbl_post ADD CONSTRAINT tbl_post_written_by_fk '
+            'FOREIGN KEY (written_by) REFERENCES tbl_author (id) '
+            'DEFERRABLE INITIALLY DEFERRED ENABLE NOVALIDATE',
+        )
+        self.assertEqual(
+            self.executed[-2:],
+            [
+                'CREATE INDEX tbl_post_tag_idx ON tbl_post (tag) PARALLEL 8',
+                'ALTER INDEX tbl_post_tag_idx NOPARALLEL',
+            ],
+        )
+
+    def test_collected_sql_is_not_held(self):
+        test_connection.bulk_load = load = BulkLoad(test_connection)
+        with TestDatabaseSchemaEditor(
+            test_connection, collect_sql=True
+        ) as editor:
+            editor.create_model(Post)
+
+        self.assertEqual(len(load), 0)
+        self.assertEqual(len(editor.collected_sql), 11)
+
+    @requires_direct_path
+    def test_direct_path_insert(self):
+        ops = test_connection.ops
+        self.assertEqual(ops.insert_statement(), 'INSERT INTO')
+
+        test_connection.bulk_load = BulkLoad(
+            test_connection, options=dict(direct_path=True)
+        )
+        # Every insert (like each batch of bulk_create), as they are
+        # committed as soon as they are executed
+        for _ in range(2):
+            self.assertEqual(
+                ops.insert_statement(), 'INSERT /*+ APPEND */ INTO'
+            )
+
+    def test_commit_direct_path(self):
+        load = BulkLoad(test_connection, options=dict(direct_path=True))
+        context = {'connection': Mock()}
+        driver = context['connection'].connection
+        execute = Mock(return_value=1)
+
+        for sql in [
+            'INSERT /*+ APPEND */ INTO tbl_post SELECT 1 FROM DUAL',
+            'INSERT /*+ APPEND */ INTO tbl_post SELECT 2 FROM DUAL',
+        ]:
+            self.assertEqual(
+                load.commit_direct_path(execute, sql, None, False, context), 1
+            )
+        self.assertEqual(driver.commit.call_count, 2)
+
+        load.commit_direct_path(
+            execute, 'SELECT 1 FROM DUAL', None, False, context
+        )
+        self.assertEqual(driver.commit.call_count, 2)
+
+
+class BulkLoadContextTests(TestCase):
+    def test_bulk_load(self):
+        with bulk_load() as load:
+            self.assertIs(connection.bulk_load, load)
+
+            with bulk_load() as nested:
+                self.assertIs(nested, load)
+
+            self.assertIs(connection.bulk_load, load)
+
+        self.assertIsNone(connection.bulk_load)
+
+    @requires_direct_path
+    def test_direct_path_wrapper(self):
+        with bulk_load(direct_path=True) as load:
+            self.assertIn(load.commit_direct_path, connection.execute_wrappers)
+
+        self.assertNotIn(load.commit_direct_path, connection.execute_wrappers)
+
+    def test_bulk_load_failure(self):
+        with self.assertRaises(ValueError), self.assertLogs(
+            'django.db.backends.schema', 'WARNING'
+        ):
+            with bulk_load() as load:
+                load.hold('INDEX', ['CREATE INDEX ix ON tb (col)'])
+                raise ValueError
+
+        self.assertIsNone(connection.bulk_load)
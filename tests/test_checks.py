@@ -0,0 +1,90 @@
+from django.core import checks
+from django.db import models
+from django.test import TestCase
+from django.test.utils import isolate_apps
+
+from db_adapter.checks import (
+    check_case_insensitive_indexes,
+    check_case_insensitive_lookups,
+    check_model_lookups,
+)
+from db_adapter.indexes import UpperIndex
+
+from .models import Customer
+
+
+class CaseInsensitiveLookupsCheckTests(TestCase):
+    def test_lookup_on_column_with_upper_index(self):
+        queryset = Customer.objects.filter(name__iexact='acme')
+
+        self.assertEqual(check_case_insensitive_lookups(queryset), [])
+
+    def test_lookup_on_column_without_upper_index(self):
+        queryset = Customer.objects.filter(
+            name__istartswith='ac', email__iexact='acme@example.com'
+        )
+
+        errors = check_case_insensitive_lookups(queryset)
+        self.assertEqual(len(errors), 1)
+
+        (error,) = errors
+        self.assertEqual(error.id, 'db_adapter.W001')
+        self.assertEqual(error.obj, Customer)
+        self.assertIn("'email'", error.msg)
+
+    def test_case_sensitive_lookups_ignored(self):
+        queryset = Customer.objects.filter(email__startswith='acme')
+
+        self.assertEqual(check_case_insensitive_lookups(queryset), [])
+
+
+class ModelLookupsCheckTests(TestCase):
+    def test_registered(self):
+        self.assertIn(
+            check_case_insensitive_indexes,
+            checks.registry.registry.get_checks(),
+        )
+        self.assertEqual(check_case_insensitive_indexes(), [])
+
+    @isolate_apps('tests')
+    def test_manager_and_limit_choices_to_lookups(self):
+        class ActiveManager(models.Manager):
+            def get_queryset(self):
+                return super().get_queryset().filter(status__iexact='active')
+
+        class Account(models.Model):
+            status = models.CharField(max_length=10)
+
+            objects = models.Manager()
+            active = ActiveManager()
+
+        class Membership(models.Model):
+            account = models.ForeignKey(
+                Account,
+                models.CASCADE,
+                limit_choices_to={'status__istartswith': 'act'},
+            )
+
+        (error,) = check_model_lookups(Account)
+        self.assertEqual(error.id, 'db_adapter.W001')
+        self.assertIn("Lookup 'iexact' on column 'status'", error.msg)
+
+        (error,) = check_model_lookups(Membership)
+        self.assertEqual(error.obj, Account)
+        self.assertIn("Lookup 'istartswith'", error.msg)
+
+    @isolate_apps('tests')
+    def test_lookups_on_upper_index(self):
+        class ActiveManager(models.Manager):
+            def get_queryset(self):
+                return super().get_queryset().filter(status__iexact='active')
+
+        class Account(models.Model):
+            status = models.CharField(max_length=10)
+
+            active = ActiveManager()
+
+            class Meta:
+                indexes = [UpperIndex(fields=['-status'], name='status_upper')]
+
+        self.assertEqual(check_model_lookups(Account), [])
@@ -0,0 +1,139 @@
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from db_adapter.ddl_cache import DDLCache, incremental_sql, model_fingerprint
+from db_adapter.settings import DEFAULTS, DatabaseAdapterSettings
+from db_adapter.utils import clear_models_by_table
+from tests.connection import TestDatabaseSchemaEditor, test_connection
+from tests.models import Author, Post, Tag
+
+MODELS = [Author, Tag, Post]
+
+pattern_settings = DatabaseAdapterSettings(
+    dict(
+        DEFAULT_OBJECT_NAME_PATTERNS={
+            **DEFAULTS['DEFAULT_OBJECT_NAME_PATTERNS'],
+            'INDEX': 'ix_{name}',
+        }
+    )
+)
+
+
+class ModelStatementsTests(TestCase):
+    def test_model_statements(self):
+        with TestDatabaseSchemaEditor(
+            test_connection, collect_sql=True
+        ) as editor:
+            statements = editor.model_statements(Post)
+
+        self.assertEqual(editor.collected_sql, [])
+        self.assertEqual(
+            statements['TABLE'],
+            [
+                'CREATE TABLE tbl_post (id NUMBER(11), '
+                'name NVARCHAR2(30) NULL, text NCLOB, written_by NUMBER(11), '
+                'tag NVARCHAR2(100) NULL);'
+            ],
+        )
+        self.assertEqual(
+            statements['INDEX'],
+            [
+                'CREATE INDEX tbl_post_written_by_idx ON tbl_post (written_by);',
+                'CREATE INDEX tbl_post_tag_idx ON tbl_post (tag);',
+            ],
+        )
+        self.assertEqual(len(statements['FOREIGN_KEY']), 2)
+
+    def test_model_statements_without_collect_sql(self):
+        editor = TestDatabaseSchemaEditor(test_connection)
+
+        with self.assertRaises(ValueError):
+            editor.model_statements(Post)
+
+
+class IncrementalSqlTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'ddl', 'cache.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_same_statements_as_create_model(self):
+        with TestDatabaseSchemaEditor(
+            test_connection, collect_sql=True
+        ) as editor:
+            for model in MODELS:
+                editor.create_model(model)
+
+        statements = incremental_sql(test_connection, MODELS)
+
+        self.assertEqual(sorted(statements), sorted(editor.collected_sql))
+        self.assertTrue(statements[0].startswith('CREATE TABLE tbl_author'))
+        self.assertTrue(statements[2].startswith('CREATE TABLE tbl_post'))
+
+    def test_cached_statements(self):
+        cache = DDLCache(self.path)
+        statements = incremental_sql(test_connection, MODELS, cache)
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+        cache = DDLCache(self.path)
+        self.assertEqual(
+            incremental_sql(test_connection, MODELS, cache), statements
+        )
+        self.assertEqual((cache.hits, cache.misses), (3, 0))
+
+    def test_changed_model_is_regenerated(self):
+        incremental_sql(test_connection, MODELS, DDLCache(self.path))
+
+        cache = DDLCache(self.path)
+        # Tables changed outside of `transform_db_table` invalidate the index
+        # of models by table themselves
+        self.addCleanup(clear_models_by_table)
+        with patch.object(Tag._meta, 'db_table', 'tbl_label'):
+            clear_models_by_table()
+            statements = incremental_sql(test_connection, MODELS, cache)
+
+        # Post references the table of Tag
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertIn(
+            'ALTER TABLE tbl_post ADD CONSTRAINT tbl_post_tag_fk FOREIGN KEY '
+            '(tag) REFERENCES tbl_label (name) DEFERRABLE INITIALLY DEFERRED;',
+            statements,
+        )
+
+    def test_changed_settings_invalidate_cache(self):
+        incremental_sql(test_connection, MODELS, DDLCache(self.path))
+
+        cache = DDLCache(self.path)
+        with patch('db_adapter.settings.db_settings', pattern_settings):
+            incremental_sql(test_connection, MODELS, cache)
+
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+    def test_invalid_cache_file(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w') as f:
+            f.write('{invalid')
+
+        cache = DDLCache(self.path)
+        incremental_sql(test_connection, [Author], cache)
+
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(list(DDLCache(self.path).entries), ['tests.Author'])
+
+    def test_model_fingerprint(self):
+        fingerprint = model_fingerprint(Author, test_connection)
+
+        self.assertEqual(
+            model_fingerprint(Author, test_connection), fingerprint
+        )
+        self.assertNotEqual(
+            model_fingerprint(Tag, test_connection), fingerprint
+        )
+        self.assertNotEqual(
+            model_fingerprint(Author, test_connection, 'settings'), fingerprint
+        )
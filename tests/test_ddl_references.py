@@ -0,0 +1,114 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from db_adapter.ddl_references import DeferredStatement, Statement, Table
+from db_adapter.schema_diff import SchemaObject, statement_object
+from tests.connection import TestDatabaseSchemaEditor, test_connection
+from tests.models import Person, Post
+
+
+class DeferredStatementTests(TestCase):
+    def setUp(self):
+        self.editor = TestDatabaseSchemaEditor(test_connection)
+        self.statement = self.editor._create_primary_key_sql(
+            Post, Post._meta.get_field('id')
+        )
+
+    def test_statement(self):
+        self.assertIsInstance(self.statement, Statement)
+        self.assertEqual(
+            str(self.statement),
+            'ALTER TABLE tbl_post ADD CONSTRAINT tbl_post_id_pk '
+            'PRIMARY KEY (id)',
+        )
+        self.assertEqual(
+            self.statement.object,
+            SchemaObject('CONSTRAINT', 'TBL_POST', 'TBL_POST_ID_PK'),
+        )
+        self.assertEqual(
+            statement_object(self.statement), self.statement.object
+        )
+
+    def test_django_statements(self):
+        unique = self.editor._create_unique_sql(Person, ['first_name'])
+        fk = self.editor._create_fk_sql(
+            Post, Post._meta.get_field('author'), '_fk'
+        )
+        index = self.editor._create_index_sql(
+            Post, [Post._meta.get_field('tag')]
+        )
+
+        self.assertEqual(
+            [unique.object, fk.object, index.object],
+            [
+                SchemaObject(
+                    'CONSTRAINT', 'TBL_PERSON', 'TBL_PERSON_FIRST_NAME_UNIQ'
+                ),
+                SchemaObject(
+                    'CONSTRAINT', 'TBL_POST', 'TBL_POST_WRITTEN_BY_FK'
+                ),
+                SchemaObject('INDEX', 'TBL_POST', 'TBL_POST_TAG_IDX'),
+            ],
+        )
+        for statement in (unique, fk, index):
+            self.assertIsInstance(statement, DeferredStatement)
+            self.assertEqual(statement_object(str(statement)), statement.object)
+
+    def test_formatted_once(self):
+        sql = str(self.statement)
+
+        with patch.object(
+            Table, '__str__', side_effect=AssertionError('Formatted again')
+        ):
+            self.assertIs(str(self.statement), sql)
+
+    def test_rename_references(self):
+        str(self.statement)
+        self.statement.rename_table_references('tbl_post', 'tbl_article')
+        self.statement.rename_column_references('tbl_article', 'id', 'code')
+
+        self.assertTrue(self.statement.references_table('tbl_article'))
+        self.assertTrue(self.statement.references_column('tbl_article', 'code'))
+        self.assertEqual(
+            str(self.statement),
+            'ALTER TABLE tbl_article ADD CONSTRAINT tbl_post_id_pk '
+            'PRIMARY KEY (code)',
+        )
+
+
+class DeferredSqlTests(TestCase):
+    def test_repeated_statements(self):
+        field = Person._meta.get_field('last_name')
+
+        with TestDatabaseSchemaEditor(
+            test_connection, collect_sql=True
+        ) as editor:
+            editor.deferred_column_sql['COMMENT'].append(
+                editor._create_comment_sql(Person, field)
+            )
+            editor.deferred_table_sql['COMMENT'].append(
+                editor._create_comment_sql(Person, field)
+            )
+            editor._flush_deferred_sql()
+
+        self.assertEqual(
+            editor.collected_sql,
+            [
+                'COMMENT ON COLUMN tbl_person.last_name '
+                "IS 'It''s your last name';"
+            ],
+        )
+
+    def test_removed_column(self):
+        with TestDatabaseSchemaEditor(
+            test_connection, collect_sql=True
+        ) as editor:
+            editor.create_model(Person)
+            editor.remove_field(Person, Person._meta.get_field('last_name'))
+
+        # Deferred statements of the removed column are discarded
+        self.assertEqual(
+            [sql for sql in editor.collected_sql if 'last_name' in sql][1:],
+            ['ALTER TABLE tbl_person DROP COLUMN last_name CASCADE;'],
+        )
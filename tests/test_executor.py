@@ -0,0 +1,132 @@
+from unittest.mock import patch
+
+from django.db import connections
+from django.db.utils import DatabaseError
+from django.test import TestCase, override_settings
+
+from db_adapter.executor import ParallelExecutor
+from tests.connection import TestDatabaseSchemaEditor, test_connection
+from tests.models import Author, Post
+from tests.stub_backend.base import stub_databases
+
+STATEMENTS = [
+    'ALTER TABLE tbl_author ADD CONSTRAINT tbl_author_id_pk PRIMARY KEY (id)',
+    'ALTER TABLE tbl_post ADD CONSTRAINT tbl_post_id_pk PRIMARY KEY (id)',
+    'ALTER TABLE tbl_post ADD CONSTRAINT tbl_post_written_by_fk '
+    'FOREIGN KEY (written_by) REFERENCES tbl_author (id)',
+    'CREATE INDEX tbl_author_name_idx ON tbl_author (name)',
+    'CREATE INDEX tbl_tag_flag_idx ON tbl_tag (flag)',
+    "COMMENT ON COLUMN tbl_tag.flag IS 'Flag'",
+]
+
+
+class ParallelExecutorTests(TestCase):
+    def test_dependencies(self):
+        executor = ParallelExecutor(workers=2)
+        executor.extend(STATEMENTS)
+        (
+            author_pk,
+            post_pk,
+            fk,
+            author_idx,
+            tag_idx,
+            tag_comment,
+        ) = executor.tasks
+
+        self.assertEqual(author_pk.dependencies, set())
+        self.assertEqual(post_pk.dependencies, set())
+        self.assertEqual(fk.dependencies, {author_pk, post_pk})
+        self.assertEqual(author_idx.dependencies, {fk})
+        self.assertEqual(tag_idx.dependencies, set())
+        self.assertEqual(tag_comment.dependencies, {tag_idx})
+        self.assertEqual(fk.category, 'CONSTRAINT')
+
+    def test_unknown_statement_is_a_barrier(self):
+        executor = ParallelExecutor()
+        executor.extend(STATEMENTS[:2])
+        barrier = executor.add('BEGIN NULL; END')
+        after = executor.add(STATEMENTS[4])
+
+        self.assertEqual(barrier.dependencies, set(executor.tasks[:2]))
+        self.assertEqual(after.dependencies, {barrier})
+
+    def test_run(self):
+        executor = ParallelExecutor('stub', workers=3)
+        executor.extend(STATEMENTS)
+
+        with stub_databases(stub={}) as recording:
+            executor.run()
+
+        executed = recording.executed()
+        self.assertCountEqual(executed, STATEMENTS)
+        for task in executor.tasks:
+            for dependency in task.dependencies:
+                self.assertLess(
+                    executed.index(dependency.sql), executed.index(task.sql)
+                )
+
+        self.assertEqual([sql for sql, _ in executor.timings], STATEMENTS)
+        self.assertTrue(
+            all(duration is not None for _, duration in executor.timings)
+        )
+
+        # Each worker closed its connection
+        self.assertEqual(recording.connected, 0)
+        self.assertTrue(recording.closed)
+
+    def test_run_with_error(self):
+        executor = ParallelExecutor('stub', workers=2)
+        executor.extend(STATEMENTS)
+
+        with stub_databases(stub={'fail_on': STATEMENTS[:1]}) as recording:
+            with self.assertRaisesMessage(DatabaseError, 'ORA-00955'):
+                executor.run()
+
+        # The foreign key (and the statements after it) depend on it
+        self.assertNotIn(STATEMENTS[2], recording.executed())
+        self.assertNotIn(STATEMENTS[3], recording.executed())
+        self.assertEqual(recording.connected, 0)
+
+    @override_settings(DB_ADAPTER={'DDL_LOCK_TIMEOUT': 5})
+    def test_worker_sessions(self):
+        executor = ParallelExecutor('stub', workers=2)
+        executor.extend(STATEMENTS)
+
+        with stub_databases(stub={}) as recording:
+            executor.run()
+
+        # Set once by the editor of each worker, and set back on exit
+        executed = recording.executed()
+        for timeout in (5, 0):
+            self.assertEqual(
+                executed.count(
+                    'ALTER SESSION SET DDL_LOCK_TIMEOUT = %d' % timeout
+                ),
+                len(recording.closed),
+            )
+
+
+class ParallelDeferredSqlTests(TestCase):
+    def test_parallel_deferred_sql(self):
+        with stub_databases(stub={}) as recording:
+            editor = connections['stub'].schema_editor(atomic=False)
+            editor.deferred_sql_workers = 2
+
+            with editor:
+                editor.deferred_sql.extend(STATEMENTS)
+
+        self.assertCountEqual(recording.executed(), STATEMENTS)
+        self.assertEqual(editor.deferred_sql, [])
+        self.assertEqual(len(editor.deferred_sql_timings), len(STATEMENTS))
+
+    @patch.object(ParallelExecutor, 'execute_statement')
+    def test_collected_sql_is_sequential(self, execute_statement):
+        editor = TestDatabaseSchemaEditor(test_connection, collect_sql=True)
+        editor.deferred_sql_workers = 2
+
+        with editor:
+            editor.create_model(Author)
+            editor.create_model(Post)
+
+        execute_statement.assert_not_called()
+        self.assertEqual(len(editor.collected_sql), 17)
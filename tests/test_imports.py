@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+from unittest import skipIf
+
+from django.test import SimpleTestCase
+
+# Modules loaded by Django itself (some versions import migration states)
+DJANGO_SCRIPT = '''
+import django
+from django.conf import settings
+
+settings.configure(
+    INSTALLED_APPS=[],
+    DATABASES={
+        'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}
+    },
+)
+django.setup()
+'''
+
+# Modules a process serving requests loads from the app (like web workers)
+SCRIPT = '''
+import django
+from django.conf import settings
+
+settings.configure(
+    INSTALLED_APPS=['db_adapter'],
+    DATABASES={
+        'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}
+    },
+)
+django.setup()
+
+import db_adapter.db.backends.base.introspection
+import db_adapter.db.backends.base.operations
+import db_adapter.name_builders
+'''
+
+# Modules only needed to generate or execute DDL
+DDL_MODULES = [
+    'sqlparse',
+    'parse',
+    'django.test',
+    'django.db.migrations.state',
+    'contextvars',
+    'db_adapter.schema_diff',
+    'db_adapter.naming_manifest',
+]
+
+
+def import_times(script):
+    """
+    Return the cumulative import times (in microseconds) of the modules loaded
+    by the script, as reported by `python -X importtime`
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=root,
+        env=dict(os.environ, PYTHONPATH=root),
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, module = line.split('|')
+            if cumulative.strip().isdigit():
+                times[module.strip()] = int(cumulative)
+
+    return times
+
+
+class ImportTimeTests(SimpleTestCase):
+    @skipIf(sys.version_info < (3, 7), '-X importtime needs Python 3.7')
+    def test_ddl_modules_not_imported(self):
+        django_times = import_times(DJANGO_SCRIPT)
+        times = import_times(SCRIPT)
+
+        self.assertIn('db_adapter.utils', times)
+        self.assertEqual(
+            [
+                module
+                for module in DDL_MODULES
+                if module in times and module not in django_times
+            ],
+            [],
+        )
@@ -0,0 +1,121 @@
+import threading
+
+from django.test import TestCase
+
+from db_adapter.instrumentation import (
+    PhaseTimings,
+    ThreadLocalVar,
+    current_timings,
+    phase_timings_collected,
+    timed,
+)
+from tests.connection import TestDatabaseSchemaEditor, test_connection
+from tests.models import Post
+
+
+class PhaseTimingsTests(TestCase):
+    def test_measure(self):
+        timings = PhaseTimings()
+
+        with timings.measure('execute'):
+            # Nested calls are measured by the outermost one
+            with timings.measure('execute'):
+                with timings.measure('format_sql'):
+                    pass
+
+        self.assertEqual(sorted(timings.as_dict()), ['execute', 'format_sql'])
+        self.assertEqual(timings.phases['execute'][0], 1)
+        self.assertGreaterEqual(
+            timings.phases['execute'][1], timings.phases['format_sql'][1]
+        )
+        self.assertIn('execute: 1 calls', timings.summary())
+
+    def test_timed(self):
+        @timed('phase')
+        def func(value):
+            return value
+
+        # Not measured outside schema editors collecting timings
+        self.assertEqual(func(1), 1)
+
+        timings = PhaseTimings()
+        token = current_timings.set(timings)
+        try:
+            self.assertEqual(func(2), 2)
+        finally:
+            current_timings.reset(token)
+
+        self.assertEqual(timings.phases['phase'][0], 1)
+
+
+class ThreadLocalVarTests(TestCase):
+    def test_set_and_reset(self):
+        var = ThreadLocalVar('var')
+        self.assertIsNone(var.get())
+
+        token = var.set(1)
+        self.assertIsNotNone(token)
+        nested_token = var.set(2)
+        self.assertEqual(var.get(), 2)
+
+        var.reset(nested_token)
+        self.assertEqual(var.get(), 1)
+        var.reset(token)
+        self.assertIsNone(var.get())
+
+    def test_thread_local(self):
+        var = ThreadLocalVar('var')
+        var.set(1)
+
+        values = []
+        thread = threading.Thread(target=lambda: values.append(var.get()))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(values, [None])
+        self.assertEqual(var.get(), 1)
+
+
+class SchemaEditorPhaseTimingsTests(TestCase):
+    def setUp(self):
+        self.received = []
+        phase_timings_collected.connect(self.receiver)
+        self.addCleanup(phase_timings_collected.disconnect, self.receiver)
+
+    def receiver(self, sender, editor, timings, **kwargs):
+        self.received.append(timings)
+
+    def test_phase_timings(self):
+        editor = TestDatabaseSchemaEditor(test_connection, collect_sql=True)
+        editor.collect_phase_timings = True
+
+        with self.assertLogs('django.db.backends.schema', 'INFO') as logs:
+            with editor:
+                editor.create_model(Post)
+
+        timings = editor.phase_timings.as_dict()
+        self.assertEqual(
+            sorted(timings),
+            [
+                'column_sql',
+                'create_index_name',
+                'enforce_model',
+                'execute',
+                'format_sql',
+                'process_name',
+            ],
+        )
+        self.assertEqual(timings['column_sql']['count'], 5)
+        self.assertEqual(timings['execute']['count'], 11)
+        self.assertEqual(self.received, [editor.phase_timings])
+        self.assertIn('Schema editor phases:', logs.output[0])
+        self.assertIsNone(current_timings.get())
+
+    def test_phase_timings_disabled(self):
+        with TestDatabaseSchemaEditor(
+            test_connection, collect_sql=True
+        ) as editor:
+            editor.create_model(Post)
+
+        self.assertIsNone(editor.phase_timings)
+        self.assertEqual(self.received, [])
@@ -0,0 +1,25 @@
+from django.core.exceptions import FieldError
+from django.db import models
+from django.test import TestCase
+
+from db_adapter.lookups import TextContains
+
+from .models import Customer
+
+
+class TextContainsLookupTests(TestCase):
+    def test_text_contains_sql(self):
+        # `django.test.utils.register_lookup` is not available on Django 1.11
+        models.TextField.register_lookup(TextContains)
+        try:
+            queryset = Customer.objects.filter(notes__text_contains='oracle')
+            sql, params = queryset.query.sql_with_params()
+        finally:
+            models.TextField._unregister_lookup(TextContains)
+
+        self.assertIn('WHERE CONTAINS("tbl_customer"."notes", %s) > 0', sql)
+        self.assertEqual(params, ('oracle',))
+
+    def test_lookup_requires_opt_in(self):
+        with self.assertRaises(FieldError):
+            Customer.objects.filter(notes__text_contains='oracle')
@@ -26,6 +26,17 @@ class ObjectNameBuilderTests(TestCase):
         self.tag_field = Post._meta.get_field('tag')
         self.author_field = Post._meta.get_field('author')
 
+    def test_default_interim_table_pattern(self):
+        # Object name patterns without INTERIM_TABLE (set before interim
+        # tables were named) use the default one
+        self.assertEqual(
+            self.builder.object_name_pattern('interim_table'), '{table}_int'
+        )
+        self.assertEqual(
+            self.builder.process_name(self.model, [], 'interim_table'),
+            'tbl_post_int',
+        )
+
     def test_process_table_argument(self):
         """
         The object name should include the entire table name
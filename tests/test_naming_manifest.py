@@ -0,0 +1,174 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from db_adapter.models import transform_db_table, transformed_tables
+from db_adapter.name_builders import ObjectNameBuilder
+from db_adapter.naming_manifest import (
+    NamingManifest,
+    build_manifest,
+    get_manifest,
+    manifest_fingerprint,
+)
+from db_adapter.settings import db_settings
+from tests.connection import test_connection
+from tests.models import Circle, Post
+
+
+class BuildManifestTests(TestCase):
+    def test_names(self):
+        manifest = build_manifest(test_connection, ['tests'])
+
+        self.assertEqual(manifest.fingerprint, manifest_fingerprint())
+        self.assertEqual(
+            manifest.names[('tbl_post', ('id',), 'PRIMARY_KEY', '')],
+            'tbl_post_id_pk',
+        )
+
+    def test_problems(self):
+        manifest = NamingManifest(
+            '',
+            {'circle': 'tbl_circle', 'round': 'tbl_circle'},
+            {
+                ('tbl_square', ('id',), 'PRIMARY_KEY', ''): 'tbl_square_pk',
+                ('tbl_circle', ('id',), 'PRIMARY_KEY', ''): 'tbl_square_pk',
+                ('tbl_circle', ('name',), 'INDEX', ''): 'tbl_circle_name_idx',
+            },
+        )
+
+        self.assertEqual(
+            manifest.problems(max_length=18),
+            [
+                'Name TBL_CIRCLE is used by table circle; table round',
+                'Name TBL_CIRCLE_NAME_IDX is longer than 18 characters',
+                'Name TBL_SQUARE_PK is used by PRIMARY_KEY of tbl_circle(id); '
+                'PRIMARY_KEY of tbl_square(id)',
+            ],
+        )
+        self.assertEqual(len(manifest.problems()), 2)
+
+
+class LoadManifestTests(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'names.json')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def dump(self, tables, names):
+        NamingManifest(manifest_fingerprint(), tables, names).dump(self.path)
+
+    def test_lookup(self):
+        self.dump({}, {('tbl_post', ('id',), 'PRIMARY_KEY', ''): 'cp_post'})
+        field = Post._meta.get_field('id')
+
+        with override_settings(DB_ADAPTER={'NAMING_MANIFEST': self.path}):
+            builder = ObjectNameBuilder()
+
+            self.assertEqual(
+                builder.process_name(Post, [field], 'PRIMARY_KEY'), 'cp_post'
+            )
+            # Names missing from the manifest are computed
+            self.assertEqual(
+                builder.process_name(Post, [field], 'INDEX'), 'tbl_post_id_idx'
+            )
+
+    def test_transform_db_table(self):
+        settings = {
+            'DEFAULT_DB_TABLE_PATTERN': 'tbl_{table_name}',
+            'NAMING_MANIFEST': self.path,
+        }
+        with override_settings(DB_ADAPTER=settings), patch.dict(
+            transformed_tables
+        ):
+            self.dump({'circle': 'tbl_round'}, {})
+            try:
+                transform_db_table(Circle)
+                self.assertEqual(Circle._meta.db_table, 'tbl_round')
+                # Recorded for the next manifests, like computed tables
+                self.assertEqual(transformed_tables['circle'], 'tbl_round')
+            finally:
+                Circle._meta.db_table = 'circle'
+
+    def test_names_without_manifest(self):
+        field = Post._meta.get_field('id')
+
+        with patch('db_adapter.naming_manifest.name_key') as name_key:
+            name = ObjectNameBuilder().process_name(Post, [field], 'INDEX')
+
+        self.assertEqual(name, 'tbl_post_id_idx')
+        name_key.assert_not_called()
+
+    def test_lookup_once_per_settings(self):
+        self.dump({}, {('tbl_post', ('id',), 'PRIMARY_KEY', ''): 'cp_post'})
+        field = Post._meta.get_field('id')
+
+        with override_settings(DB_ADAPTER={'NAMING_MANIFEST': self.path}):
+            builder = ObjectNameBuilder()
+            builder.process_name(Post, [field], 'PRIMARY_KEY')
+            with patch(
+                'db_adapter.naming_manifest.get_manifest', wraps=get_manifest
+            ) as manifest:
+                builder.process_name(Post, [field], 'PRIMARY_KEY')
+                builder.process_name(Post, [field], 'INDEX')
+                manifest.assert_not_called()
+
+                db_settings.reload()
+                self.assertEqual(
+                    builder.process_name(Post, [field], 'PRIMARY_KEY'),
+                    'cp_post',
+                )
+                builder.process_name(Post, [field], 'INDEX')
+                manifest.assert_called_once_with()
+
+    def test_other_settings(self):
+        self.dump({}, {})
+
+        settings = {'NAMING_MANIFEST': self.path, 'SQL_BATCH_SIZE': 10}
+        with override_settings(DB_ADAPTER=settings):
+            with self.assertLogs('db_adapter', 'WARNING'):
+                self.assertIsNone(get_manifest())
+
+    def test_invalid_file(self):
+        with open(self.path, 'w') as f:
+            f.write('{invalid')
+
+        with override_settings(DB_ADAPTER={'NAMING_MANIFEST': self.path}):
+            with self.assertLogs('db_adapter', 'WARNING'):
+                self.assertIsNone(get_manifest())
+
+
+@patch(
+    'db_adapter.management.commands.namingmanifest.connections',
+    {'default': test_connection},
+)
+class NamingManifestCommandTests(TestCase):
+    def test_namingmanifest(self):
+        with tempfile.TemporaryDirectory() as path:
+            output = os.path.join(path, 'names.json')
+            out = StringIO()
+            call_command('namingmanifest', 'tests', output=output, stdout=out)
+
+            with open(output) as f:
+                self.assertIn(
+                    ['tbl_post', ['id'], 'PRIMARY_KEY', '', 'tbl_post_id_pk'],
+                    json.load(f)['names'],
+                )
+
+        self.assertIn('object names.', out.getvalue())
+
+    def test_check(self):
+        with patch.object(
+            NamingManifest, 'problems', return_value=['Name X is used by Y']
+        ):
+            err = StringIO()
+            with self.assertRaises(CommandError):
+                call_command('namingmanifest', 'tests', check=True, stderr=err)
+
+        self.assertIn('Name X is used by Y', err.getvalue())
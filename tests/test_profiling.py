@@ -0,0 +1,96 @@
+import os
+import pstats
+import tempfile
+import time
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from db_adapter.profiling import SamplingProfiler, generate_sql
+from db_adapter.utils import normalize_table
+from tests.connection import test_connection
+
+
+class SamplingProfilerTests(TestCase):
+    def busy(self, duration=0.05):
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            pass
+
+    def test_sampling(self):
+        with SamplingProfiler(interval=0.001) as profiler:
+            self.busy()
+
+        self.assertGreater(len(profiler), 0)
+        self.assertGreater(profiler.function_samples(['busy'])['busy'], 0)
+        self.assertIn('tests.test_profiling:busy', profiler.collapsed())
+
+
+class GenerateSqlTests(TestCase):
+    def test_models(self):
+        statements = generate_sql(test_connection, ['tests'])
+
+        self.assertIn(
+            'ALTER TABLE tbl_author ADD CONSTRAINT tbl_author_id_pk '
+            'PRIMARY KEY (id);',
+            statements,
+        )
+
+    @override_settings(
+        DB_ADAPTER={'DEFAULT_DB_TABLE_PATTERN': 'tb_{table_name}'}
+    )
+    def test_normalized_tables(self):
+        # Tables are normalized within the profiled section
+        with patch(
+            'db_adapter.profiling.normalize_table', wraps=normalize_table
+        ) as normalize:
+            generate_sql(test_connection, ['tests'])
+
+        self.assertIn(
+            'tbl_author', [call[0][0] for call in normalize.call_args_list]
+        )
+
+
+class GenerateMigrationsSqlTests(TransactionTestCase):
+    # The SQLite schema editor is not available in atomic blocks
+    def test_migrations(self):
+        statements = generate_sql(connection, ['contenttypes'], migrations=True)
+
+        self.assertTrue(any('django_content_type' in sql for sql in statements))
+
+    def test_migration_dependencies(self):
+        # Migrations of other apps the selected apps depend on are included
+        statements = generate_sql(connection, ['auth'], migrations=True)
+
+        self.assertTrue(any('django_content_type' in sql for sql in statements))
+        self.assertTrue(any('auth_user' in sql for sql in statements))
+        self.assertFalse(any('django_session' in sql for sql in statements))
+
+
+class SqlProfileCommandTests(TransactionTestCase):
+    def test_sqlprofile(self):
+        with tempfile.TemporaryDirectory() as path:
+            prefix = os.path.join(path, 'profile')
+            out = StringIO()
+            call_command(
+                'sqlprofile',
+                'contenttypes',
+                migrations=True,
+                output=prefix,
+                stdout=out,
+            )
+
+            stats = pstats.Stats('%s.pstats' % prefix)
+            self.assertTrue(
+                any(name == 'collect_sql' for _, _, name in stats.stats)
+            )
+            self.assertTrue(os.path.exists('%s.collapsed' % prefix))
+
+        self.assertIn('samples', out.getvalue())
+
+    def test_unknown_app(self):
+        with self.assertRaises(CommandError):
+            call_command('sqlprofile', 'unknown', profiler=['cprofile'])
@@ -0,0 +1,148 @@
+from django.test import TestCase
+
+from db_adapter.schema_diff import (
+    SchemaObject,
+    SchemaSnapshot,
+    schema_diff,
+    statement_object,
+)
+from tests.connection import (
+    TestCursor,
+    TestDatabaseIntrospection,
+    test_connection,
+    test_control_connection,
+)
+from tests.models import Author, Post
+
+# Fake data dictionary of a partly deployed schema: `tbl_author` is complete
+# and `tbl_post` lacks the `tag` column, its constraints and indexes
+DICTIONARY = [
+    ('TABLE', 'TBL_AUTHOR', None),
+    ('COLUMN', 'TBL_AUTHOR', 'ID'),
+    ('COLUMN', 'TBL_AUTHOR', 'NAME'),
+    ('CONSTRAINT', 'TBL_AUTHOR', 'TBL_AUTHOR_ID_PK'),
+    ('CONSTRAINT', 'TBL_AUTHOR', 'TBL_AUTHOR_ID_NN_CHECK'),
+    ('CONSTRAINT', 'TBL_AUTHOR', 'TBL_AUTHOR_NAME_NN_CHECK'),
+    ('SEQUENCE', None, 'TBL_AUTHOR_SQ'),
+    ('TRIGGER', 'TBL_AUTHOR', 'TBL_AUTHOR_TR'),
+    ('TABLE', 'TBL_POST', None),
+    ('COLUMN', 'TBL_POST', 'ID'),
+    ('COLUMN', 'TBL_POST', 'NAME'),
+    ('COLUMN', 'TBL_POST', 'TEXT'),
+    ('COLUMN', 'TBL_POST', 'WRITTEN_BY'),
+    ('CONSTRAINT', 'TBL_POST', 'TBL_POST_ID_PK'),
+    ('CONSTRAINT', 'TBL_POST', 'TBL_POST_ID_NN_CHECK'),
+    ('CONSTRAINT', 'TBL_POST', 'TBL_POST_TEXT_NN_CHECK'),
+    ('SEQUENCE', None, 'TBL_POST_SQ'),
+    ('TRIGGER', 'TBL_POST', 'TBL_POST_TR'),
+]
+
+
+class StatementObjectTests(TestCase):
+    def test_statement_object(self):
+        statements = {
+            'CREATE TABLE "NS"."TB_A" (\n    "ID" NUMBER(11)\n);\n/\n': (
+                SchemaObject('TABLE', 'TB_A', None)
+            ),
+            'ALTER TABLE tb_a ADD CONSTRAINT tb_a_pk PRIMARY KEY (id);': (
+                SchemaObject('CONSTRAINT', 'TB_A', 'TB_A_PK')
+            ),
+            'ALTER TABLE tb_a\n    ADD "FLAG" NUMBER(1) NULL;': (
+                SchemaObject('COLUMN', 'TB_A', 'FLAG')
+            ),
+            'CREATE INDEX tb_a_idx\n    ON tb_a (name);': (
+                SchemaObject('INDEX', 'TB_A', 'TB_A_IDX')
+            ),
+            'GRANT SELECT, INSERT ON tb_a TO rl_tests;': (
+                SchemaObject('GRANT', 'TB_A', 'RL_TESTS')
+            ),
+            "COMMENT ON COLUMN ns.tb_a.name\n    is 'Name';": (
+                SchemaObject('COMMENT', 'TB_A', 'NAME')
+            ),
+            'CREATE MATERIALIZED VIEW LOG ON tb_a WITH ROWID;': (
+                SchemaObject('MATERIALIZED_VIEW_LOG', 'TB_A', None)
+            ),
+        }
+
+        for sql, obj in statements.items():
+            self.assertEqual(statement_object(sql), obj)
+
+        self.assertIsNone(statement_object('DECLARE i INTEGER; BEGIN END;'))
+
+
+class SchemaSnapshotTests(TestCase):
+    def test_get_schema_snapshot(self):
+        introspection = TestDatabaseIntrospection(test_connection)
+        cursor = TestCursor({'schema_objects': DICTIONARY})
+        introspection.sql_get_schema_objects = 'schema_objects'
+
+        snapshot = introspection.get_schema_snapshot(cursor, 'NS')
+
+        self.assertEqual(cursor.executed, [('schema_objects', {'owner': 'NS'})])
+        self.assertEqual(len(snapshot), len(DICTIONARY))
+        self.assertTrue(snapshot.has_table('tbl_author'))
+        self.assertTrue(snapshot.has_column('"NS"."TBL_POST"', 'text'))
+        self.assertFalse(snapshot.has_column('tbl_post', 'tag'))
+
+    def test_statements_without_object_are_missing(self):
+        self.assertTrue(SchemaSnapshot(DICTIONARY).is_missing(None))
+
+
+class SchemaDiffTests(TestCase):
+    def test_diff_with_empty_schema(self):
+        with test_connection.schema_editor(collect_sql=True) as editor:
+            editor.create_model(Author)
+            editor.create_model(Post)
+
+        statements = schema_diff(
+            test_connection, [Author, Post], SchemaSnapshot()
+        )
+
+        self.assertEqual(statements, editor.collected_sql)
+
+    def test_diff_with_complete_schema(self):
+        snapshot = SchemaSnapshot(DICTIONARY)
+
+        self.assertEqual(schema_diff(test_connection, [Author], snapshot), [])
+
+    def test_diff_with_partial_schema(self):
+        snapshot = SchemaSnapshot(DICTIONARY)
+
+        statements = schema_diff(test_connection, [Author, Post], snapshot)
+
+        self.assertEqual(
+            statements,
+            [
+                'ALTER TABLE tbl_post ADD COLUMN tag NVARCHAR2(100) NULL;',
+                (
+                    'ALTER TABLE tbl_post '
+                    'ADD CONSTRAINT tbl_post_written_by_fk '
+                    'FOREIGN KEY (written_by) REFERENCES tbl_author (id) '
+                    'DEFERRABLE INITIALLY DEFERRED;'
+                ),
+                (
+                    'ALTER TABLE tbl_post ADD CONSTRAINT tbl_post_tag_fk '
+                    'FOREIGN KEY (tag) REFERENCES tbl_tag (name) '
+                    'DEFERRABLE INITIALLY DEFERRED;'
+                ),
+                (
+                    'ALTER TABLE tbl_post '
+                    'ADD CONSTRAINT tbl_post_written_by_nn_check '
+                    'CHECK (written_by IS NOT NULL);'
+                ),
+                'CREATE INDEX tbl_post_written_by_idx ON tbl_post (written_by);',
+                'CREATE INDEX tbl_post_tag_idx ON tbl_post (tag);',
+            ],
+        )
+
+    def test_diff_with_missing_grants(self):
+        snapshot = SchemaSnapshot(
+            [*DICTIONARY, ('GRANT', 'TBL_AUTHOR_SQ', 'RL_TESTS')]
+        )
+
+        statements = schema_diff(test_control_connection, [Author], snapshot)
+
+        self.assertEqual(
+            statements,
+            ['GRANT SELECT, INSERT, UPDATE, DELETE ON tbl_author TO rl_tests;'],
+        )
@@ -1,12 +1,14 @@
 from unittest.mock import patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from db_adapter.settings import (
     DEFAULTS,
     DatabaseAdapterSettings,
+    db_settings,
     reload_db_settings,
 )
+from tests.connection import TestDatabaseSchemaEditor, test_connection
 
 
 class DatabaseAdapterSettingsTests(TestCase):
@@ -79,3 +81,61 @@ class DatabaseAdapterSettingsTests(TestCase):
         self.assertEqual(
             override_cfg.SQL_FORMAT_OPTIONS.get('keyword_case'), 'upper'
         )
+
+
+class SettingsSnapshotTests(TestCase):
+    def test_object_name_patterns_replaced(self):
+        patterns = {'INDEX': 'ix_{name}'}
+        settings = DatabaseAdapterSettings(
+            user_settings={'DEFAULT_OBJECT_NAME_PATTERNS': patterns}
+        )
+
+        self.assertEqual(settings.DEFAULT_OBJECT_NAME_PATTERNS, patterns)
+
+    def test_snapshot(self):
+        settings = DatabaseAdapterSettings(user_settings={'SQL_BATCH_SIZE': 10})
+        snapshot = settings.snapshot
+
+        self.assertIs(settings.snapshot, snapshot)
+        self.assertEqual(snapshot.version, 0)
+        self.assertEqual(snapshot.SQL_BATCH_SIZE, 10)
+        self.assertEqual(
+            snapshot.BULK_LOAD_STEPS, tuple(DEFAULTS['BULK_LOAD_STEPS'])
+        )
+        self.assertFalse(hasattr(snapshot, '__dict__'))
+
+    def test_immutable(self):
+        snapshot = DatabaseAdapterSettings().snapshot
+
+        with self.assertRaises(AttributeError):
+            snapshot.SQL_BATCH_SIZE = 10
+        with self.assertRaises(AttributeError):
+            del snapshot.SQL_BATCH_SIZE
+        with self.assertRaises(TypeError):
+            snapshot.SQL_FORMAT_OPTIONS['unquote'] = True
+
+    def test_reload(self):
+        settings = DatabaseAdapterSettings()
+        snapshot = settings.snapshot
+        cleared = []
+        settings.register_invalidation(lambda: cleared.append(True))
+
+        settings.reload()
+
+        self.assertEqual(cleared, [True])
+        self.assertEqual(settings.version, 1)
+        self.assertIsNot(settings.snapshot, snapshot)
+        self.assertEqual(settings.snapshot.version, 1)
+
+    def test_changed_setting(self):
+        editor = TestDatabaseSchemaEditor(test_connection)
+        name_builder = test_connection.ops.name_builder
+        self.assertEqual(editor.sql_batch_size, 1)
+        self.assertIs(test_connection.ops.name_builder, name_builder)
+
+        with override_settings(DB_ADAPTER={'SQL_BATCH_SIZE': 10}):
+            self.assertEqual(db_settings.snapshot.SQL_BATCH_SIZE, 10)
+            self.assertEqual(editor.sql_batch_size, 10)
+            self.assertIsNot(test_connection.ops.name_builder, name_builder)
+
+        self.assertEqual(editor.sql_batch_size, 1)
@@ -0,0 +1,106 @@
+import json
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.test import TestCase
+
+from db_adapter.schema_diff import SchemaObject
+from db_adapter.statement_report import StatementReport, statement_report
+from tests.connection import TestDatabaseSchemaEditor, test_connection
+from tests.models import Post
+
+
+class StatementReportTests(TestCase):
+    def setUp(self):
+        self.report = StatementReport(size=2)
+        self.report.add('CREATE TABLE tbl_post (id NUMBER(11))', 0.5)
+        self.report.add(
+            'CREATE INDEX tbl_post_tag_idx ON tbl_post (tag)',
+            3.0,
+            SchemaObject('INDEX', 'TBL_POST', 'TBL_POST_TAG_IDX'),
+        )
+        self.report.add('COMMENT ON COLUMN tbl_post.name IS', 0.1)
+
+    def test_slowest(self):
+        self.assertEqual(len(self.report), 3)
+        self.assertAlmostEqual(self.report.total, 3.6)
+        self.assertEqual(
+            [entry['duration'] for entry in self.report.slowest], [3.0, 0.5]
+        )
+        self.assertEqual(self.report.slowest[0]['name'], 'TBL_POST_TAG_IDX')
+
+    def test_as_json(self):
+        data = json.loads(self.report.as_json())
+
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(data['slowest'][0]['type'], 'INDEX')
+
+    def test_as_table(self):
+        lines = self.report.as_table().splitlines()
+
+        self.assertEqual(lines[0], '3 statements in 3.600s, slowest:')
+        self.assertIn('INDEX', lines[2])
+        self.assertIn('TBL_POST_TAG_IDX', lines[2])
+        self.assertEqual(len(lines), 4)
+
+    def test_statement_report(self):
+        with statement_report(size=5) as report:
+            with statement_report() as nested:
+                self.assertIs(nested, report)
+            self.assertIs(connection.statement_report, report)
+
+        self.assertIsNone(connection.statement_report)
+
+
+class SlowStatementTests(TestCase):
+    def setUp(self):
+        patcher = patch.object(BaseDatabaseSchemaEditor, 'execute')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        test_connection.statement_report = None
+
+    def test_slow_statements(self):
+        editor = TestDatabaseSchemaEditor(test_connection)
+        editor.slow_statement_threshold = 0
+
+        with self.assertLogs('django.db.backends.schema', 'WARNING') as logs:
+            with editor:
+                editor.create_model(Post)
+
+        self.assertEqual(len(logs.output), 11)
+        self.assertIn('Slow statement', logs.output[0])
+        self.assertIn('TABLE TBL_POST): CREATE TABLE tbl_post', logs.output[0])
+        self.assertIn('CONSTRAINT TBL_POST_ID_PK): ALTER TABLE', logs.output[1])
+
+    def test_report(self):
+        report = test_connection.statement_report = StatementReport(size=3)
+
+        with TestDatabaseSchemaEditor(test_connection) as editor:
+            editor.create_model(Post)
+
+        self.assertEqual(len(report), 11)
+        self.assertEqual(len(report.slowest), 3)
+
+    def test_no_report(self):
+        with patch('db_adapter.db.backends.base.schema.statement_object') as m:
+            with TestDatabaseSchemaEditor(test_connection) as editor:
+                editor.create_model(Post)
+
+        # Statements are not parsed when neither logged nor reported
+        m.assert_not_called()
+
+
+class MigrateCommandTests(TestCase):
+    def test_statement_report(self):
+        out = StringIO()
+        call_command(
+            'adaptermigrate', statement_report='json', verbosity=0, stdout=out
+        )
+
+        self.assertEqual(json.loads(out.getvalue())['slowest'], [])
+        self.assertIsNone(connection.statement_report)
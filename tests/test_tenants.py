@@ -0,0 +1,235 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from db_adapter.tenants import (
+    StatementTemplate,
+    TenantFanOut,
+    template_namespace,
+)
+from tests.stub_backend.base import stub_databases
+
+STATEMENTS = [
+    '-- Create model Post',
+    'CREATE TABLE TENANT.TBL_POST (ID NUMBER(11) NOT NULL, TENANT NUMBER(11));',
+    'ALTER TABLE "tenant".tbl_post ADD CONSTRAINT tbl_post_id_pk '
+    'PRIMARY KEY (id);',
+    "BEGIN DBMS_STATS.GATHER_TABLE_STATS(ownname => 'TENANT', "
+    "tabname => 'TBL_POST');END;",
+    'CREATE SEQUENCE OTHER_TENANT.TBL_POST_SQ;',
+]
+
+
+class StatementTemplateTests(TestCase):
+    def test_template_namespace(self):
+        with self.assertRaises(ImproperlyConfigured):
+            template_namespace()
+
+        pattern = '"tenant"."tbl_{table_name}"'
+        with override_settings(
+            DB_ADAPTER={'DEFAULT_DB_TABLE_PATTERN': pattern}
+        ):
+            self.assertEqual(template_namespace(), 'tenant')
+
+    def test_instantiate(self):
+        template = StatementTemplate(STATEMENTS, 'tenant', sql_ending=';')
+
+        self.assertEqual(len(template), 4)
+        self.assertEqual(
+            template.instantiate('acme'),
+            [
+                'CREATE TABLE ACME.TBL_POST '
+                '(ID NUMBER(11) NOT NULL, TENANT NUMBER(11))',
+                'ALTER TABLE "acme".tbl_post ADD CONSTRAINT tbl_post_id_pk '
+                'PRIMARY KEY (id)',
+                "BEGIN DBMS_STATS.GATHER_TABLE_STATS(ownname => 'ACME', "
+                "tabname => 'TBL_POST');END;",
+                'CREATE SEQUENCE OTHER_TENANT.TBL_POST_SQ',
+            ],
+        )
+
+    def test_script_endings(self):
+        template = StatementTemplate(
+            [
+                'CREATE SEQUENCE tenant.tbl_post_sq;\n/\n',
+                'BEGIN DBMS_STATS.GATHER_TABLE_STATS('
+                "ownname => 'TENANT', tabname => 'TBL_POST');END;\n/\n",
+            ],
+            'tenant',
+            sql_ending=';\n/\n',
+        )
+
+        self.assertEqual(
+            template.instantiate('acme'),
+            [
+                'CREATE SEQUENCE acme.tbl_post_sq',
+                'BEGIN DBMS_STATS.GATHER_TABLE_STATS('
+                "ownname => 'ACME', tabname => 'TBL_POST');END;",
+            ],
+        )
+
+    def test_literals_are_kept(self):
+        template = StatementTemplate(
+            [
+                "ALTER TABLE tenant.tbl_post ADD kind VARCHAR2(10) "
+                "DEFAULT 'tenant'",
+                "DELETE FROM tenant.tbl_post WHERE kind IN ('TENANT')",
+                "BEGIN DBMS_REDEFINITION.START_REDEF_TABLE(uname => 'tenant', "
+                "orig_table => 'TBL_POST', int_table => 'TBL_POST_NEW');END;",
+            ],
+            'tenant',
+        )
+
+        self.assertEqual(
+            template.instantiate('acme'),
+            [
+                "ALTER TABLE acme.tbl_post ADD kind VARCHAR2(10) "
+                "DEFAULT 'tenant'",
+                "DELETE FROM acme.tbl_post WHERE kind IN ('TENANT')",
+                "BEGIN DBMS_REDEFINITION.START_REDEF_TABLE(uname => 'acme', "
+                "orig_table => 'TBL_POST', int_table => 'TBL_POST_NEW');END;",
+            ],
+        )
+
+
+class TenantFanOutTests(TestCase):
+    def setUp(self):
+        self.template = StatementTemplate(STATEMENTS, 'tenant', sql_ending=';')
+
+    def test_run(self):
+        progress = []
+        fan_out = TenantFanOut(
+            self.template,
+            ['acme', 'globex', 'initech'],
+            using='stub',
+            workers=2,
+            progress=progress.append,
+        )
+
+        with stub_databases(stub={}) as recording:
+            results = fan_out.run()
+
+        self.assertEqual([r.status for r in results], ['done'] * 3)
+        self.assertEqual([r.executed for r in results], [4] * 3)
+        self.assertCountEqual(progress, results)
+        self.assertCountEqual(
+            recording.executed(),
+            [
+                sql
+                for tenant in ['acme', 'globex', 'initech']
+                for sql in self.template.instantiate(tenant)
+            ],
+        )
+        self.assertEqual(fan_out.failed, [])
+
+        # Each worker closed its connection
+        self.assertEqual(recording.connected, 0)
+        self.assertTrue(recording.closed)
+
+    def test_failed_tenant(self):
+        fail_on = self.template.instantiate('globex')[1]
+        fan_out = TenantFanOut(self.template, ['acme', 'globex'], using='stub')
+
+        with stub_databases(stub={'fail_on': [fail_on]}) as recording:
+            with self.assertLogs('django.db.backends.schema', 'ERROR'):
+                acme, globex = fan_out.run()
+
+        self.assertEqual((acme.status, acme.executed), ('done', 4))
+        self.assertEqual((globex.status, globex.executed), ('failed', 1))
+        self.assertEqual(globex.failed_sql, fail_on)
+        self.assertEqual(fan_out.failed, [globex])
+        self.assertNotIn(
+            self.template.instantiate('globex')[2], recording.executed()
+        )
+
+    @override_settings(DB_ADAPTER={'DDL_LOCK_TIMEOUT': 5})
+    def test_worker_sessions(self):
+        fan_out = TenantFanOut(
+            self.template, ['acme', 'globex', 'initech'], using='stub'
+        )
+
+        with stub_databases(stub={}) as recording:
+            fan_out.run()
+
+        # Set once by the editor of each worker, and set back on exit
+        executed = recording.executed()
+        for timeout in (5, 0):
+            self.assertEqual(
+                executed.count(
+                    'ALTER SESSION SET DDL_LOCK_TIMEOUT = %d' % timeout
+                ),
+                len(recording.closed),
+            )
+
+
+@override_settings(
+    DB_ADAPTER={'DEFAULT_DB_TABLE_PATTERN': '"tenant"."tbl_{table_name}"'}
+)
+@patch(
+    'db_adapter.management.commands.tenantmigrate.generate_sql',
+    return_value=STATEMENTS,
+)
+class TenantMigrateCommandTests(TestCase):
+    def test_dry_run(self, generate_sql):
+        out = StringIO()
+        call_command(
+            'tenantmigrate',
+            tenants=['acme', 'globex'],
+            dry_run=True,
+            stdout=out,
+        )
+
+        self.assertIn('CREATE TABLE ACME.TBL_POST', out.getvalue())
+        self.assertNotIn('GLOBEX', out.getvalue())
+
+    def test_tenantmigrate(self, generate_sql):
+        out = StringIO()
+        with stub_databases(stub={}) as recording:
+            call_command(
+                'tenantmigrate',
+                database='stub',
+                tenants=['acme'],
+                stdout=out,
+            )
+
+        self.assertIn('acme: 4 statements applied', out.getvalue())
+        self.assertEqual(len(recording.executed()), 4)
+
+    def test_failed_tenant(self, generate_sql):
+        err = StringIO()
+        fail_on = [
+            'CREATE TABLE ACME.TBL_POST '
+            '(ID NUMBER(11) NOT NULL, TENANT NUMBER(11))'
+        ]
+        with stub_databases(stub={'fail_on': fail_on}):
+            with self.assertRaisesMessage(CommandError, '1 of 1 tenants'):
+                call_command(
+                    'tenantmigrate',
+                    database='stub',
+                    tenants=['acme'],
+                    stdout=StringIO(),
+                    stderr=err,
+                )
+
+        self.assertIn('acme: failed on statement 1 of 4', err.getvalue())
+
+    def test_migrations_warning(self, generate_sql):
+        err = StringIO()
+        with stub_databases(stub={}):
+            call_command(
+                'tenantmigrate',
+                database='stub',
+                tenants=['acme'],
+                migrations=True,
+                stdout=StringIO(),
+                stderr=err,
+            )
+
+        self.assertIn('Migrations are not recorded', err.getvalue())
+
+    def test_no_tenants(self, generate_sql):
+        with self.assertRaises(CommandError):
+            call_command('tenantmigrate')
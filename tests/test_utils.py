@@ -1,14 +1,20 @@
+from unittest.mock import patch
+
 from django.db import models
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from db_adapter.utils import (
     TableIdentifiers,
+    _models_by_table,
+    clear_models_by_table,
+    created_models,
+    enforce_model,
     enforce_model_fields,
     normalize_table,
     split_table_identifiers,
 )
 
-from .models import Post
+from .models import Post, Tag
 
 
 class SplitTableIdentifierTests(TestCase):
@@ -123,3 +129,56 @@ class EnforceModelFieldsTests(TestCase):
         self.assertEqual(tag_field.column, 'tag')
         self.assertEqual(author_field.name, 'author')
         self.assertEqual(author_field.column, 'written_by')
+
+
+class EnforceModelTests(TestCase):
+    def test_enforce_model(self):
+        self.assertIs(enforce_model(Post), Post)
+        self.assertIs(enforce_model('tbl_post'), Post)
+        self.assertIsNone(enforce_model('tbl_unknown'))
+
+    def test_changed_table(self):
+        enforce_model('tbl_tag')
+
+        with patch.object(Tag._meta, 'db_table', 'tbl_label'):
+            # The stale entry rebuilds the index
+            self.assertIsNone(enforce_model('tbl_tag'))
+            self.assertIs(enforce_model('tbl_label'), Tag)
+
+        # Misses are cached until the index is invalidated (like when tables
+        # are transformed)
+        self.assertIsNone(enforce_model('tbl_tag'))
+        clear_models_by_table()
+        self.assertIs(enforce_model('tbl_tag'), Tag)
+
+    def test_cached_misses(self):
+        enforce_model('tbl_post')
+        index = _models_by_table['index']
+
+        self.assertIsNone(enforce_model('tbl_unknown'))
+        self.assertIsNone(enforce_model('tbl_unknown'))
+        self.assertIs(_models_by_table['index'], index)
+        self.assertIn('tbl_unknown', index)
+
+        # Rebuilt after the settings are reloaded
+        with override_settings(DB_ADAPTER={}):
+            self.assertNotIn('index', _models_by_table)
+            self.assertIs(enforce_model('tbl_post'), Post)
+            self.assertIsNot(_models_by_table['index'], index)
+
+
+class CreatedModelsTests(TestCase):
+    def test_created_models(self):
+        labels = [model._meta.label for model in created_models(['auth'])]
+        self.assertIn('auth.User', labels)
+        # Auto-created models of many-to-many fields
+        self.assertIn('auth.User_groups', labels)
+
+        self.assertIn(Tag, created_models())
+        with patch.object(Tag._meta, 'managed', False):
+            self.assertNotIn(Tag, created_models(['tests']))
+        with patch.object(Tag._meta, 'proxy', True):
+            self.assertNotIn(Tag, created_models(['tests']))
+
+        with self.assertRaises(LookupError):
+            created_models(['unknown'])